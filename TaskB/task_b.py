@@ -1,4 +1,10 @@
+import sys
 from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from common import profiling  # noqa: E402
 
 
 def print_reservation_number(reservation: list) -> None:
@@ -70,22 +76,28 @@ def print_email(reservation: list) -> None:
 
 
 def main():
-    with open("reservations.txt", "r", encoding="utf-8") as file:
-        reservation = file.read().strip()
-
-    reservation = reservation.split("|")
-
-    print_reservation_number(reservation)
-    print_booker(reservation)
-    print_date(reservation)
-    print_start_time(reservation)
-    print_hours(reservation)
-    print_hourly_rate(reservation)
-    print_total_price(reservation)
-    print_paid(reservation)
-    print_venue(reservation)
-    print_phone(reservation)
-    print_email(reservation)
+    profiling.start("task_b", globals())
+
+    with profiling.stage("read"):
+        with open("reservations.txt", "r", encoding="utf-8") as file:
+            reservation = file.read().strip()
+
+    with profiling.stage("parse"):
+        reservation = reservation.split("|")
+    profiling.add_rows(1)
+
+    with profiling.stage("render"):
+        print_reservation_number(reservation)
+        print_booker(reservation)
+        print_date(reservation)
+        print_start_time(reservation)
+        print_hours(reservation)
+        print_hourly_rate(reservation)
+        print_total_price(reservation)
+        print_paid(reservation)
+        print_venue(reservation)
+        print_phone(reservation)
+        print_email(reservation)
 
 
 if __name__ == "__main__":
@@ -1,21 +1,46 @@
-from datetime import datetime
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
+from common import profiling  # noqa: E402
+from common.fast_dates import (  # noqa: E402
+    format_date, format_time, parse_date, parse_datetime, parse_time
+)
+from common.shards import read_lines, shard_ranges  # noqa: E402
+
+# Report lines are collected and written this many at a time.
+CHUNK_LINES = 8192
+
+
+def write_lines(lines: list, stream=None) -> None:
+    if lines:
+        lines.append("")
+        (stream or sys.stdout).write("\n".join(lines))
+        lines.clear()
+
+
+@profiling.timed("parse")
 def convert_reservation_data(row: list) -> list:
     reservation_id = int(row[0])
     name = row[1]
     email = row[2]
     phone = row[3]
 
-    reservation_date = datetime.strptime(row[4], "%Y-%m-%d").date()
-    reservation_time = datetime.strptime(row[5], "%H:%M").time()
+    reservation_date = parse_date(row[4])
+    reservation_time = parse_time(row[5])
 
     duration_hours = int(row[6])
     price = float(row[7])
     confirmed = (row[8] == "True")
 
     reserved_resource = row[9]
-    created_at = datetime.strptime(row[10], "%Y-%m-%d %H:%M:%S")
+    created_at = parse_datetime(row[10])
 
     return [
         reservation_id,
@@ -36,8 +61,8 @@ def confirmed_reservations(reservations: list) -> None:
 
     for r in reservations:
         if r[8]:
-            date_str = r[4].strftime("%d.%m.%Y")
-            time_str = r[5].strftime("%H.%M")
+            date_str = format_date(r[4])
+            time_str = format_time(r[5])
             print(f"- {r[1]}, {r[9]}, {date_str} at {time_str}")
 
     print()
@@ -47,8 +72,8 @@ def long_reservations(reservations: list) -> None:
 
     for r in reservations:
         if r[6] >= 3:
-            date_str = r[4].strftime("%d.%m.%Y")
-            time_str = r[5].strftime("%H.%M")
+            date_str = format_date(r[4])
+            time_str = format_time(r[5])
             print(f"- {r[1]}, {date_str} at {time_str}, duration {r[6]} h, {r[9]}")
 
     print()
@@ -89,19 +114,210 @@ def total_revenue(reservations: list) -> None:
     print("5) Total Revenue from Confirmed Reservations")
     print(f"Total revenue from confirmed reservations: {amount_str} €")
 
-def main():
-    reservations = []
-
-    with open("reservations.txt", "r", encoding="utf-8") as file:
+def read_reservations(filename: str):
+    with open(filename, "r", encoding="utf-8") as file:
         for line in file:
-            row = line.strip().split("|")
-            reservations.append(convert_reservation_data(row))
+            if len(line.strip()) == 0:
+                continue
+            yield convert_reservation_data(line.strip().split("|"))
+
+def read_range(filename: str, start: int, end: int):
+    # Same rows as read_reservations for the [start, end) byte range of the
+    # file, read one line at a time.
+    for line in read_lines(filename, start, end):
+        if len(line.strip()) == 0:
+            continue
+        yield convert_reservation_data(line.strip().split("|"))
+
+def render_sections(reservations, confirmed_file, long_file, status_file) -> tuple:
+    # Writes the lines of the confirmed, long and status sections to their
+    # files in batches and returns the confirmed and not confirmed counts and
+    # the revenue.
+    confirmed = 0
+    not_confirmed = 0
+    total = 0.0
+    lines = []
+    long_lines = []
+    status_lines = []
+
+    for r in reservations:
+        date_str = format_date(r[4])
+        time_str = format_time(r[5])
+
+        if r[8]:
+            confirmed += 1
+            total += r[6] * r[7]
+            lines.append(f"- {r[1]}, {r[9]}, {date_str} at {time_str}")
+            if len(lines) >= CHUNK_LINES:
+                write_lines(lines, confirmed_file)
+        else:
+            not_confirmed += 1
+
+        if r[6] >= 3:
+            long_lines.append(
+                f"- {r[1]}, {date_str} at {time_str}, duration {r[6]} h, {r[9]}"
+            )
+            if len(long_lines) >= CHUNK_LINES:
+                write_lines(long_lines, long_file)
+
+        status = "Confirmed" if r[8] else "NOT Confirmed"
+        status_lines.append(f"{r[1]} → {status}")
+        if len(status_lines) >= CHUNK_LINES:
+            write_lines(status_lines, status_file)
+
+    write_lines(lines, confirmed_file)
+    write_lines(long_lines, long_file)
+    write_lines(status_lines, status_file)
+
+    return confirmed, not_confirmed, total
 
-    confirmed_reservations(reservations)
-    long_reservations(reservations)
-    confirmation_statuses(reservations)
-    confirmation_summary(reservations)
-    total_revenue(reservations)
+def write_summary(confirmed: int, not_confirmed: int, total: float) -> None:
+    amount_str = f"{total:.2f}".replace(".", ",")
+
+    write_lines([
+        "4) Confirmation Summary",
+        f"- Confirmed reservations: {confirmed} pcs",
+        f"- Not confirmed reservations: {not_confirmed} pcs",
+        "",
+        "5) Total Revenue from Confirmed Reservations",
+        f"Total revenue from confirmed reservations: {amount_str} €",
+    ])
+
+    profiling.add_rows(confirmed + not_confirmed)
+
+def stream_reports(reservations) -> None:
+    # Single pass over the reservations: the confirmed list goes straight to
+    # stdout, the long and status lists are spooled to temporary files so
+    # memory use does not grow with the input, and the rest are counters.
+    # Output lines are batched and written in large chunks.
+    with tempfile.TemporaryFile("w+", encoding="utf-8") as long_spool, \
+            tempfile.TemporaryFile("w+", encoding="utf-8") as status_spool:
+        write_lines(["1) Confirmed Reservations"])
+        confirmed, not_confirmed, total = render_sections(
+            reservations, sys.stdout, long_spool, status_spool
+        )
+
+        write_lines(["", "2) Long Reservations (≥ 3 h)"])
+        long_spool.seek(0)
+        shutil.copyfileobj(long_spool, sys.stdout)
+
+        write_lines(["", "3) Reservation Confirmation Status"])
+        status_spool.seek(0)
+        shutil.copyfileobj(status_spool, sys.stdout)
+        write_lines([""])
+
+    write_summary(confirmed, not_confirmed, total)
+
+def render_range(filename: str, start: int, end: int, directory: str) -> tuple:
+    # Runs in a worker process. The rows of the range are streamed into the
+    # three section files of the range, so neither the worker nor the parent
+    # holds them; only the file names, the counts and the revenue of the
+    # range are sent back.
+    names = []
+    files = []
+    for section in ("confirmed", "long", "status"):
+        descriptor, name = tempfile.mkstemp(
+            prefix=f"{start}-{section}-", suffix=".txt", dir=directory
+        )
+        names.append(name)
+        files.append(open(descriptor, "w", encoding="utf-8"))
+
+    try:
+        confirmed, not_confirmed, revenue = render_sections(
+            read_range(filename, start, end), *files
+        )
+    finally:
+        for file in files:
+            file.close()
+
+    return names, confirmed, not_confirmed, revenue
+
+def copy_section(name: str) -> None:
+    with open(name, "r", encoding="utf-8") as file:
+        shutil.copyfileobj(file, sys.stdout)
+    os.remove(name)
+
+def stream_reports_parallel(filename: str, workers: int) -> None:
+    # Same output as stream_reports(read_reservations(filename)), with the
+    # file split into line-aligned ranges that are parsed and rendered on
+    # several processes. The ranges are merged in file order as they arrive,
+    # and the revenues of the ranges are added up in file order. That total
+    # can differ from a sequential run only in the last bits of the float,
+    # far below the cents that are printed.
+    ranges = shard_ranges(filename, workers)
+    confirmed = 0
+    not_confirmed = 0
+    total = 0.0
+    later = []
+
+    with tempfile.TemporaryDirectory() as directory, \
+            ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as pool:
+        write_lines(["1) Confirmed Reservations"])
+        # Forked workers flush the stdout buffer they inherit when they exit.
+        sys.stdout.flush()
+
+        # map yields the ranges in submission order, which is file order.
+        for (confirmed_name, *names), count, other, revenue in pool.map(
+            render_range,
+            [filename] * len(ranges),
+            [start for start, _ in ranges],
+            [end for _, end in ranges],
+            [directory] * len(ranges),
+        ):
+            copy_section(confirmed_name)
+            later.append(names)
+            confirmed += count
+            not_confirmed += other
+            total += revenue
+
+        write_lines(["", "2) Long Reservations (≥ 3 h)"])
+        for long_name, _ in later:
+            copy_section(long_name)
+
+        write_lines(["", "3) Reservation Confirmation Status"])
+        for _, status_name in later:
+            copy_section(status_name)
+        write_lines([""])
+
+    write_summary(confirmed, not_confirmed, total)
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Prints the reservation report."
+    )
+    parser.add_argument(
+        "file",
+        nargs="?",
+        default="reservations.txt",
+        help="reservation file (default: reservations.txt)",
+    )
+    parser.add_argument(
+        "-w", "--workers",
+        type=int,
+        default=1,
+        help="parse the file on this many processes (default: 1, which "
+             "reads it sequentially in this process)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="write one JSON line of stage timings to stderr "
+             "(or to the file named by TASK_PROFILE)",
+    )
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    profiling.start("task_c")
+
+    with profiling.stage("render"):
+        if args.workers > 1:
+            stream_reports_parallel(args.file, args.workers)
+        else:
+            stream_reports(read_reservations(args.file))
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
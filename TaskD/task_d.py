@@ -1,80 +1,25 @@
-import csv
-from datetime import datetime, date
-from typing import Dict, List
+import argparse
+import sys
+from datetime import date
+from pathlib import Path
+from typing import Dict, Optional, Sequence
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-FINNISH_WEEKDAYS = {
-    0: "Monday",
-    1: "Tuesday",
-    2: "Wednesday",
-    3: "Thursday",
-    4: "Friday",
-    5: "Saturday",
-    6: "Sunday",
-}
+from common import profiling  # noqa: E402
+from common.fast_dates import format_date  # noqa: E402
+from common.week_data import (  # noqa: E402
+    CHUNK_ROWS, FINNISH_WEEKDAYS, format_kwh, load_daily_totals, week_number_of,
+    wh_to_kwh,
+)
 
 
-def read_data(filename: str) -> List[Dict]:
-    """
-    Reads the CSV file and returns a list of rows with parsed datetime and values.
-    """
-    rows = []
-
-    with open(filename, "r", encoding="utf-8") as file:
-        reader = csv.reader(file, delimiter=";")
-        next(reader)
-
-        for row in reader:
-            rows.append({
-                "datetime": datetime.fromisoformat(row[0]),
-                "consumption": [int(row[1]), int(row[2]), int(row[3])],
-                "production": [int(row[4]), int(row[5]), int(row[6])],
-            })
-
-    return rows
-
-
-def calculate_daily_totals(rows: List[Dict]) -> Dict[date, Dict]:
-    """
-    Groups hourly rows by date and calculates daily totals in Wh.
-    """
-    daily: Dict[date, Dict] = {}
-
-    for row in rows:
-        day = row["datetime"].date()
-
-        if day not in daily:
-            daily[day] = {
-                "consumption": [0, 0, 0],
-                "production": [0, 0, 0],
-            }
-
-        for i in range(3):
-            daily[day]["consumption"][i] += row["consumption"][i]
-            daily[day]["production"][i] += row["production"][i]
-
-    return daily
-
-
-def wh_to_kwh(value_wh: int) -> float:
-    """
-    Converts watt-hours to kilowatt-hours.
-    """
-    return value_wh / 1000.0
-
-
-def format_kwh(value_kwh: float) -> str:
-    """
-    Formats kWh value with two decimals and decimal comma.
-    """
-    return f"{value_kwh:.2f}".replace(".", ",")
-
-
-def print_table(daily_data: Dict[date, Dict]) -> None:
+@profiling.timed("render")
+def print_table(week_number: int, daily_data: Dict[date, Dict]) -> None:
     """
     Prints the weekly electricity consumption and production table.
     """
-    print("Week 42 electricity consumption and production (kWh, by phase)\n")
+    print(f"Week {week_number} electricity consumption and production (kWh, by phase)\n")
 
     header = (
         "Day          Date        "
@@ -89,7 +34,7 @@ def print_table(daily_data: Dict[date, Dict]) -> None:
 
     for day in sorted(daily_data.keys()):
         weekday = FINNISH_WEEKDAYS[day.weekday()]
-        date_str = day.strftime("%d.%m.%Y")
+        date_str = format_date(day)
 
         cons = [wh_to_kwh(v) for v in daily_data[day]["consumption"]]
         prod = [wh_to_kwh(v) for v in daily_data[day]["production"]]
@@ -104,13 +49,47 @@ def print_table(daily_data: Dict[date, Dict]) -> None:
         )
 
 
-def main() -> None:
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """
+    Parses the command line options.
+    """
+    parser = argparse.ArgumentParser(
+        description="Prints the daily electricity totals of a week file."
+    )
+    parser.add_argument(
+        "file",
+        nargs="?",
+        default="week42.csv",
+        help="week CSV file or columnar file (default: week42.csv)",
+    )
+    parser.add_argument(
+        "--chunk-rows",
+        type=int,
+        default=CHUNK_ROWS,
+        help="rows of the file parsed at a time, which bounds the memory use "
+             f"(default: {CHUNK_ROWS})",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="write one JSON line of stage timings to stderr "
+             "(or to the file named by TASK_PROFILE)",
+    )
+    args = parser.parse_args(argv)
+    if args.chunk_rows < 1:
+        parser.error("--chunk-rows must be at least 1")
+    return args
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
     """
     Main function: reads data, computes daily totals, and prints the report.
     """
-    rows = read_data("week42.csv")
-    daily_totals = calculate_daily_totals(rows)
-    print_table(daily_totals)
+    args = parse_args(argv)
+    profiling.start("task_d")
+
+    daily_totals = load_daily_totals(args.file, args.chunk_rows)
+    print_table(week_number_of(args.file, daily_totals), daily_totals)
 
 
 if __name__ == "__main__":
@@ -1,79 +1,59 @@
 # Copyright (c) 2026 Salaudeen Abdulbaki
 # License: MIT
 
-import csv
-from datetime import datetime, date
-from typing import Dict, List, Tuple
-
-
-FINNISH_WEEKDAYS = {
-    0: "Monday",
-    1: "Tuesday",
-    2: "Wednesday",
-    3: "Thursday",
-    4: "Friday",
-    5: "Saturday",
-    6: "Sunday",
-}
-
-
-def read_data(filename: str) -> List[Dict]:
-    """
-    Reads a CSV file and returns a list of parsed rows.
-    Each row contains datetime, consumption list, and production list.
-    """
-    rows: List[Dict] = []
-
-    with open(filename, "r", encoding="utf-8") as file:
-        reader = csv.reader(file, delimiter=";")
-        next(reader)  # skip header
-
-        for row in reader:
-            rows.append({
-                "datetime": datetime.fromisoformat(row[0]),
-                "consumption": [int(row[1]), int(row[2]), int(row[3])],
-                "production": [int(row[4]), int(row[5]), int(row[6])]
-            })
-
-    return rows
-
-
-def calculate_daily_totals(rows: List[Dict]) -> Dict[date, Dict]:
+import argparse
+import functools
+import glob
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from common import profiling  # noqa: E402
+from common.columnar import EXTENSION, is_columnar  # noqa: E402
+from common.fast_dates import format_date, parse_date  # noqa: E402
+from common.rollup import Rollup, day_number  # noqa: E402
+from common.tail import FileTail, parse_polled  # noqa: E402
+from common.week_data import (  # noqa: E402
+    CHANNELS,
+    CHUNK_ROWS,
+    FINNISH_WEEKDAYS,
+    export_columnar,
+    format_kwh,
+    load_daily_totals,
+    rollup_daily_totals,
+    week_number_of,
+    wh_to_kwh,
+)
+from week_cache import WeekCache  # noqa: E402
+
+
+def parse_lines(lines: Iterable[bytes]) -> Tuple[List[int], List[List[int]]]:
     """
-    Groups hourly rows by date and calculates daily totals (Wh).
+    Parses CSV data lines (without the header), e.g. the lines appended to
+    a file since it was last read. Returns the day number of every row and
+    its consumption and production phases in Wh.
     """
-    daily: Dict[date, Dict] = {}
+    days: List[int] = []
+    values: List[List[int]] = []
 
-    for row in rows:
-        day: date = row["datetime"].date()
+    for line in lines:
+        row = line.decode("utf-8").split(";")
+        if len(row) != 7:
+            raise ValueError(f"expected 7 fields: {line!r}")
+        days.append(day_number(parse_date(row[0])))
+        values.append([int(value) for value in row[1:7]])
 
-        if day not in daily:
-            daily[day] = {
-                "consumption": [0, 0, 0],
-                "production": [0, 0, 0]
-            }
-
-        for i in range(3):
-            daily[day]["consumption"][i] += row["consumption"][i]
-            daily[day]["production"][i] += row["production"][i]
-
-    return daily
-
-
-def wh_to_kwh(value_wh: int) -> float:
-    """
-    Converts watt-hours to kilowatt-hours.
-    """
-    return value_wh / 1000.0
-
-
-def format_kwh(value_kwh: float) -> str:
-    """
-    Formats kWh value with two decimals and comma decimal separator.
-    """
-    return f"{value_kwh:.2f}".replace(".", ",")
+    return days, values
 
 
+@profiling.timed("render")
 def format_week_section(week_number: int, daily_data: Dict[date, Dict]) -> str:
     """
     Formats one week's daily totals into a structured text section.
@@ -89,7 +69,7 @@ def format_week_section(week_number: int, daily_data: Dict[date, Dict]) -> str:
 
     for day in sorted(daily_data.keys()):
         weekday = FINNISH_WEEKDAYS[day.weekday()]
-        date_str = day.strftime("%d.%m.%Y")
+        date_str = format_date(day)
 
         cons = [wh_to_kwh(v) for v in daily_data[day]["consumption"]]
         prod = [wh_to_kwh(v) for v in daily_data[day]["production"]]
@@ -109,6 +89,7 @@ def format_week_section(week_number: int, daily_data: Dict[date, Dict]) -> str:
     return "\n".join(lines)
 
 
+@profiling.timed("write")
 def write_report(filename: str, content: str) -> None:
     """
     Writes the final formatted report to a file.
@@ -117,32 +98,303 @@ def write_report(filename: str, content: str) -> None:
         file.write(content)
 
 
-def main() -> None:
+def expand_week_files(patterns: Sequence[str]) -> List[str]:
+    """
+    Expands file names and glob patterns into a sorted list of unique files.
+    Patterns that match nothing are left out.
+    """
+    filenames = set()
+
+    for pattern in patterns:
+        matches = glob.glob(pattern)
+        if not matches and os.path.isfile(pattern):
+            # A file name with glob characters in it.
+            matches = [pattern]
+        filenames.update(matches)
+
+    return sorted(filenames)
+
+
+def report_order(
+    filename: str, daily_data: Dict[date, Dict]
+) -> Tuple[date, int, str]:
+    """
+    Returns the sort key of a file's section: sections are ordered by the
+    first day of each file so that weeks from different years stay in
+    chronological order.
+    """
+    first_day = min(daily_data) if daily_data else date.max
+    return first_day, week_number_of(filename, daily_data), filename
+
+
+def compute_weeks(
+    filenames: Sequence[str],
+    workers: int,
+    chunk_size: Optional[int] = None,
+    chunk_rows: int = CHUNK_ROWS,
+) -> List[Dict[date, Dict]]:
+    """
+    Computes the daily totals of every file, in the order of filenames.
+
+    With more than one worker the files are spread over a process pool.
+    chunk_size files are sent to a worker per task so that pickling does not
+    dominate when there are many small files; by default every worker gets
+    about four chunks. Every file is parsed chunk_rows rows at a time.
+    """
+    load = functools.partial(load_daily_totals, chunk_rows=chunk_rows)
+
+    if workers <= 1 or len(filenames) <= 1:
+        return [load(filename) for filename in filenames]
+
+    if chunk_size is None:
+        chunk_size = max(1, len(filenames) // (workers * 4))
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(load, filenames, chunksize=chunk_size))
+
+
+def load_weeks(
+    filenames: Sequence[str],
+    workers: int,
+    chunk_size: Optional[int] = None,
+    cache: Optional[WeekCache] = None,
+    chunk_rows: int = CHUNK_ROWS,
+) -> List[Dict[date, Dict]]:
+    """
+    Returns the daily totals of every file, in the order of filenames.
+    Only files that are new or changed since they were cached are read again.
+    """
+    if cache is None:
+        return compute_weeks(filenames, workers, chunk_size, chunk_rows)
+
+    totals = [cache.get(filename) for filename in filenames]
+    missing = [name for name, daily in zip(filenames, totals) if daily is None]
+    fingerprints = {name: cache.fingerprint(name) for name in missing}
+    computed = iter(compute_weeks(missing, workers, chunk_size, chunk_rows))
+
+    for i, filename in enumerate(filenames):
+        if totals[i] is None:
+            totals[i] = next(computed)
+            cache.put(filename, totals[i], fingerprints[filename])
+
+    cache.save()
+    return totals
+
+
+def follow_weeks(
+    patterns: Sequence[str],
+    output: str,
+    interval: float = 5.0,
+    polls: Optional[int] = None,
+) -> None:
+    """
+    Follows growing week files.
+
+    Every file is read once; after that every poll parses only the lines
+    appended since the previous one, adds them to the file's rollup, prints
+    the sections of the weeks that changed and rewrites the report from the
+    kept sections. Files that start matching the patterns are picked up, and
+    a rotated or truncated file is read again from the start. Stops after
+    polls polls, or runs until interrupted when polls is None.
+    """
+    tails: Dict[str, FileTail] = {}
+    rollups: Dict[str, Rollup] = {}
+    sections: Dict[str, Tuple[Tuple[date, int, str], str]] = {}
+    count = 0
+
+    while polls is None or count < polls:
+        count += 1
+        changed = []
+
+        for filename in expand_week_files(patterns):
+            tail = tails.get(filename)
+            if tail is None:
+                tail = tails[filename] = FileTail(filename)
+
+            reset, lines = tail.poll()
+            if reset or filename not in rollups:
+                rollups[filename] = Rollup(CHANNELS)
+            if lines or reset:
+                rollups[filename].add_hours(*parse_polled(parse_lines, lines))
+                changed.append(filename)
+
+        if not changed:
+            if polls is None or count < polls:
+                time.sleep(interval)
+            continue
+
+        for filename in changed:
+            daily_totals = rollup_daily_totals(rollups[filename])
+            order = report_order(filename, daily_totals)
+            section = format_week_section(order[1], daily_totals)
+            if filename in sections:
+                print(section)
+            sections[filename] = (order, section)
+
+        write_report(
+            output,
+            "\n".join(
+                section for _, section in sorted(
+                    sections.values(), key=lambda item: item[0]
+                )
+            ),
+        )
+        print(
+            f"{len(changed)} of {len(sections)} sections updated in {output}",
+            file=sys.stderr,
+        )
+        sys.stdout.flush()
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """
+    Parses the command line options.
+    """
+    parser = argparse.ArgumentParser(
+        description="Writes weekly electricity summaries to a report file."
+    )
+    parser.add_argument(
+        "files",
+        nargs="*",
+        default=["week*.csv"],
+        help="week CSV files, columnar files written by --export, or glob "
+             "patterns (default: week*.csv)",
+    )
+    parser.add_argument(
+        "-w", "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="number of worker processes (default: number of CPUs)",
+    )
+    parser.add_argument(
+        "-c", "--chunk-size",
+        type=int,
+        default=None,
+        help="files per worker task (default: automatic)",
+    )
+    parser.add_argument(
+        "--chunk-rows",
+        type=int,
+        default=CHUNK_ROWS,
+        help="rows of a file parsed at a time, which bounds the memory use "
+             "per worker, and rows per row group with --export "
+             f"(default: {CHUNK_ROWS})",
+    )
+    parser.add_argument(
+        "-o", "--output",
+        default="summary.txt",
+        help="report file to write (default: summary.txt)",
+    )
+    parser.add_argument(
+        "--export",
+        metavar="DIR",
+        help=f"convert the week CSV files to compressed columnar files "
+             f"(<name>{EXTENSION}) in DIR and exit",
+    )
+    parser.add_argument(
+        "-f", "--follow",
+        action="store_true",
+        help="keep reading rows appended to the files, print the weeks they "
+             "change and rewrite the report",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=5.0,
+        help="seconds between checks for new rows in follow mode (default: 5)",
+    )
+    parser.add_argument(
+        "--cache",
+        default=".week_cache.json",
+        help="file for cached weekly totals (default: .week_cache.json)",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=1024,
+        help="maximum number of cached files (default: 1024)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="read every file and leave the cache untouched",
+    )
+    parser.add_argument(
+        "--clear-cache",
+        action="store_true",
+        help="discard the cache before running",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="write one JSON line of stage timings to stderr "
+             "(or to the file named by TASK_PROFILE)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
     """
     Main function:
-    - Reads three weekly CSV files
-    - Computes daily summaries
-    - Writes formatted report to summary.txt
+    - Reads the weekly CSV files given on the command line (week*.csv by default)
+    - Computes daily summaries in parallel, reusing cached results for
+      files that have not changed
+    - Writes the formatted report, sections in week order, to summary.txt
     """
-    weeks: List[Tuple[int, str]] = [
-        (41, "week41.csv"),
-        (42, "week42.csv"),
-        (43, "week43.csv")
-    ]
+    args = parse_args(argv)
+    profiling.start("task_e")
+
+    filenames = expand_week_files(args.files)
+    # Follow mode waits for files that do not exist yet.
+    if not filenames and (args.export or not args.follow):
+        sys.exit(f"no files match {' '.join(args.files)}")
+
+    if args.export:
+        os.makedirs(args.export, exist_ok=True)
+        for filename in filenames:
+            name = os.path.splitext(os.path.basename(filename))[0] + EXTENSION
+            output = os.path.join(args.export, name)
+            rows = export_columnar(filename, output, args.chunk_rows)
+            print(f"Exported {rows} rows from {filename} to {output}")
+        return
+
+    if args.follow:
+        if any(is_columnar(name) for name in filenames):
+            sys.exit("--follow needs week CSV files")
+        try:
+            follow_weeks(args.files, args.output, args.interval)
+        except KeyboardInterrupt:
+            pass
+        return
+
+    cache = None if args.no_cache else WeekCache(args.cache, args.cache_size)
+    if args.clear_cache:
+        (cache or WeekCache(args.cache)).clear()
+
+    totals = load_weeks(
+        filenames, args.workers, args.chunk_size, cache, args.chunk_rows
+    )
+
+    # The order does not depend on scheduling.
+    weeks = sorted(
+        (
+            (report_order(filename, daily_totals), daily_totals)
+            for filename, daily_totals in zip(filenames, totals)
+        ),
+        key=lambda week: week[0],
+    )
 
     full_report: List[str] = []
 
-    for week_number, filename in weeks:
-        rows = read_data(filename)
-        daily_totals = calculate_daily_totals(rows)
+    for (_, week_number, _), daily_totals in weeks:
         week_section = format_week_section(week_number, daily_totals)
         full_report.append(week_section)
 
     final_text = "\n".join(full_report)
 
-    write_report("summary.txt", final_text)
+    write_report(args.output, final_text)
 
-    print("Report successfully written to summary.txt")
+    print(f"Report successfully written to {args.output}")
 
 
 if __name__ == "__main__":
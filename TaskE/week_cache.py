@@ -0,0 +1,182 @@
+# Copyright (c) 2026 Salaudeen Abdulbaki
+# License: MIT
+
+import hashlib
+import json
+import os
+from datetime import date
+from typing import Dict, Optional
+
+from common.fast_dates import parse_date
+
+
+CACHE_VERSION = 1
+
+
+def file_digest(filename: str) -> str:
+    """
+    Returns the SHA-256 hex digest of a file's content.
+    """
+    digest = hashlib.sha256()
+
+    with open(filename, "rb") as file:
+        for block in iter(lambda: file.read(1 << 16), b""):
+            digest.update(block)
+
+    return digest.hexdigest()
+
+
+def valid_entry(entry: object) -> bool:
+    """
+    Tells whether a loaded cache entry has every field with the type put
+    stores: the file's size, mtime_ns and sha256, the use clock, and six
+    Wh values per ISO date.
+    """
+    if not isinstance(entry, dict):
+        return False
+    if any(type(entry.get(key)) is not int for key in ("size", "mtime_ns", "used")):
+        return False
+    if not isinstance(entry.get("sha256"), str) or not isinstance(entry.get("daily"), dict):
+        return False
+
+    for day, values in entry["daily"].items():
+        if not isinstance(values, list) or len(values) != 6:
+            return False
+        if any(type(value) is not int for value in values):
+            return False
+        try:
+            parse_date(day)
+        except ValueError:
+            return False
+
+    return True
+
+
+class WeekCache:
+    """
+    On-disk cache of the daily totals of each week CSV file.
+
+    Entries are keyed by the absolute file path and validated against the
+    file size, modification time and content hash. The hash is only computed
+    when the size matches but the modification time does not, so unchanged
+    files are recognised without reading them. At most max_entries files are
+    kept; the least recently used entries are evicted first.
+    """
+
+    def __init__(self, path: str, max_entries: int = 1024):
+        self.path = path
+        self.max_entries = max_entries
+        self.entries: Dict[str, Dict] = {}
+        self.clock = 0
+        self.hits = 0
+        self.misses = 0
+        self.load()
+
+    def load(self) -> None:
+        """
+        Reads the cache file; a missing or unreadable file means an empty
+        cache, and malformed entries are dropped.
+        """
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                content = json.load(file)
+        except (OSError, ValueError):
+            return
+
+        if not isinstance(content, dict) or content.get("version") != CACHE_VERSION:
+            return
+
+        entries = content.get("entries", {})
+        if not isinstance(entries, dict):
+            return
+
+        self.entries = {
+            key: entry for key, entry in entries.items() if valid_entry(entry)
+        }
+        self.clock = max((e["used"] for e in self.entries.values()), default=0)
+
+    def save(self) -> None:
+        """
+        Evicts the least recently used entries and writes the cache file.
+        """
+        if len(self.entries) > self.max_entries:
+            by_use = sorted(self.entries, key=lambda key: self.entries[key]["used"])
+            for key in by_use[:len(self.entries) - self.max_entries]:
+                del self.entries[key]
+
+        temporary = self.path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump({"version": CACHE_VERSION, "entries": self.entries}, file)
+        os.replace(temporary, self.path)
+
+    def clear(self) -> None:
+        """
+        Drops every entry and removes the cache file.
+        """
+        self.entries = {}
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def get(self, filename: str) -> Optional[Dict[date, Dict]]:
+        """
+        Returns the cached daily totals of a file, or None when the file is
+        new or has changed since it was cached.
+        """
+        key = os.path.abspath(filename)
+        entry = self.entries.get(key)
+        stat = os.stat(filename)
+
+        if entry is None or entry["size"] != stat.st_size:
+            self.misses += 1
+            return None
+
+        if entry["mtime_ns"] != stat.st_mtime_ns:
+            if entry["sha256"] != file_digest(filename):
+                self.misses += 1
+                return None
+            entry["mtime_ns"] = stat.st_mtime_ns
+
+        self.clock += 1
+        entry["used"] = self.clock
+        self.hits += 1
+
+        return {
+            parse_date(day): {
+                "consumption": values[:3],
+                "production": values[3:],
+            }
+            for day, values in entry["daily"].items()
+        }
+
+    def fingerprint(self, filename: str) -> Dict:
+        """
+        Returns the size, modification time and content hash of a file.
+        Taken before the file is read, so a change made while it is being
+        read makes the stored entry miss instead of hiding the change.
+        """
+        stat = os.stat(filename)
+        return {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": file_digest(filename),
+        }
+
+    def put(self, filename: str, daily_data: Dict[date, Dict], fingerprint: Dict) -> None:
+        """
+        Stores the daily totals of a file under the fingerprint taken before
+        the file was read.
+        """
+        self.clock += 1
+
+        self.entries[os.path.abspath(filename)] = {
+            "size": fingerprint["size"],
+            "mtime_ns": fingerprint["mtime_ns"],
+            "sha256": fingerprint["sha256"],
+            "used": self.clock,
+            "daily": {
+                day.isoformat(): totals["consumption"] + totals["production"]
+                for day, totals in daily_data.items()
+            },
+        }
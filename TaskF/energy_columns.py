@@ -0,0 +1,348 @@
+# Copyright (c) 2025 Abdulbaki Salaudeen
+# License: MIT
+
+import mmap
+import os
+from array import array
+from datetime import date, datetime, timedelta
+from itertools import islice
+from typing import Dict, Iterable, Iterator, Sequence, Tuple, Union
+
+from common.columnar import is_columnar, iter_groups, write_table
+
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+# Rows per block of read_column_chunks.
+CHUNK_ROWS = 100_000
+
+COLUMNS = ("hours", "offsets", "consumption", "production", "temperature")
+MEASUREMENTS = ("consumption", "production", "temperature")
+
+# Readings are stored as integers: energy in milli-kWh (the files have three
+# decimals) and temperatures in tenths of a degree (one decimal).
+ENERGY_DECIMALS = 3
+TEMPERATURE_DECIMALS = 1
+ENERGY_SCALE = 10 ** ENERGY_DECIMALS
+TEMPERATURE_SCALE = 10 ** TEMPERATURE_DECIMALS
+
+
+def parse_fixed(field: Union[bytes, str], decimals: int) -> int:
+    """
+    Parses a decimal-comma number such as 1,569 or -3,8 into an integer
+    count of 10**-decimals units (1569 and -38 for three and one decimals)
+    without going through float. A decimal point is accepted too, and
+    digits beyond decimals are rounded half away from zero.
+    """
+    comma, point, empty = (
+        (b",", b".", b"") if isinstance(field, bytes) else (",", ".", "")
+    )
+    if field[-decimals - 1:-decimals] == comma:
+        # The usual layout: without the comma it is already in units.
+        return int(field.replace(comma, empty))
+
+    field = field.strip()
+    separator = field.find(comma)
+    if separator < 0:
+        separator = field.find(point)
+    if separator < 0:
+        return int(field) * 10 ** decimals
+
+    digits = len(field) - separator - 1
+    value = int(field[:separator] + field[separator + 1:])
+    if digits <= decimals:
+        return value * 10 ** (decimals - digits)
+
+    divisor = 10 ** (digits - decimals)
+    value, rest = divmod(abs(value), divisor)
+    if 2 * rest >= divisor:
+        value += 1
+    return -value if field[:1] in (b"-", "-") else value
+
+
+def local_hour(hour: int, offset: int) -> int:
+    """
+    Returns the local hour (hours since 1970-01-01 local time) of a reading
+    stored at UTC hour hour with a UTC offset of offset minutes. Readings
+    are on whole local hours, so the offset is rounded up to whole hours.
+    """
+    return hour - (-offset // 60)
+
+
+class EnergyColumns:
+    """
+    Hourly measurements stored column by column.
+
+    - hours: UTC hour of the reading as hours since 1970-01-01 (array of int64)
+    - offsets: UTC offset of the original timestamp in minutes (array of int16)
+    - consumption, production: milli-kWh (array of int64)
+    - temperature: tenths of a degree (array of int64)
+    """
+
+    def __init__(self, size: int = 0):
+        zeros = bytes(8 * size)
+        self.hours = array("q", zeros)
+        self.offsets = array("h", bytes(2 * size))
+        self.consumption = array("q", zeros)
+        self.production = array("q", zeros)
+        self.temperature = array("q", zeros)
+        self._dates: Dict[int, date] = {}
+
+    def __len__(self) -> int:
+        return len(self.hours)
+
+    def extend(self, other: "EnergyColumns") -> None:
+        """
+        Appends the rows of other.
+        """
+        self.hours.extend(other.hours)
+        self.offsets.extend(other.offsets)
+        self.consumption.extend(other.consumption)
+        self.production.extend(other.production)
+        self.temperature.extend(other.temperature)
+
+    def truncate(self, size: int) -> None:
+        """
+        Drops the unused tail of the preallocated columns.
+        """
+        for column in (
+            self.hours,
+            self.offsets,
+            self.consumption,
+            self.production,
+            self.temperature,
+        ):
+            del column[size:]
+
+    def local_day(self, index: int) -> int:
+        """
+        Returns the local calendar day of a row as days since 1970-01-01.
+        """
+        return local_hour(self.hours[index], self.offsets[index]) // 24
+
+    def day_to_date(self, day: int) -> date:
+        """
+        Converts days since 1970-01-01 to a date, reusing cached objects.
+        """
+        parsed = self._dates.get(day)
+        if parsed is None:
+            parsed = self._dates[day] = date.fromordinal(EPOCH_ORDINAL + day)
+        return parsed
+
+    def rows(self) -> Iterator[Tuple[date, int, int, int]]:
+        """
+        Yields (local date, consumption, production, temperature) per hour,
+        in the integer units of the columns.
+        """
+        lengths = {len(self.consumption), len(self.production), len(self.temperature)}
+        if lengths != {len(self)}:
+            raise ValueError("rows() needs every measurement column to be read")
+        day_to_date = self.day_to_date
+        for hour, offset, consumption, production, temperature in zip(
+            self.hours,
+            self.offsets,
+            self.consumption,
+            self.production,
+            self.temperature,
+        ):
+            yield (
+                day_to_date((hour - (-offset // 60)) // 24),
+                consumption,
+                production,
+                temperature,
+            )
+
+
+def _count_lines(mm: mmap.mmap, chunk_size: int = 1 << 20) -> int:
+    """
+    Counts newlines in fixed-size slices so the file is never copied whole.
+    """
+    count = 0
+    for start in range(0, len(mm), chunk_size):
+        count += mm[start:start + chunk_size].count(b"\n")
+    return count
+
+
+def utc_offset(stamp: bytes) -> int:
+    """
+    Returns the UTC offset of an ISO 8601 timestamp in minutes. The usual
+    +HH:MM / -HH:MM and Z endings are read from the end of the text, so the
+    seconds and fractions before them may be left out; other forms go
+    through datetime.fromisoformat. Raises ValueError without an offset.
+    """
+    sign = stamp[-6:-5]
+    if sign in (b"+", b"-") and stamp[-3:-2] == b":":
+        minutes = int(stamp[-5:-3]) * 60 + int(stamp[-2:])
+        return -minutes if sign == b"-" else minutes
+    if stamp[-1:] == b"Z":
+        return 0
+
+    text = stamp.decode("ascii")
+    offset = datetime.fromisoformat(text).utcoffset()
+    if offset is None:
+        raise ValueError(f"timestamp without a UTC offset: {text}")
+    return offset // timedelta(minutes=1)
+
+
+def _parse_into(lines: Iterable[bytes], columns: EnergyColumns) -> int:
+    """
+    Parses CSV data lines into the preallocated columns and returns the
+    number of rows; blank lines are skipped.
+    """
+    hours = columns.hours
+    offsets = columns.offsets
+    consumption = columns.consumption
+    production = columns.production
+    temperature = columns.temperature
+    days: Dict[bytes, int] = {}
+    # UTC offsets by the last six bytes of the timestamp, for the endings
+    # that utc_offset reads from them alone.
+    zones: Dict[bytes, int] = {}
+    index = 0
+
+    for line in lines:
+        line = line.rstrip()
+        if not line:
+            continue
+
+        key = line[:10]
+        day = days.get(key)
+        if day is None:
+            day = days[key] = (
+                date(int(key[0:4]), int(key[5:7]), int(key[8:10])).toordinal()
+                - EPOCH_ORDINAL
+            )
+
+        stamp, used, made, degrees = line.split(b";")[:4]
+        suffix = stamp[-6:]
+        offset = zones.get(suffix)
+        if offset is None:
+            offset = utc_offset(stamp)
+            if suffix[-1:] == b"Z" or (suffix[:1] in (b"+", b"-") and suffix[3:4] == b":"):
+                zones[suffix] = offset
+
+        # Readings are on whole local hours; with a half-hour offset the
+        # reading falls inside the UTC hour stored here.
+        hours[index] = day * 24 + int(line[11:13]) + (-offset // 60)
+        offsets[index] = offset
+        # Fast path for the usual 0,000 / -3,8 layout: dropping the comma
+        # leaves the value in integer units.
+        consumption[index] = (
+            int(used.replace(b",", b"")) if used[-4:-3] == b","
+            else parse_fixed(used, ENERGY_DECIMALS)
+        )
+        production[index] = (
+            int(made.replace(b",", b"")) if made[-4:-3] == b","
+            else parse_fixed(made, ENERGY_DECIMALS)
+        )
+        temperature[index] = (
+            int(degrees.replace(b",", b"")) if degrees[-2:-1] == b","
+            else parse_fixed(degrees, TEMPERATURE_DECIMALS)
+        )
+        index += 1
+
+    return index
+
+
+def read_columns(
+    filename: str, measurements: Sequence[str] = MEASUREMENTS
+) -> EnergyColumns:
+    """
+    Reads the hourly CSV through mmap straight into preallocated columns.
+
+    Lines are parsed as bytes and never decoded to str. Timestamps start with
+    the local date and hour (2025-01-01T00) and end with the UTC offset.
+
+    A columnar file written by export_columnar is loaded instead of parsed,
+    and only the listed measurements are decoded; the others stay empty.
+    """
+    if is_columnar(filename):
+        columns = EnergyColumns()
+        for chunk in read_columnar_chunks(filename, measurements):
+            columns.extend(chunk)
+        return columns
+
+    with open(filename, "rb") as file:
+        # mmap refuses empty files; such a file has no rows, like one with
+        # only the header.
+        if os.fstat(file.fileno()).st_size == 0:
+            return EnergyColumns()
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            columns = EnergyColumns(_count_lines(mm) + 1)
+            mm.readline()  # skip header
+            rows = _parse_into(iter(mm.readline, b""), columns)
+
+    columns.truncate(rows)
+    return columns
+
+
+def read_column_chunks(
+    filename: str, chunk_rows: int = CHUNK_ROWS
+) -> Iterator[EnergyColumns]:
+    """
+    Reads the hourly CSV in blocks of at most chunk_rows rows, so that only
+    one block is in memory at a time. A columnar file is read a row group at
+    a time instead.
+    """
+    if is_columnar(filename):
+        yield from read_columnar_chunks(filename)
+        return
+
+    with open(filename, "rb") as file:
+        next(file, None)  # skip header
+
+        while True:
+            lines = list(islice(file, chunk_rows))
+            if not lines:
+                return
+            yield parse_lines(lines)
+
+
+def parse_lines(lines: Iterable[bytes]) -> EnergyColumns:
+    """
+    Parses CSV data lines (without the header), e.g. the lines appended to
+    a file since it was last read, the same way as read_columns.
+    """
+    lines = list(lines)
+    columns = EnergyColumns(len(lines))
+    columns.truncate(_parse_into(lines, columns))
+    return columns
+
+
+def read_columnar_chunks(
+    filename: str, measurements: Sequence[str] = MEASUREMENTS
+) -> Iterator[EnergyColumns]:
+    """
+    Reads a columnar file a row group at a time. Hours and offsets are
+    always read, of the measurements only the listed ones: a query on
+    consumption never decompresses production or temperature.
+    """
+    for group in iter_groups(filename, ("hours", "offsets") + tuple(measurements)):
+        if group["offsets"].typecode != "h":
+            raise ValueError(
+                f"{filename} stores UTC offsets in hours; export it again"
+            )
+        columns = EnergyColumns()
+        for name, values in group.items():
+            setattr(columns, name, values)
+        yield columns
+
+
+def export_columnar(
+    filename: str, output: str, chunk_rows: int = CHUNK_ROWS
+) -> int:
+    """
+    Converts a measurement CSV into a compressed columnar file, one row group
+    per chunk_rows rows, and returns the number of rows. The hours are
+    delta-encoded.
+    """
+    schema = {name: getattr(EnergyColumns(), name).typecode for name in COLUMNS}
+    return write_table(
+        output,
+        schema,
+        (
+            {name: getattr(columns, name) for name in COLUMNS}
+            for columns in read_column_chunks(filename, chunk_rows)
+        ),
+        delta=("hours",),
+    )
@@ -0,0 +1,133 @@
+# Copyright (c) 2025 Abdulbaki Salaudeen
+# License: MIT
+
+from array import array
+from datetime import date
+from typing import Iterable, List, Optional, Tuple
+
+from energy_columns import ENERGY_SCALE, TEMPERATURE_SCALE, EnergyColumns
+from common.rollup import Rollup, Summary, day_number, merge
+
+
+Totals = Tuple[float, float, float]
+
+CHANNELS = ("consumption", "production")
+
+
+def report_totals(
+    consumption: int, production: int, temperature: int, count: int
+) -> Totals:
+    """
+    Converts integer sums (milli-kWh, tenths of a degree) to report units;
+    the average temperature is temperature over count readings.
+
+    Sums are kept in integers until here because sums of floats drift in
+    the last bits, which is enough to flip the two-decimal rounding of the
+    reports.
+    """
+    return (
+        consumption / ENERGY_SCALE,
+        production / ENERGY_SCALE,
+        temperature / (TEMPERATURE_SCALE * count) if count else 0.0,
+    )
+
+
+def _totals(summary: Summary, temperature: int, count: int) -> Totals:
+    return report_totals(summary.sums[0], summary.sums[1], temperature, count)
+
+
+class EnergyIndex:
+    """
+    Rollup index over hourly measurements.
+
+    Built once after loading; a date range is then answered from prefix sums
+    over the daily buckets, and a month or a year from its few materialised
+    buckets, instead of a scan over the hourly rows. The rows themselves are
+    not kept, so the index can also be built from a stream of chunks.
+    """
+
+    def __init__(self, columns: Optional[EnergyColumns] = None):
+        self.rows = 0
+        self.rollup = Rollup(CHANNELS)
+        # Local days (days since 1970-01-01) that have measurements.
+        self.days = self.rollup.keys("day")
+        if columns is not None:
+            self.extend(columns)
+
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[EnergyColumns]) -> "EnergyIndex":
+        """
+        Builds the index from consecutive blocks of rows, e.g. those of
+        read_column_chunks, dropping every block once it is added.
+        """
+        index = cls()
+        for columns in chunks:
+            index.extend(columns)
+        return index
+
+    def extend(self, columns: EnergyColumns) -> None:
+        """
+        Adds rows that follow the ones already added, e.g. the next chunk of
+        a file or hours appended to a followed file. Only the buckets the
+        new rows fall into are updated.
+        """
+        self.rows += len(columns)
+        self.rollup.add_columns(
+            array("q", [
+                (hour - (-offset // 60)) // 24
+                for hour, offset in zip(columns.hours, columns.offsets)
+            ]),
+            [columns.consumption, columns.production],
+            columns.temperature,
+        )
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def years(self) -> List[int]:
+        """
+        Returns the local calendar years present in the data.
+        """
+        return list(self.rollup.keys("year"))
+
+    def range_totals(self, start_date: date, end_date: date) -> Totals:
+        """
+        Returns total consumption, total production and the average hourly
+        temperature for the days start_date..end_date (inclusive).
+        """
+        summary = self.rollup.range(
+            day_number(start_date), day_number(end_date), extremes=False
+        )
+        return _totals(summary, summary.temperature, summary.hours)
+
+    def month_totals(self, month: int, year: Optional[int] = None) -> Totals:
+        """
+        Returns total consumption, total production and the average daily
+        temperature of the given month, of one year or of every year in the
+        data. The daily temperature is the last reading of each day.
+        """
+        if year is not None:
+            summary = self.rollup.find("month", year * 100 + month) or merge(
+                [], len(CHANNELS)
+            )
+        else:
+            summary = merge(
+                (
+                    self.rollup.bucket("month", index)
+                    for index, key in enumerate(self.rollup.keys("month"))
+                    if key % 100 == month
+                ),
+                len(CHANNELS),
+            )
+        return _totals(summary, summary.daily_temperature, summary.days)
+
+    def year_totals(self, year: Optional[int] = None) -> Totals:
+        """
+        Returns totals and the average hourly temperature of one year, or of
+        all rows when year is None.
+        """
+        if year is None:
+            summary = self.rollup.total()
+        else:
+            summary = self.rollup.find("year", year) or merge([], len(CHANNELS))
+        return _totals(summary, summary.temperature, summary.hours)
@@ -0,0 +1,303 @@
+# Copyright (c) 2025 Abdulbaki Salaudeen
+# License: MIT
+
+"""
+Partitioned on-disk store for hourly measurements of many sites.
+
+Layout: <root>/<site>/<year>/<month>.bin, one partition per site and local
+calendar month, and <root>/<site>/generation, a token that is replaced
+whenever the site's partitions change. A partition is a small header
+(magic, version, row count) followed by the EnergyColumns arrays as raw
+little-endian bytes, so loading one is a few array.fromfile calls. Queries
+only read the partitions of the months they touch.
+
+Usage:
+  python energy_store.py import <store> <site> <file.csv> ...
+  python energy_store.py list <store>
+"""
+
+import os
+import re
+import struct
+import sys
+import uuid
+from array import array
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from energy_columns import EnergyColumns, read_columns  # noqa: E402
+
+MAGIC = b"ENPT"
+# 2: readings as int64 milli-kWh and tenths of a degree instead of float64.
+# 3: UTC offsets as int16 minutes instead of int8 hours.
+VERSION = 3
+
+# magic, version, rows
+HEADER = struct.Struct("<4sIQ")
+
+COLUMNS = ("hours", "offsets", "consumption", "production", "temperature")
+
+Month = Tuple[int, int]
+
+GENERATION = "generation"
+
+# Site names become directory names.
+SITE_NAME = re.compile(r"[A-Za-z0-9_-]+")
+
+
+def check_site(site: str) -> str:
+    """
+    Returns site, or raises ValueError when it is not a valid site name.
+    """
+    if not SITE_NAME.fullmatch(site):
+        raise ValueError(
+            f"Invalid site name: {site!r} (use letters, digits, '_' and '-')"
+        )
+    return site
+
+
+def _columns_of(columns: EnergyColumns) -> List[array]:
+    return [getattr(columns, name) for name in COLUMNS]
+
+
+def write_partition(filename: str, columns: EnergyColumns) -> None:
+    temporary = filename + ".tmp"
+
+    with open(temporary, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, len(columns)))
+        for values in _columns_of(columns):
+            if sys.byteorder == "big":
+                values = array(values.typecode, values)
+                values.byteswap()
+            values.tofile(file)
+
+    os.replace(temporary, filename)
+
+
+def read_partition(
+    filename: str, into: Optional[EnergyColumns] = None
+) -> EnergyColumns:
+    """
+    Reads one partition, appending its rows to into when given.
+    """
+    columns = into if into is not None else EnergyColumns()
+
+    with open(filename, "rb") as file:
+        magic, version, rows = HEADER.unpack(file.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{filename} is not an energy partition")
+        if version != VERSION:
+            raise ValueError(
+                f"{filename} has partition version {version}, expected {VERSION}; "
+                "import the CSV files again"
+            )
+
+        for values in _columns_of(columns):
+            part = array(values.typecode)
+            part.fromfile(file, rows)
+            if sys.byteorder == "big":
+                part.byteswap()
+            values.extend(part)
+
+    return columns
+
+
+class EnergyStore:
+    """
+    Directory of per-site, per-month partitions.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def _path(self, site: str, month: Month) -> str:
+        year, number = month
+        return os.path.join(self.root, site, str(year), f"{number:02d}.bin")
+
+    def sites(self) -> List[str]:
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(
+            entry.name for entry in os.scandir(self.root)
+            if entry.is_dir() and SITE_NAME.fullmatch(entry.name)
+        )
+
+    def months(self, site: str) -> List[Month]:
+        """
+        Returns the (year, month) of every partition of a site, in order.
+        """
+        site_dir = os.path.join(self.root, check_site(site))
+        if not os.path.isdir(site_dir):
+            raise ValueError(f"Unknown site: {site}")
+
+        months = []
+        for year in os.scandir(site_dir):
+            if not (year.name.isdigit() and year.is_dir()):
+                continue
+            for entry in os.scandir(year.path):
+                name = entry.name
+                if name.endswith(".bin") and name[:-4].isdigit() and entry.is_file():
+                    months.append((int(year.name), int(name[:-4])))
+        return sorted(months)
+
+    def years(self, site: str) -> List[int]:
+        return sorted({year for year, _ in self.months(site)})
+
+    def resolve_site(self, site: Optional[str]) -> str:
+        """
+        Returns site, or the only site in the store when site is None.
+        """
+        if site is not None:
+            return check_site(site)
+
+        sites = self.sites()
+        if len(sites) != 1:
+            raise ValueError("A site is required when the store has several sites")
+        return sites[0]
+
+    def write(self, site: str, columns: EnergyColumns) -> int:
+        """
+        Stores chronologically ordered rows, merging them into the existing
+        partitions (a new row replaces a stored row of the same hour).
+        Returns the number of partitions written.
+        """
+        check_site(site)
+
+        # Rows of one month are contiguous in chronological data, so every
+        # partition is filled with slices of whole runs.
+        partitions: Dict[Month, EnergyColumns] = {}
+        start = 0
+        while start < len(columns):
+            day = columns.day_to_date(columns.local_day(start))
+            month = (day.year, day.month)
+            end = start + 1
+            while end < len(columns):
+                day = columns.day_to_date(columns.local_day(end))
+                if (day.year, day.month) != month:
+                    break
+                end += 1
+
+            part = partitions.get(month)
+            if part is None:
+                part = partitions[month] = EnergyColumns()
+            for source, target in zip(_columns_of(columns), _columns_of(part)):
+                target.extend(source[start:end])
+            start = end
+
+        for month, part in partitions.items():
+            filename = self._path(site, month)
+            if os.path.exists(filename):
+                part = _merge(read_partition(filename), part)
+            os.makedirs(os.path.dirname(filename), exist_ok=True)
+            write_partition(filename, part)
+
+        self._new_generation(site)
+        return len(partitions)
+
+    def generation(self, site: str) -> Optional[str]:
+        """
+        Returns the token write() replaces after every change to a site, or
+        None for a site written before the tokens were kept.
+        """
+        filename = os.path.join(self.root, check_site(site), GENERATION)
+        try:
+            with open(filename, "r", encoding="utf-8") as file:
+                return file.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def _new_generation(self, site: str) -> None:
+        filename = os.path.join(self.root, site, GENERATION)
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        temporary = filename + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            file.write(uuid.uuid4().hex)
+        os.replace(temporary, filename)
+
+    def import_csv(self, site: str, filename: str) -> int:
+        """
+        Adds a measurement CSV to a site. Returns the number of rows read.
+        """
+        columns = read_columns(filename)
+        self.write(site, columns)
+        return len(columns)
+
+    def load(self, site: str, months: Iterable[Month]) -> EnergyColumns:
+        """
+        Reads the given partitions of a site (missing ones are skipped)
+        into one set of columns, in chronological order.
+        """
+        check_site(site)
+        columns = EnergyColumns()
+        for month in sorted(set(months)):
+            filename = self._path(site, month)
+            if os.path.exists(filename):
+                read_partition(filename, columns)
+        return columns
+
+    def load_range(
+        self, site: str, start_date: date, end_date: date
+    ) -> EnergyColumns:
+        first = (start_date.year, start_date.month)
+        last = (end_date.year, end_date.month)
+        return self.load(
+            site, [month for month in self.months(site) if first <= month <= last]
+        )
+
+    def load_month(
+        self, site: str, month: int, year: Optional[int] = None
+    ) -> EnergyColumns:
+        return self.load(site, [
+            (partition_year, number) for partition_year, number in self.months(site)
+            if number == month and (year is None or partition_year == year)
+        ])
+
+    def load_year(self, site: str, year: Optional[int] = None) -> EnergyColumns:
+        return self.load(site, [
+            month for month in self.months(site) if year is None or month[0] == year
+        ])
+
+
+def _merge(stored: EnergyColumns, new: EnergyColumns) -> EnergyColumns:
+    new_hours = set(new.hours)
+    rows = [
+        (stored.hours[row], stored, row)
+        for row in range(len(stored))
+        if stored.hours[row] not in new_hours
+    ]
+    rows.extend((new.hours[row], new, row) for row in range(len(new)))
+    rows.sort(key=lambda item: item[0])
+
+    merged = EnergyColumns()
+    for _, source, row in rows:
+        for values, target in zip(_columns_of(source), _columns_of(merged)):
+            target.append(values[row])
+    return merged
+
+
+def main():
+    if len(sys.argv) >= 5 and sys.argv[1] == "import":
+        store = EnergyStore(sys.argv[2])
+        try:
+            site = check_site(sys.argv[3])
+        except ValueError as error:
+            sys.exit(str(error))
+        for filename in sys.argv[4:]:
+            rows = store.import_csv(site, filename)
+            print(f"Imported {rows} rows from {filename} into {site}")
+    elif len(sys.argv) == 3 and sys.argv[1] == "list":
+        store = EnergyStore(sys.argv[2])
+        for site in store.sites():
+            months = store.months(site)
+            years = ", ".join(str(year) for year in store.years(site))
+            print(f"{site}: {len(months)} months ({years})")
+    else:
+        print(__doc__.strip().split("Usage:")[1].strip())
+        sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
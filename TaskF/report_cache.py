@@ -0,0 +1,202 @@
+# Copyright (c) 2025 Abdulbaki Salaudeen
+# License: MIT
+
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Sequence
+
+from energy_index import Totals
+
+
+CACHE_VERSION = 1
+
+
+def dataset_version(source: str, site: Optional[str] = None) -> str:
+    """
+    Identifies the current content of a measurement CSV, or of one site of
+    an energy store, by the size and modification time of its files.
+    """
+    if os.path.isdir(source):
+        files = []
+        for directory, _, names in os.walk(os.path.join(source, site or "")):
+            files.extend(
+                os.path.join(directory, name)
+                for name in names
+                if name.endswith(".bin")
+            )
+    else:
+        files = [source]
+
+    digest = hashlib.sha256()
+    for filename in sorted(files):
+        stat = os.stat(filename)
+        digest.update(
+            f"{os.path.abspath(filename)}:{stat.st_size}:{stat.st_mtime_ns}\n".encode()
+        )
+    return digest.hexdigest()[:16]
+
+
+def valid_entry(entry: Any) -> bool:
+    """
+    Tells whether a loaded cache entry is a [key, totals] pair of a string
+    and three numbers, as save writes it.
+    """
+    if not isinstance(entry, list) or len(entry) != 2:
+        return False
+    key, totals = entry
+    return (
+        isinstance(key, str)
+        and isinstance(totals, list)
+        and len(totals) == 3
+        and all(type(value) in (int, float) for value in totals)
+    )
+
+
+class ReportCache:
+    """
+    Bounded LRU cache of report totals, optionally persisted as JSON.
+
+    Keys combine the dataset version with the query parameters, so results
+    of a file that has changed are never returned; they are evicted like any
+    other unused entry. hits and misses count lookups since the cache was
+    created.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 256):
+        self.path = path
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[str, Totals]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.load()
+
+    def load(self) -> None:
+        """
+        Reads the cache file; a missing or unreadable file means an empty
+        cache, and malformed entries are dropped.
+        """
+        if self.path is None:
+            return
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                content = json.load(file)
+        except (OSError, ValueError):
+            return
+
+        if not isinstance(content, dict) or content.get("version") != CACHE_VERSION:
+            return
+
+        entries = content.get("entries", [])
+        if not isinstance(entries, list):
+            return
+
+        # Stored from least to most recently used.
+        entries = [entry for entry in entries if valid_entry(entry)]
+        for key, totals in entries[-self.max_entries:]:
+            self.entries[key] = tuple(totals)
+
+    def save(self) -> None:
+        """
+        Writes the cache file.
+        """
+        if self.path is None:
+            return
+
+        temporary = self.path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump(
+                {
+                    "version": CACHE_VERSION,
+                    "entries": [
+                        [key, list(totals)] for key, totals in self.entries.items()
+                    ],
+                },
+                file,
+            )
+        os.replace(temporary, self.path)
+
+    def clear(self) -> None:
+        """
+        Drops every entry and removes the cache file.
+        """
+        self.entries.clear()
+        if self.path is None:
+            return
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def get(self, key: str) -> Optional[Totals]:
+        totals = self.entries.get(key)
+        if totals is None:
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return totals
+
+    def put(self, key: str, totals: Totals) -> None:
+        self.entries[key] = tuple(totals)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self.entries)}
+
+
+class CachedData:
+    """
+    Measurements whose report totals go through a ReportCache.
+
+    data is an EnergyIndex loaded from the CSV source, or an EnergyStore
+    rooted at source. The version of a CSV is taken once, when it was
+    loaded. Store partitions are read per query, so the version of a store
+    site is its generation token, read on every query; only sites written
+    before the store kept tokens fall back to checking every partition.
+    """
+
+    def __init__(self, data: Any, cache: ReportCache, source: str):
+        self.data = data
+        self.cache = cache
+        self.source = source
+        self._file_version = None if os.path.isdir(source) else dataset_version(source)
+
+    def version(self, site: Optional[str]) -> str:
+        if self._file_version is not None:
+            return self._file_version
+        site = self.data.resolve_site(site)
+        generation = self.data.generation(site)
+        if generation is None:
+            return dataset_version(self.source, site)
+        return f"{site}:{generation}"
+
+    def totals(
+        self,
+        kind: str,
+        params: Sequence,
+        site: Optional[str],
+        compute: Callable[[Any], Totals],
+    ) -> Totals:
+        """
+        Returns the cached totals of a query, computing them on a miss.
+        """
+        key = json.dumps([self.version(site), kind, site, *params])
+        totals = self.cache.get(key)
+        if totals is None:
+            totals = compute(self.data)
+            self.cache.put(key, totals)
+        return totals
+
+
+def unwrap(data: Any) -> Any:
+    """
+    Returns the measurements behind a CachedData, or data itself.
+    """
+    return data.data if isinstance(data, CachedData) else data
+
@@ -1,10 +1,48 @@
 # Copyright (c) 2025 Abdulbaki Salaudeen
 # License: MIT
 
-from datetime import datetime, date
-from typing import List, Dict
-
-
+import argparse
+import contextlib
+import os
+import sys
+import time
+from datetime import datetime, date, timedelta, timezone
+from pathlib import Path
+from typing import (
+    Iterable, Iterator, List, Dict, Optional, Sequence, TextIO, Tuple, Union
+)
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from common import profiling  # noqa: E402
+from common.columnar import is_columnar  # noqa: E402
+from common.fast_dates import parse_date, parse_datetime  # noqa: E402
+from common.tail import FileTail, parse_polled  # noqa: E402
+from energy_columns import (  # noqa: E402
+    CHUNK_ROWS,
+    ENERGY_DECIMALS,
+    TEMPERATURE_DECIMALS,
+    EnergyColumns,
+    export_columnar,
+    local_hour,
+    parse_fixed,
+    parse_lines,
+    read_column_chunks,
+    read_columns,
+)
+from energy_index import EnergyIndex, Totals, report_totals  # noqa: E402
+from energy_store import EnergyStore  # noqa: E402
+from report_cache import CachedData, ReportCache, unwrap  # noqa: E402
+
+
+# Reports accept the row dictionaries of read_data, the columns of
+# read_columns, an EnergyIndex built over those columns or an EnergyStore,
+# of which only the partitions a query touches are loaded. Any of them can
+# be wrapped in CachedData to reuse the totals of earlier queries.
+Measurements = Union[List[Dict], EnergyColumns, EnergyIndex, EnergyStore, CachedData]
+
+
+@profiling.timed("parse")
 def read_data(filename: str) -> List[Dict]:
     """
     Reads the CSV file and returns the measurements as a list of dictionaries.
@@ -12,10 +50,15 @@ def read_data(filename: str) -> List[Dict]:
     Each dictionary contains:
     - datetime (datetime)
     - date (date)
-    - consumption (float)
-    - production (float)
-    - temperature (float)
+    - consumption (int, milli-kWh)
+    - production (int, milli-kWh)
+    - temperature (int, tenths of a degree)
+
+    A columnar file written by export_columnar is loaded instead of parsed.
     """
+    if is_columnar(filename):
+        return columnar_rows(read_columns(filename))
+
     data: List[Dict] = []
 
     with open(filename, "r", encoding="utf-8") as file:
@@ -24,15 +67,15 @@ def read_data(filename: str) -> List[Dict]:
         for line in file:
             parts = line.strip().split(";")
 
-            dt = datetime.fromisoformat(parts[0])
-            consumption = float(parts[1].replace(",", "."))
-            production = float(parts[2].replace(",", "."))
-            temperature = float(parts[3].replace(",", "."))
+            dt = parse_datetime(parts[0])
+            consumption = parse_fixed(parts[1], ENERGY_DECIMALS)
+            production = parse_fixed(parts[2], ENERGY_DECIMALS)
+            temperature = parse_fixed(parts[3], TEMPERATURE_DECIMALS)
 
             data.append(
                 {
                     "datetime": dt,
-                    "date": dt.date(),
+                    "date": parse_date(parts[0]),
                     "consumption": consumption,
                     "production": production,
                     "temperature": temperature,
@@ -42,6 +85,199 @@ def read_data(filename: str) -> List[Dict]:
     return data
 
 
+def columnar_rows(columns: EnergyColumns) -> List[Dict]:
+    """
+    Converts columns to the dictionaries of read_data.
+    """
+    zones: Dict[int, timezone] = {}
+    data: List[Dict] = []
+
+    for hour, offset, consumption, production, temperature in zip(
+        columns.hours,
+        columns.offsets,
+        columns.consumption,
+        columns.production,
+        columns.temperature,
+    ):
+        zone = zones.get(offset)
+        if zone is None:
+            zone = zones[offset] = timezone(timedelta(minutes=offset))
+        local = local_hour(hour, offset)
+
+        data.append(
+            {
+                "datetime": datetime.fromtimestamp((local * 60 - offset) * 60, zone),
+                "date": columns.day_to_date(local // 24),
+                "consumption": consumption,
+                "production": production,
+                "temperature": temperature,
+            }
+        )
+
+    return data
+
+
+def iter_rows(data: Measurements) -> Iterator[Tuple[date, int, int, int]]:
+    """
+    Yields (date, consumption, production, temperature) for every hour, in
+    milli-kWh and tenths of a degree.
+    """
+    if isinstance(data, EnergyColumns):
+        return data.rows()
+
+    return (
+        (row["date"], row["consumption"], row["production"], row["temperature"])
+        for row in data
+    )
+
+
+def load_index(filename: str, chunk_rows: int = CHUNK_ROWS) -> EnergyIndex:
+    """
+    Builds the index of a measurement CSV chunk_rows rows at a time; every
+    block is dropped once it is added, so memory use grows with the number
+    of days but not with the number of rows.
+    """
+    index = EnergyIndex()
+    chunks = read_column_chunks(filename, chunk_rows)
+
+    while True:
+        with profiling.stage("parse"):
+            columns = next(chunks, None)
+        if columns is None:
+            break
+        profiling.add_rows(len(columns))
+
+        with profiling.stage("aggregate"):
+            index.extend(columns)
+
+    return index
+
+
+def column(data: Measurements, name: str) -> Iterable[int]:
+    """
+    Returns the values of one measurement in file order.
+    """
+    if isinstance(data, EnergyColumns):
+        return getattr(data, name)
+
+    return (row[name] for row in data)
+
+
+@profiling.timed("aggregate")
+def range_totals(
+    data: Measurements,
+    start_date: date,
+    end_date: date,
+    site: Optional[str] = None,
+) -> Totals:
+    """
+    Returns total consumption, total production and average hourly
+    temperature for the days start_date..end_date.
+    """
+    if isinstance(data, CachedData):
+        return data.totals(
+            "range",
+            (start_date.isoformat(), end_date.isoformat()),
+            site,
+            lambda inner: range_totals(inner, start_date, end_date, site),
+        )
+
+    if isinstance(data, EnergyStore):
+        data = EnergyIndex(
+            data.load_range(data.resolve_site(site), start_date, end_date)
+        )
+
+    if isinstance(data, EnergyIndex):
+        return data.range_totals(start_date, end_date)
+
+    total_consumption = 0
+    total_production = 0
+    total_temperature = 0
+    hours = 0
+
+    for day, consumption, production, temperature in iter_rows(data):
+        if start_date <= day <= end_date:
+            total_consumption += consumption
+            total_production += production
+            total_temperature += temperature
+            hours += 1
+
+    return report_totals(total_consumption, total_production, total_temperature, hours)
+
+
+@profiling.timed("aggregate")
+def month_totals(
+    data: Measurements,
+    month: int,
+    year: Optional[int] = None,
+    site: Optional[str] = None,
+) -> Totals:
+    """
+    Returns total consumption, total production and average daily
+    temperature for one month, of one year or of every year in the data.
+    """
+    if isinstance(data, CachedData):
+        return data.totals(
+            "month",
+            (month, year),
+            site,
+            lambda inner: month_totals(inner, month, year, site),
+        )
+
+    if isinstance(data, EnergyStore):
+        data = EnergyIndex(data.load_month(data.resolve_site(site), month, year))
+
+    if isinstance(data, EnergyIndex):
+        return data.month_totals(month, year)
+
+    total_consumption = 0
+    total_production = 0
+    daily_temps: Dict[date, int] = {}
+
+    for day, consumption, production, temperature in iter_rows(data):
+        if day.month == month and (year is None or day.year == year):
+            total_consumption += consumption
+            total_production += production
+            daily_temps[day] = temperature
+
+    return report_totals(
+        total_consumption,
+        total_production,
+        sum(daily_temps.values()),
+        len(daily_temps),
+    )
+
+
+@profiling.timed("aggregate")
+def year_totals(
+    data: Measurements, year: Optional[int] = None, site: Optional[str] = None
+) -> Totals:
+    """
+    Returns total consumption, total production and average hourly
+    temperature of one year, or over all rows when year is None.
+    """
+    if isinstance(data, CachedData):
+        return data.totals(
+            "year", (year,), site, lambda inner: year_totals(inner, year, site)
+        )
+
+    if isinstance(data, EnergyStore):
+        data = EnergyIndex(data.load_year(data.resolve_site(site), year))
+
+    if isinstance(data, EnergyIndex):
+        return data.year_totals(year)
+
+    if year is not None:
+        return range_totals(data, date(year, 1, 1), date(year, 12, 31))
+
+    return report_totals(
+        sum(column(data, "consumption")),
+        sum(column(data, "production")),
+        sum(column(data, "temperature")),
+        len(data),
+    )
+
+
 def format_number(value: float) -> str:
     """
     Formats a float with two decimals and comma as decimal separator.
@@ -56,44 +292,79 @@ def format_date(d: date) -> str:
     return f"{d.day}.{d.month}.{d.year}"
 
 
-def show_main_menu() -> str:
+def data_years(data: Measurements, site: Optional[str] = None) -> List[int]:
+    """
+    Returns the calendar years covered by the data.
+    """
+    data = unwrap(data)
+    if isinstance(data, EnergyStore):
+        return data.years(data.resolve_site(site))
+    if isinstance(data, EnergyIndex):
+        return data.years()
+
+    days = [day for day, _, _, _ in iter_rows(data)]
+    if not days:
+        return []
+    return list(range(days[0].year, days[-1].year + 1))
+
+
+def year_label(
+    data: Measurements, year: Optional[int] = None, site: Optional[str] = None
+) -> str:
+    """
+    Returns the year for report titles: the given year, the only year in
+    the data or the first and last year.
+    """
+    if year is not None:
+        return str(year)
+
+    years = data_years(data, site)
+    if len(years) == 1:
+        return str(years[0])
+    return f"{years[0]}–{years[-1]}" if years else "-"
+
+
+def site_suffix(site: Optional[str]) -> str:
+    return f" ({site})" if site else ""
+
+
+def show_main_menu(year: str = "2025") -> str:
     """
     Displays the main menu and returns user selection.
     """
     print("\nChoose a report type:")
     print("1) Daily summary for a date range")
     print("2) Monthly summary for one month")
-    print("3) Full year 2025 summary")
+    print(f"3) Full year {year} summary")
     print("4) Exit the program")
 
     return input("Select option (1–4): ")
 
 
-def create_daily_report(data: List[Dict]) -> List[str]:
+def parse_finnish_date(text: str) -> date:
     """
-    Creates a daily summary report for a given date range.
+    Parses a dd.mm.yyyy date.
     """
-    start_input = input("Enter start date (dd.mm.yyyy): ")
-    end_input = input("Enter end date (dd.mm.yyyy): ")
-
-    start_date = datetime.strptime(start_input, "%d.%m.%Y").date()
-    end_date = datetime.strptime(end_input, "%d.%m.%Y").date()
-
-    total_consumption = 0.0
-    total_production = 0.0
-    temperatures: List[float] = []
+    return datetime.strptime(text.strip(), "%d.%m.%Y").date()
 
-    for row in data:
-        if start_date <= row["date"] <= end_date:
-            total_consumption += row["consumption"]
-            total_production += row["production"]
-            temperatures.append(row["temperature"])
 
-    avg_temp = sum(temperatures) / len(temperatures) if temperatures else 0.0
+def create_daily_report(
+    data: Measurements,
+    start_date: date,
+    end_date: date,
+    site: Optional[str] = None,
+) -> List[str]:
+    """
+    Creates a daily summary report for a given date range.
+    """
+    total_consumption, total_production, avg_temp = range_totals(
+        data, start_date, end_date, site
+    )
 
     lines = [
         "-----------------------------------------------------",
-        f"Report for the period {format_date(start_date)}–{format_date(end_date)}",
+        f"Report for the period {format_date(start_date)}–{format_date(end_date)}"
+        f"{site_suffix(site)}",
         f"- Total consumption: {format_number(total_consumption)} kWh",
         f"- Total production: {format_number(total_production)} kWh",
         f"- Average temperature: {format_number(avg_temp)} °C",
@@ -102,29 +373,27 @@ def create_daily_report(data: List[Dict]) -> List[str]:
     return lines
 
 
-def create_monthly_report(data: List[Dict]) -> List[str]:
+def create_monthly_report(
+    data: Measurements,
+    month: int,
+    year: Optional[int] = None,
+    site: Optional[str] = None,
+) -> List[str]:
     """
-    Creates a monthly summary report for a selected month.
+    Creates a monthly summary report for a selected month, of one year or
+    of every year in the data.
     """
-    month = int(input("Enter month number (1–12): "))
-
-    total_consumption = 0.0
-    total_production = 0.0
-    daily_temps: Dict[date, float] = {}
-
-    for row in data:
-        if row["date"].month == month:
-            total_consumption += row["consumption"]
-            total_production += row["production"]
-            daily_temps[row["date"]] = row["temperature"]
-
-    avg_temp = sum(daily_temps.values()) / len(daily_temps) if daily_temps else 0.0
+    total_consumption, total_production, avg_temp = month_totals(
+        data, month, year, site
+    )
 
     month_name = datetime(2025, month, 1).strftime("%B")
+    if year is not None:
+        month_name = f"{month_name} {year}"
 
     lines = [
         "-----------------------------------------------------",
-        f"Report for the month: {month_name}",
+        f"Report for the month: {month_name}{site_suffix(site)}",
         f"- Total consumption: {format_number(total_consumption)} kWh",
         f"- Total production: {format_number(total_production)} kWh",
         f"- Average temperature: {format_number(avg_temp)} °C",
@@ -133,17 +402,17 @@ def create_monthly_report(data: List[Dict]) -> List[str]:
     return lines
 
 
-def create_yearly_report(data: List[Dict]) -> List[str]:
+def create_yearly_report(
+    data: Measurements, year: Optional[int] = None, site: Optional[str] = None
+) -> List[str]:
     """
-    Creates a full-year summary report.
+    Creates a full-year summary report, of one year or of all the data.
     """
-    total_consumption = sum(row["consumption"] for row in data)
-    total_production = sum(row["production"] for row in data)
-    avg_temp = sum(row["temperature"] for row in data) / len(data)
+    total_consumption, total_production, avg_temp = year_totals(data, year, site)
 
     lines = [
         "-----------------------------------------------------",
-        "Report for the year: 2025",
+        f"Report for the year: {year_label(data, year, site)}{site_suffix(site)}",
         f"- Total consumption: {format_number(total_consumption)} kWh",
         f"- Total production: {format_number(total_production)} kWh",
         f"- Average temperature: {format_number(avg_temp)} °C",
@@ -152,6 +421,176 @@ def create_yearly_report(data: List[Dict]) -> List[str]:
     return lines
 
 
+def ask_daily_report(data: Measurements, site: Optional[str] = None) -> List[str]:
+    """
+    Asks for a date range and creates its daily report.
+    """
+    start_input = input("Enter start date (dd.mm.yyyy): ")
+    end_input = input("Enter end date (dd.mm.yyyy): ")
+
+    return create_daily_report(
+        data, parse_finnish_date(start_input), parse_finnish_date(end_input), site
+    )
+
+
+def ask_monthly_report(
+    data: Measurements, year: Optional[int] = None, site: Optional[str] = None
+) -> List[str]:
+    """
+    Asks for a month and creates its monthly report.
+    """
+    month = int(input("Enter month number (1–12): "))
+
+    return create_monthly_report(data, month, year, site)
+
+
+def answer_query(
+    data: Measurements,
+    query: str,
+    year: Optional[int] = None,
+    site: Optional[str] = None,
+) -> List[str]:
+    """
+    Creates the report for one batch query:
+    "daily dd.mm.yyyy dd.mm.yyyy", "monthly <1-12>" or "yearly", optionally
+    followed by year=<yyyy> and site=<name> to override the defaults.
+    A site only applies to an energy_store.py directory.
+    Raises ValueError for anything else.
+    """
+    parts = []
+    options = {"year": year, "site": site}
+    for token in query.split():
+        if "=" not in token:
+            parts.append(token)
+            continue
+        key, value = token.split("=", 1)
+        if key not in options:
+            raise ValueError(f"unknown option: {key}")
+        options[key] = value
+
+    year = int(options["year"]) if options["year"] is not None else None
+    site = options["site"]
+    if site is not None and not isinstance(unwrap(data), EnergyStore):
+        raise ValueError("site= needs an energy_store.py directory")
+    kind = parts[0].lower() if parts else ""
+
+    if kind == "daily" and len(parts) == 3:
+        return create_daily_report(
+            data, parse_finnish_date(parts[1]), parse_finnish_date(parts[2]), site
+        )
+
+    if kind == "monthly" and len(parts) == 2:
+        month = int(parts[1])
+        if not 1 <= month <= 12:
+            raise ValueError(f"month must be 1–12, got {month}")
+        return create_monthly_report(data, month, year, site)
+
+    if kind == "yearly" and len(parts) == 1:
+        return create_yearly_report(data, year, site)
+
+    raise ValueError(f"unknown query: {query}")
+
+
+def run_batch(
+    data: Measurements,
+    queries: Iterable[str],
+    output: TextIO,
+    year: Optional[int] = None,
+    site: Optional[str] = None,
+) -> Tuple[int, int]:
+    """
+    Answers every query line and streams the reports to output.
+    Blank lines and text after # are ignored; invalid queries are reported
+    on stderr and skipped. Returns the number of answered and failed queries.
+    """
+    answered = 0
+    failed = 0
+
+    for number, line in enumerate(queries, start=1):
+        query = line.split("#", 1)[0].strip()
+        if not query:
+            continue
+
+        try:
+            lines = answer_query(data, query, year, site)
+        except ValueError as error:
+            print(f"Line {number}: {error}", file=sys.stderr)
+            failed += 1
+            continue
+
+        output.write("\n".join(lines) + "\n")
+        answered += 1
+
+    return answered, failed
+
+
+def affected_reports(index: EnergyIndex, rows: EnergyColumns) -> List[List[str]]:
+    """
+    Creates the daily, monthly and yearly reports of the days that rows
+    fall into, answered from the updated index.
+    """
+    days = sorted({rows.day_to_date(rows.local_day(row)) for row in range(len(rows))})
+    months = sorted({(day.year, day.month) for day in days})
+    years = sorted({day.year for day in days})
+
+    return (
+        [create_daily_report(index, day, day) for day in days]
+        + [create_monthly_report(index, month, year) for year, month in months]
+        + [create_yearly_report(index, year) for year in years]
+    )
+
+
+def follow(
+    filename: str,
+    output: TextIO,
+    interval: float = 5.0,
+    polls: Optional[int] = None,
+) -> EnergyIndex:
+    """
+    Follows a growing measurement CSV.
+
+    The file is read once; after that every poll parses only the lines
+    appended since the previous one, adds them to the index and writes the
+    reports of the days, months and years they changed. A rotated or
+    truncated file is read again from the start. Stops after polls polls,
+    or runs until interrupted when polls is None. Returns the index.
+    """
+    tail = FileTail(filename)
+    index = EnergyIndex()
+    loaded = False
+    count = 0
+
+    while polls is None or count < polls:
+        count += 1
+        reset, lines = tail.poll()
+
+        if reset:
+            index = EnergyIndex()
+            loaded = False
+            print(f"{filename} was replaced or truncated, reading it again",
+                  file=sys.stderr)
+
+        if not lines:
+            if polls is None or count < polls:
+                time.sleep(interval)
+            continue
+
+        rows = parse_polled(parse_lines, lines)
+        index.extend(rows)
+
+        if not loaded:
+            loaded = True
+            print(f"Following {filename}: {len(index)} rows", file=sys.stderr)
+            continue
+
+        for report in affected_reports(index, rows):
+            output.write("\n".join(report) + "\n")
+        output.flush()
+
+    return index
+
+
+@profiling.timed("render")
 def print_report_to_console(lines: List[str]) -> None:
     """
     Prints report lines to the console.
@@ -160,6 +599,7 @@ def print_report_to_console(lines: List[str]) -> None:
         print(line)
 
 
+@profiling.timed("write")
 def write_report_to_file(lines: List[str]) -> None:
     """
     Writes report lines to report.txt (overwrites existing file).
@@ -183,21 +623,130 @@ def post_report_menu() -> str:
     return input("Select option (1–3): ")
 
 
-def main() -> None:
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
     """
-    Main function: controls the program flow.
+    Parses the command line options.
+    """
+    parser = argparse.ArgumentParser(
+        description="Creates electricity consumption and production reports."
+    )
+    parser.add_argument(
+        "-d", "--data",
+        default="2025.csv",
+        help="measurement CSV file, a columnar file written by --export, or "
+             "an energy_store.py directory (default: 2025.csv)",
+    )
+    parser.add_argument(
+        "-s", "--site",
+        help="site to report on (needed when the store has several sites)",
+    )
+    parser.add_argument(
+        "-y", "--year",
+        type=int,
+        help="year for the monthly and yearly reports (default: all years)",
+    )
+    parser.add_argument(
+        "-b", "--batch",
+        metavar="QUERIES",
+        help="answer the queries in this file ('-' for stdin) instead of "
+             "showing the menu; one query per line: "
+             "'daily dd.mm.yyyy dd.mm.yyyy', 'monthly <1-12>' or 'yearly'",
+    )
+    parser.add_argument(
+        "-o", "--output",
+        default="report.txt",
+        help="file for the batch reports ('-' for stdout, default: report.txt)",
+    )
+    parser.add_argument(
+        "--export",
+        metavar="FILE",
+        help="convert the measurement CSV to a compressed columnar file "
+             "(.parquet needs pyarrow) and exit",
+    )
+    parser.add_argument(
+        "--chunk-rows",
+        type=int,
+        default=CHUNK_ROWS,
+        help="rows of the CSV file parsed at a time, which bounds the memory "
+             "use while loading, and rows per row group with --export "
+             f"(default: {CHUNK_ROWS})",
+    )
+    parser.add_argument(
+        "-f", "--follow",
+        action="store_true",
+        help="keep reading rows appended to the CSV file and write the "
+             "reports they change to stdout",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=5.0,
+        help="seconds between checks for new rows in follow mode (default: 5)",
+    )
+    parser.add_argument(
+        "--cache",
+        default=".report_cache.json",
+        help="file for cached report totals (default: .report_cache.json)",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=256,
+        help="maximum number of cached reports (default: 256)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="compute every report and leave the cache untouched",
+    )
+    parser.add_argument(
+        "--clear-cache",
+        action="store_true",
+        help="discard the cache before running",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="write one JSON line of stage timings to stderr "
+             "(or to the file named by TASK_PROFILE)",
+    )
+    return parser.parse_args(argv)
+
+
+def run_interface(data: Measurements, args: argparse.Namespace) -> None:
+    """
+    Answers the batch queries, or shows the menus until the user exits.
     """
-    data = read_data("2025.csv")
+    if args.batch is not None:
+        with contextlib.ExitStack() as files:
+            queries = sys.stdin if args.batch == "-" else files.enter_context(
+                open(args.batch, encoding="utf-8")
+            )
+            output = sys.stdout if args.output == "-" else files.enter_context(
+                open(args.output, "w", encoding="utf-8")
+            )
+            answered, failed = run_batch(
+                data, queries, output, args.year, args.site
+            )
+
+        summary = f"{answered} reports written to {args.output}, {failed} failed"
+        if isinstance(data, CachedData):
+            stats = data.cache.stats()
+            summary += f" (cache: {stats['hits']} hits, {stats['misses']} misses)"
+        print(summary, file=sys.stderr)
+        if failed:
+            sys.exit(1)
+        return
 
     while True:
-        choice = show_main_menu()
+        choice = show_main_menu(year_label(data, args.year, args.site))
 
         if choice == "1":
-            report = create_daily_report(data)
+            report = ask_daily_report(data, args.site)
         elif choice == "2":
-            report = create_monthly_report(data)
+            report = ask_monthly_report(data, args.year, args.site)
         elif choice == "3":
-            report = create_yearly_report(data)
+            report = create_yearly_report(data, args.year, args.site)
         elif choice == "4":
             print("Exiting program.")
             break
@@ -220,5 +769,57 @@ def main() -> None:
             else:
                 print("Invalid selection.")
 
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """
+    Main function: controls the program flow.
+    """
+    args = parse_args(argv)
+    profiling.start("task_f", globals())
+
+    if args.export:
+        if os.path.isdir(args.data):
+            sys.exit("--export needs a measurement CSV file")
+        rows = export_columnar(args.data, args.export, args.chunk_rows)
+        print(f"Exported {rows} rows from {args.data} to {args.export}")
+        return
+
+    if args.follow:
+        if os.path.isdir(args.data) or is_columnar(args.data):
+            sys.exit("--follow needs a measurement CSV file")
+        try:
+            follow(args.data, sys.stdout, args.interval)
+        except KeyboardInterrupt:
+            pass
+        return
+
+    if args.site is not None and not os.path.isdir(args.data):
+        sys.exit("--site needs an energy_store.py directory")
+
+    if os.path.isdir(args.data):
+        # Partitions are read per query.
+        data: Measurements = EnergyStore(args.data)
+        if args.batch is None:
+            try:
+                args.site = data.resolve_site(args.site)
+                data.months(args.site)
+            except ValueError as error:
+                sys.exit(str(error))
+    else:
+        data = load_index(args.data, args.chunk_rows)
+
+    cache = None if args.no_cache else ReportCache(args.cache, args.cache_size)
+    if args.clear_cache:
+        (cache or ReportCache(args.cache)).clear()
+    if cache is not None:
+        data = CachedData(data, cache, args.data)
+
+    try:
+        run_interface(data, args)
+    finally:
+        if cache is not None:
+            cache.save()
+
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,274 @@
+import heapq
+import random
+import sys
+from datetime import date, time
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from common.fast_dates import format_date  # noqa: E402
+from task_g_class import Reservation, fetch_reservations  # noqa: E402
+
+
+# The max_end of a node whose subtree holds only empty intervals.
+_NO_END = float("-inf")
+
+
+def booking_interval(reservation: Reservation) -> tuple[int, int]:
+    """
+    Returns the booked time as [start, end) in minutes since 0001-01-01.
+    A zero-length booking is the empty interval [start, start), which
+    overlaps nothing.
+    """
+    start = (
+        reservation.reservation_date.toordinal() * 1440
+        + reservation.reservation_time.hour * 60
+        + reservation.reservation_time.minute
+    )
+    return start, start + reservation.duration_hours * 60
+
+
+class _Node:
+    __slots__ = ("key", "end", "max_end", "priority", "left", "right")
+
+    def __init__(self, key: tuple[int, int], end: int, priority: float):
+        self.key = key
+        self.end = end
+        self.max_end = end if key[0] < end else _NO_END
+        self.priority = priority
+        self.left: Optional["_Node"] = None
+        self.right: Optional["_Node"] = None
+
+    def update(self) -> None:
+        max_end = self.end if self.key[0] < self.end else _NO_END
+        if self.left is not None and self.left.max_end > max_end:
+            max_end = self.left.max_end
+        if self.right is not None and self.right.max_end > max_end:
+            max_end = self.right.max_end
+        self.max_end = max_end
+
+
+def _split(node: Optional[_Node], key: tuple) -> tuple:
+    """
+    Splits a treap into nodes with keys < key and keys >= key.
+    """
+    if node is None:
+        return None, None
+    if node.key < key:
+        node.right, right = _split(node.right, key)
+        node.update()
+        return node, right
+    left, node.left = _split(node.left, key)
+    node.update()
+    return left, node
+
+
+def _merge(left: Optional[_Node], right: Optional[_Node]) -> Optional[_Node]:
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        left.update()
+        return left
+    right.left = _merge(left, right.left)
+    right.update()
+    return right
+
+
+class IntervalTree:
+    """
+    Interval tree over [start, end) intervals, kept as a treap ordered by
+    (start, booking id) where every node also stores the largest end in its
+    subtree. Inserts, removals and "does anything overlap" queries take
+    O(log n) expected time; listing overlaps costs O(log n + k).
+
+    Intervals are half-open, so intervals that only touch do not overlap,
+    and empty intervals (end <= start) are kept but overlap nothing; they
+    are left out of max_end.
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        self.root: Optional[_Node] = None
+        self.size = 0
+        self._random = random.Random(seed)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def insert(self, start: int, end: int, booking_id: int) -> None:
+        node = _Node((start, booking_id), end, self._random.random())
+        left, right = _split(self.root, node.key)
+        self.root = _merge(_merge(left, node), right)
+        self.size += 1
+
+    def remove(self, start: int, booking_id: int) -> bool:
+        """
+        Removes one interval; returns False when it was not in the tree.
+        When the same start and id were inserted more than once, the other
+        copies stay.
+        """
+        key = (start, booking_id)
+        left, rest = _split(self.root, key)
+        matches, right = _split(rest, (start, booking_id + 1))
+        if matches is None:
+            self.root = _merge(left, right)
+            return False
+        # Only the root of the matching subtree goes; its children are the
+        # other copies.
+        matches = _merge(matches.left, matches.right)
+        self.root = _merge(_merge(left, matches), right)
+        self.size -= 1
+        return True
+
+    def any_overlap(self, start: int, end: int) -> Optional[int]:
+        """
+        Returns the id of some interval overlapping [start, end), or None.
+        """
+        if end <= start:
+            return None
+        node = self.root
+        while node is not None:
+            if node.key[0] < end and start < node.end and node.key[0] < node.end:
+                return node.key[1]
+            if node.left is not None and node.left.max_end > start:
+                node = node.left
+            elif node.key[0] < end:
+                node = node.right
+            else:
+                return None
+        return None
+
+    def overlaps(self, start: int, end: int) -> Iterator[int]:
+        """
+        Yields the ids of every interval overlapping [start, end).
+        """
+        if end <= start:
+            return
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node is None or node.max_end <= start:
+                continue
+            stack.append(node.left)
+            if node.key[0] < end:
+                if start < node.end and node.key[0] < node.end:
+                    yield node.key[1]
+                stack.append(node.right)
+
+
+class BookingIndex:
+    """
+    Per-resource interval trees over reservations, for checking double
+    bookings incrementally.
+    """
+
+    def __init__(self, reservations: Iterable[Reservation] = ()):
+        self.trees: dict[str, IntervalTree] = {}
+        self.reservations: dict[int, Reservation] = {}
+        for reservation in reservations:
+            self.add(reservation)
+
+    def add(self, reservation: Reservation) -> None:
+        """
+        Adds a booking; one with the same reservation id is replaced.
+        """
+        self.cancel(reservation.reservation_id)
+        tree = self.trees.get(reservation.reserved_resource)
+        if tree is None:
+            tree = self.trees[reservation.reserved_resource] = IntervalTree()
+        start, end = booking_interval(reservation)
+        tree.insert(start, end, reservation.reservation_id)
+        self.reservations[reservation.reservation_id] = reservation
+
+    def cancel(self, reservation_id: int) -> bool:
+        reservation = self.reservations.pop(reservation_id, None)
+        if reservation is None:
+            return False
+        start, _ = booking_interval(reservation)
+        return self.trees[reservation.reserved_resource].remove(start, reservation_id)
+
+    def is_free(
+        self, resource: str, day: date, start_time: time, duration_hours: int
+    ) -> bool:
+        """
+        Tells whether a new booking of the resource would not overlap any
+        existing one.
+        """
+        tree = self.trees.get(resource)
+        if tree is None:
+            return True
+        start = day.toordinal() * 1440 + start_time.hour * 60 + start_time.minute
+        return tree.any_overlap(start, start + duration_hours * 60) is None
+
+    def conflicts_with(self, reservation: Reservation) -> list[Reservation]:
+        """
+        Returns the other bookings that overlap the given reservation.
+        """
+        tree = self.trees.get(reservation.reserved_resource)
+        if tree is None:
+            return []
+        start, end = booking_interval(reservation)
+        return [
+            self.reservations[booking_id]
+            for booking_id in tree.overlaps(start, end)
+            if booking_id != reservation.reservation_id
+        ]
+
+
+def find_conflicts(
+    reservations: Iterable[Reservation],
+) -> list[tuple[Reservation, Reservation]]:
+    """
+    Returns every pair of overlapping bookings of the same resource.
+
+    Sweeps each resource's bookings in start order while a heap holds the
+    ones still running, which is O(n log n) plus the number of conflicts.
+    Bookings are half-open intervals: one that ends when the next starts
+    does not conflict with it, and zero-length bookings conflict with
+    nothing.
+    """
+    by_resource: dict[str, list] = {}
+    for reservation in reservations:
+        start, end = booking_interval(reservation)
+        if end <= start:
+            continue
+        by_resource.setdefault(reservation.reserved_resource, []).append(
+            (start, end, reservation.reservation_id, reservation)
+        )
+
+    conflicts = []
+    for bookings in by_resource.values():
+        bookings.sort(key=lambda booking: booking[:3])
+        running: list = []
+        # The position breaks ties between equal ends, so the heap never
+        # compares reservations, even when booking ids repeat.
+        for position, (start, end, _, reservation) in enumerate(bookings):
+            while running and running[0][0] <= start:
+                heapq.heappop(running)
+            for _, _, other in running:
+                conflicts.append((other, reservation))
+            heapq.heappush(running, (end, position, reservation))
+    return conflicts
+
+
+def main():
+    reservations = fetch_reservations("reservations.txt")
+    conflicts = find_conflicts(reservations)
+
+    print("Overlapping bookings")
+    for first, second in conflicts:
+        print(
+            f'- {first.reserved_resource}: '
+            f'{first.name} (#{first.reservation_id}) and '
+            f'{second.name} (#{second.reservation_id}) '
+            f'on {format_date(second.reservation_date)}'
+        )
+    if not conflicts:
+        print("- none")
+
+
+if __name__ == "__main__":
+    main()
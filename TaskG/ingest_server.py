@@ -0,0 +1,229 @@
+"""
+TCP ingestion service for pipe-delimited reservation lines.
+
+Protocol (UTF-8, one message per line):
+- a reservation line in the reservations.txt format is queued for ingestion
+- an empty line ends the current batch; the server answers "OK <count>"
+  once every line of the batch has been parsed and added
+- "STATS" answers with one JSON line of the running aggregates
+- a line longer than LINE_LIMIT bytes is skipped, counted as an error and
+  answered with "ERROR line too long"; a batch that fails to ingest is
+  answered with "ERROR <reason>" instead of "OK <count>"
+
+Batches also end after BATCH_SIZE lines and when the client disconnects.
+Batches go through a bounded queue to a single task that parses and adds
+them; when the queue is full, connection handlers stop reading, so slow
+ingestion pushes back on the clients through TCP flow control.
+
+Usage: python ingest_server.py [host] [port]
+"""
+
+import asyncio
+import json
+import sys
+from typing import Optional
+
+from task_g_class import Reservation, convert_reservation_data
+
+BATCH_SIZE = 512
+QUEUE_BATCHES = 64
+LINE_LIMIT = 64 * 1024
+
+
+class ReservationAggregates:
+    """
+    Running totals that are updated per reservation, so queries never rescan.
+    """
+
+    def __init__(self):
+        self.total = 0
+        self.confirmed = 0
+        self.long = 0
+        self.revenue = 0.0
+
+    def add(self, reservation: Reservation) -> None:
+        self.total += 1
+        if reservation.is_confirmed():
+            self.confirmed += 1
+            self.revenue += reservation.total_price()
+        if reservation.is_long():
+            self.long += 1
+
+    def as_dict(self) -> dict:
+        return {
+            "reservations": self.total,
+            "confirmed": self.confirmed,
+            "not_confirmed": self.total - self.confirmed,
+            "long": self.long,
+            "revenue": round(self.revenue, 2),
+        }
+
+
+class IngestServer:
+    def __init__(
+        self, batch_size: int = BATCH_SIZE, queue_batches: int = QUEUE_BATCHES
+    ):
+        self.batch_size = batch_size
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_batches)
+        self.reservations: list[Reservation] = []
+        self.aggregates = ReservationAggregates()
+        self.errors = 0
+        self._worker: Optional[asyncio.Task] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._clients: set[asyncio.Task] = set()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765) -> int:
+        """
+        Starts listening and returns the bound port (useful with port 0).
+        """
+        self._worker = asyncio.create_task(self._ingest())
+        self._server = await asyncio.start_server(
+            self._handle_client, host, port, backlog=4096, limit=LINE_LIMIT
+        )
+        return self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def stop(self) -> None:
+        """
+        Stops accepting connections and waits for connected clients to finish.
+        """
+        self._server.close()
+        if self._clients:
+            await asyncio.wait(self._clients)
+        await self._server.wait_closed()
+        self._worker.cancel()
+
+    def ingest_batch(self, lines: list[str]) -> int:
+        """
+        Parses a batch of lines and adds the valid ones.
+        Returns the number of reservations added.
+        """
+        added = 0
+        for line in lines:
+            try:
+                reservation = convert_reservation_data(line.split("|"))
+            except (IndexError, ValueError):
+                self.errors += 1
+                continue
+            self.reservations.append(reservation)
+            self.aggregates.add(reservation)
+            added += 1
+        return added
+
+    async def _ingest(self) -> None:
+        while True:
+            lines, done = await self.queue.get()
+            try:
+                added = self.ingest_batch(lines)
+            except Exception as error:
+                # The submitting client must not wait forever on a failed batch.
+                if not done.cancelled():
+                    done.set_exception(error)
+            else:
+                if not done.cancelled():
+                    done.set_result(added)
+
+    async def _submit(self, lines: list[str]) -> int:
+        done = asyncio.get_running_loop().create_future()
+        await self.queue.put((lines, done))
+        return await done
+
+    async def _flush(self, batch: list[str], writer: asyncio.StreamWriter) -> None:
+        try:
+            added = await self._submit(batch)
+        except Exception as error:
+            writer.write(f"ERROR {error}\n".encode("utf-8"))
+            return
+        writer.write(f"OK {added}\n".encode("utf-8"))
+
+    async def _read_line(self, reader: asyncio.StreamReader) -> Optional[bytes]:
+        """
+        Returns the next line (b"" at end of input), or None after skipping
+        a line longer than the reader's limit.
+        """
+        try:
+            return await reader.readuntil(b"\n")
+        except asyncio.IncompleteReadError as error:
+            return error.partial
+        except asyncio.LimitOverrunError as error:
+            consumed = error.consumed
+        while True:
+            # Drop what is buffered and keep reading until the newline.
+            await reader.readexactly(consumed)
+            try:
+                await reader.readuntil(b"\n")
+                return None
+            except asyncio.IncompleteReadError:
+                return None
+            except asyncio.LimitOverrunError as error:
+                consumed = error.consumed
+
+    async def _handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        task = asyncio.current_task()
+        self._clients.add(task)
+        batch: list[str] = []
+        try:
+            while True:
+                raw = await self._read_line(reader)
+                if raw is None:
+                    self.errors += 1
+                    writer.write(b"ERROR line too long\n")
+                    await writer.drain()
+                    continue
+                try:
+                    line = raw.decode("utf-8").strip()
+                except UnicodeDecodeError:
+                    self.errors += 1
+                    writer.write(b"ERROR invalid utf-8\n")
+                    await writer.drain()
+                    continue
+
+                if line == "STATS":
+                    writer.write((json.dumps(self.stats()) + "\n").encode("utf-8"))
+                elif line:
+                    batch.append(line)
+                    if len(batch) < self.batch_size:
+                        continue
+                    await self._flush(batch, writer)
+                    batch = []
+                elif raw or batch:
+                    # An empty line, or end of input with lines still pending.
+                    await self._flush(batch, writer)
+                    batch = []
+
+                await writer.drain()
+
+                if not raw:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            self._clients.discard(task)
+
+    def stats(self) -> dict:
+        stats = self.aggregates.as_dict()
+        stats["errors"] = self.errors
+        return stats
+
+
+async def serve(host: str, port: int) -> None:
+    server = IngestServer()
+    port = await server.start(host, port)
+    print(f"Listening on {host}:{port}")
+    await server.serve_forever()
+
+
+def main():
+    host = sys.argv[1] if len(sys.argv) > 1 else "127.0.0.1"
+    port = int(sys.argv[2]) if len(sys.argv) > 2 else 8765
+    asyncio.run(serve(host, port))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+import sys
+from contextlib import contextmanager
+from typing import Iterator, Optional, TextIO
+
+
+class ReportWriter:
+    """
+    Collects report lines and writes them to the stream in large chunks
+    instead of one print() call per line.
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None, chunk_lines: int = 8192):
+        self.stream = stream if stream is not None else sys.stdout
+        self.chunk_lines = chunk_lines
+        self.lines: list[str] = []
+
+    def __enter__(self) -> "ReportWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.flush()
+
+    def line(self, text: str = "") -> None:
+        self.lines.append(text)
+        if len(self.lines) >= self.chunk_lines:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.lines:
+            self.lines.append("")
+            self.stream.write("\n".join(self.lines))
+            self.lines.clear()
+
+
+@contextmanager
+def writer_for(out: Optional[ReportWriter]) -> Iterator[ReportWriter]:
+    """
+    Yields out when a writer is passed in; otherwise a new writer on stdout
+    that is flushed when the block ends.
+    """
+    if out is not None:
+        yield out
+        return
+
+    with ReportWriter() as writer:
+        yield writer
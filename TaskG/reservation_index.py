@@ -0,0 +1,265 @@
+from bisect import bisect_left, bisect_right, insort
+from datetime import date, datetime
+from operator import attrgetter, itemgetter
+from typing import Any, Callable, Iterable, Iterator, NamedTuple, Optional
+
+
+class Fields(NamedTuple):
+    """
+    Getters for the indexed fields, so the same index works for the
+    Reservation class and for the dictionaries of task_g_dict.
+    """
+
+    confirmed: Callable[[Any], bool]
+    resource: Callable[[Any], str]
+    date: Callable[[Any], date]
+    duration: Callable[[Any], int]
+    created_at: Callable[[Any], datetime]
+    price: Callable[[Any], float]
+
+
+CLASS_FIELDS = Fields(
+    confirmed=attrgetter("confirmed"),
+    resource=attrgetter("reserved_resource"),
+    date=attrgetter("reservation_date"),
+    duration=attrgetter("duration_hours"),
+    created_at=attrgetter("created_at"),
+    price=attrgetter("price"),
+)
+
+DICT_FIELDS = Fields(
+    confirmed=itemgetter("confirmed"),
+    resource=itemgetter("reservedResource"),
+    date=itemgetter("reservationDate"),
+    duration=itemgetter("durationHours"),
+    created_at=itemgetter("createdAt"),
+    price=itemgetter("price"),
+)
+
+
+class _SortedIndex:
+    """
+    (value, row) pairs kept sorted, for range lookups with bisect.
+    """
+
+    def __init__(self):
+        self.entries: list[tuple] = []
+
+    def build(self, pairs: Iterable[tuple]) -> None:
+        """
+        Adds many (value, row) pairs at once with a single sort, instead of
+        an insort per pair.
+        """
+        self.entries.extend(pairs)
+        self.entries.sort()
+
+    def add(self, value, row: int) -> None:
+        insort(self.entries, (value, row))
+
+    def remove(self, value, row: int) -> None:
+        position = bisect_left(self.entries, (value, row))
+        del self.entries[position]
+
+    def bounds(self, low=None, high=None) -> tuple[int, int]:
+        """
+        Returns the slice of entries with low <= value <= high.
+        """
+        first = 0 if low is None else bisect_left(self.entries, (low,))
+        last = len(self.entries)
+        if high is not None:
+            # (high, inf) sorts after every (high, row) pair.
+            last = max(first, bisect_right(self.entries, (high, float("inf"))))
+        return first, last
+
+    def rows(self, first: int, last: int) -> Iterable[int]:
+        return (row for _, row in self.entries[first:last])
+
+
+class ReservationIndex:
+    """
+    Secondary indexes over loaded reservations.
+
+    Hash indexes on confirmed status and resource, sorted indexes on
+    reservation date, duration and created_at. A query starts from whichever
+    condition matches the fewest reservations and only checks the other
+    conditions on those, so it never scans the whole data set. The indexes
+    are updated on add and remove.
+
+    The initial reservations are indexed in bulk, with one sort per sorted
+    index. The created_at index is only built by the first query on
+    created_at, so building the index does not decode the lazily parsed
+    created_at of every Reservation.
+    """
+
+    def __init__(self, reservations: Iterable = (), fields: Fields = CLASS_FIELDS):
+        self.fields = fields
+        self.rows: dict[int, Any] = {}
+        self._row_of: dict[int, int] = {}
+        self._next_row = 0
+
+        self.by_confirmed: dict[bool, set[int]] = {True: set(), False: set()}
+        self.by_resource: dict[str, set[int]] = {}
+        self.by_date = _SortedIndex()
+        self.by_duration = _SortedIndex()
+        self._by_created_at: Optional[_SortedIndex] = None
+
+        first = self._next_row
+        for reservation in reservations:
+            self._add_row(reservation)
+        added = range(first, self._next_row)
+        self.by_date.build((fields.date(self.rows[row]), row) for row in added)
+        self.by_duration.build(
+            (fields.duration(self.rows[row]), row) for row in added
+        )
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __iter__(self) -> Iterator:
+        """
+        Iterates over the reservations in the order they were added.
+        """
+        return iter(self.rows.values())
+
+    @property
+    def by_created_at(self) -> _SortedIndex:
+        if self._by_created_at is None:
+            self._by_created_at = _SortedIndex()
+            self._by_created_at.build(
+                (self.fields.created_at(reservation), row)
+                for row, reservation in self.rows.items()
+            )
+        return self._by_created_at
+
+    def _add_row(self, reservation) -> int:
+        # Registers the reservation and updates the hash indexes.
+        row = self._next_row
+        self._next_row += 1
+        self.rows[row] = reservation
+        self._row_of[id(reservation)] = row
+
+        fields = self.fields
+        self.by_confirmed[fields.confirmed(reservation)].add(row)
+        self.by_resource.setdefault(fields.resource(reservation), set()).add(row)
+        return row
+
+    def add(self, reservation) -> None:
+        row = self._add_row(reservation)
+
+        fields = self.fields
+        self.by_date.add(fields.date(reservation), row)
+        self.by_duration.add(fields.duration(reservation), row)
+        if self._by_created_at is not None:
+            self._by_created_at.add(fields.created_at(reservation), row)
+
+    def remove(self, reservation) -> None:
+        row = self._row_of.pop(id(reservation))
+        del self.rows[row]
+
+        fields = self.fields
+        self.by_confirmed[fields.confirmed(reservation)].discard(row)
+        resource = fields.resource(reservation)
+        self.by_resource[resource].discard(row)
+        if not self.by_resource[resource]:
+            del self.by_resource[resource]
+        self.by_date.remove(fields.date(reservation), row)
+        self.by_duration.remove(fields.duration(reservation), row)
+        if self._by_created_at is not None:
+            self._by_created_at.remove(fields.created_at(reservation), row)
+
+    def _plan(
+        self,
+        confirmed: Optional[bool] = None,
+        resource: Optional[str] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        min_duration: Optional[int] = None,
+        max_duration: Optional[int] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+    ) -> tuple[int, Iterable[int], list[Callable[[Any], bool]]]:
+        """
+        Picks the condition with the fewest candidate rows.
+        Returns its candidate count, its rows and checks for the others.
+        """
+        fields = self.fields
+        candidates = []
+
+        if confirmed is not None:
+            rows = self.by_confirmed[confirmed]
+            candidates.append((
+                len(rows),
+                lambda rows=rows: rows,
+                lambda r: fields.confirmed(r) == confirmed,
+            ))
+
+        if resource is not None:
+            rows = self.by_resource.get(resource, set())
+            candidates.append((
+                len(rows),
+                lambda rows=rows: rows,
+                lambda r: fields.resource(r) == resource,
+            ))
+
+        for name, low, high, getter in (
+            ("by_date", date_from, date_to, fields.date),
+            ("by_duration", min_duration, max_duration, fields.duration),
+            ("by_created_at", created_from, created_to, fields.created_at),
+        ):
+            if low is None and high is None:
+                continue
+            index = getattr(self, name)
+            first, last = index.bounds(low, high)
+            candidates.append((
+                last - first,
+                lambda index=index, first=first, last=last: index.rows(first, last),
+                lambda r, getter=getter, low=low, high=high: (
+                    (low is None or getter(r) >= low)
+                    and (high is None or getter(r) <= high)
+                ),
+            ))
+
+        if not candidates:
+            return len(self.rows), self.rows.keys(), []
+
+        candidates.sort(key=lambda candidate: candidate[0])
+        size, rows, _ = candidates[0]
+        return size, rows(), [check for _, _, check in candidates[1:]]
+
+    def _matching_rows(self, **conditions) -> list[int]:
+        _, rows, checks = self._plan(**conditions)
+        return sorted(
+            row for row in rows
+            if all(check(self.rows[row]) for check in checks)
+        )
+
+    def select(self, **conditions) -> list:
+        """
+        Returns the matching reservations in the order they were added.
+
+        Conditions: confirmed, resource, date_from, date_to, min_duration,
+        max_duration, created_from, created_to (ranges are inclusive).
+        """
+        return [self.rows[row] for row in self._matching_rows(**conditions)]
+
+    def count(self, **conditions) -> int:
+        """
+        Returns the number of matching reservations.
+        """
+        size, rows, checks = self._plan(**conditions)
+        if not checks:
+            return size
+        return sum(
+            1 for row in rows
+            if all(check(self.rows[row]) for check in checks)
+        )
+
+    def revenue(self, **conditions) -> float:
+        """
+        Returns the summed duration * price of the matching reservations.
+        """
+        fields = self.fields
+        return sum(
+            fields.duration(self.rows[row]) * fields.price(self.rows[row])
+            for row in self._matching_rows(**conditions)
+        )
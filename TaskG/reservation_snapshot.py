@@ -0,0 +1,239 @@
+"""
+Binary snapshot of a parsed reservations file.
+
+Layout (little-endian):
+- header: magic, format version, row count, size / mtime / SHA-256 of the
+  source text file and the offset of the string table
+- one fixed-width record per reservation (see RECORD)
+- string table: every distinct string, UTF-8 encoded and joined with "\\n"
+  (a field of a line-based file can never contain a newline)
+
+Usage: python reservation_snapshot.py [reservations.txt]
+writes reservations.txt.snap next to the text file.
+"""
+
+import hashlib
+import os
+import struct
+import sys
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from typing import Iterator, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from common.fast_dates import parse_date, parse_datetime, parse_time  # noqa: E402
+
+MAGIC = b"RSNP"
+VERSION = 2
+
+# magic, version, rows, source size, source mtime_ns, source sha256,
+# string table offset
+HEADER = struct.Struct("<4sIQQq32sQ")
+
+# reservation id, name, email, phone (string ids), date (ordinal),
+# time (minutes after midnight), duration, price, confirmed,
+# reserved resource (string id), created_at (microseconds since 0001-01-01)
+RECORD = struct.Struct("<qIIIiHid?Iq")
+
+# Records are decoded this many at a time so loading a snapshot does not
+# hold a second copy of the whole record area in memory.
+BLOCK_RECORDS = 4096
+
+_CREATED_BASE = datetime(1, 1, 1)
+
+
+def snapshot_path(reservation_file: str) -> str:
+    return reservation_file + ".snap"
+
+
+def file_digest(filename: str) -> bytes:
+    digest = hashlib.sha256()
+    with open(filename, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.digest()
+
+
+def build_snapshot(reservation_file: str, snapshot_file: Optional[str] = None) -> int:
+    """
+    Parses a reservations text file and writes its snapshot.
+    Returns the number of reservations written. Raises ValueError for a
+    created_at with a UTC offset, which the snapshot cannot store.
+    """
+    snapshot_file = snapshot_file or snapshot_path(reservation_file)
+    stat = os.stat(reservation_file)
+    digest = hashlib.sha256()
+    strings: dict[str, int] = {}
+
+    def string_id(value: str) -> int:
+        code = strings.get(value)
+        if code is None:
+            code = strings[value] = len(strings)
+        return code
+
+    rows = 0
+    temporary = snapshot_file + ".tmp"
+
+    try:
+        with open(reservation_file, "rb") as source, open(temporary, "wb") as out:
+            out.write(bytes(HEADER.size))
+
+            for raw in source:
+                digest.update(raw)
+                line = raw.decode("utf-8")
+                if len(line.strip()) == 0:
+                    continue
+
+                fields = line.split("|")
+                reservation_time = parse_time(fields[5])
+                created_at = parse_datetime(fields[10].strip())
+                if created_at.tzinfo is not None:
+                    raise ValueError(
+                        f"created_at {fields[10].strip()} of reservation {fields[0]} "
+                        "has a UTC offset; snapshots store local times only"
+                    )
+
+                out.write(RECORD.pack(
+                    int(fields[0]),
+                    string_id(fields[1]),
+                    string_id(fields[2]),
+                    string_id(fields[3]),
+                    parse_date(fields[4]).toordinal(),
+                    reservation_time.hour * 60 + reservation_time.minute,
+                    int(fields[6]),
+                    float(fields[7]),
+                    fields[8].strip() == "True",
+                    string_id(fields[9]),
+                    (created_at - _CREATED_BASE) // timedelta(microseconds=1),
+                ))
+                rows += 1
+
+            strings_offset = out.tell()
+            out.write("\n".join(strings).encode("utf-8"))
+
+            out.seek(0)
+            out.write(HEADER.pack(
+                MAGIC,
+                VERSION,
+                rows,
+                stat.st_size,
+                stat.st_mtime_ns,
+                digest.digest(),
+                strings_offset,
+            ))
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+
+    os.replace(temporary, snapshot_file)
+    return rows
+
+
+def read_header(snapshot_file: str) -> Optional[tuple]:
+    try:
+        with open(snapshot_file, "rb") as f:
+            header = HEADER.unpack(f.read(HEADER.size))
+    except (OSError, struct.error):
+        return None
+
+    if header[0] != MAGIC or header[1] != VERSION:
+        return None
+    return header
+
+
+def is_fresh(reservation_file: str, snapshot_file: Optional[str] = None) -> bool:
+    """
+    Tells whether the snapshot exists, is newer than the text file and was
+    built from its current content. The content hash is only checked when
+    the recorded modification time no longer matches.
+    """
+    snapshot_file = snapshot_file or snapshot_path(reservation_file)
+    header = read_header(snapshot_file)
+    if header is None:
+        return False
+
+    _, _, _, size, mtime_ns, checksum, _ = header
+    source = os.stat(reservation_file)
+
+    if os.stat(snapshot_file).st_mtime_ns < source.st_mtime_ns:
+        return False
+    if source.st_size != size:
+        return False
+    if source.st_mtime_ns == mtime_ns:
+        return True
+    return file_digest(reservation_file) == checksum
+
+
+def read_snapshot(snapshot_file: str) -> Iterator[tuple]:
+    """
+    Yields every reservation as a tuple in convert_reservation_data order:
+    (id, name, email, phone, date, time, duration, price, confirmed,
+    resource, created_at).
+    """
+    header = read_header(snapshot_file)
+    if header is None:
+        raise ValueError(f"{snapshot_file} is not a reservation snapshot")
+
+    rows, strings_offset = header[2], header[6]
+    dates: dict[int, date] = {}
+    times: dict[int, time] = {}
+
+    with open(snapshot_file, "rb") as f:
+        f.seek(strings_offset)
+        strings = f.read().decode("utf-8").split("\n")
+
+        f.seek(HEADER.size)
+        remaining = rows
+
+        while remaining:
+            count = min(remaining, BLOCK_RECORDS)
+            remaining -= count
+            block = f.read(count * RECORD.size)
+
+            for (
+                reservation_id, name, email, phone, ordinal, minutes,
+                duration, price, confirmed, resource, created,
+            ) in RECORD.iter_unpack(block):
+                reservation_date = dates.get(ordinal)
+                if reservation_date is None:
+                    reservation_date = dates[ordinal] = date.fromordinal(ordinal)
+
+                reservation_time = times.get(minutes)
+                if reservation_time is None:
+                    reservation_time = times[minutes] = time(minutes // 60, minutes % 60)
+
+                yield (
+                    reservation_id,
+                    strings[name],
+                    strings[email],
+                    strings[phone],
+                    reservation_date,
+                    reservation_time,
+                    duration,
+                    price,
+                    confirmed,
+                    strings[resource],
+                    _CREATED_BASE + timedelta(microseconds=created),
+                )
+
+
+def fresh_snapshot(reservation_file: str) -> Optional[str]:
+    """
+    Returns the snapshot path when it can be used instead of the text file.
+    """
+    snapshot_file = snapshot_path(reservation_file)
+    if os.path.exists(snapshot_file) and is_fresh(reservation_file, snapshot_file):
+        return snapshot_file
+    return None
+
+
+def main():
+    reservation_file = sys.argv[1] if len(sys.argv) > 1 else "reservations.txt"
+    rows = build_snapshot(reservation_file)
+    print(f"Wrote {rows} reservations to {snapshot_path(reservation_file)}")
+
+
+if __name__ == "__main__":
+    main()
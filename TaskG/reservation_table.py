@@ -0,0 +1,364 @@
+import sys
+from array import array
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from typing import Iterator, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from common.fast_dates import (  # noqa: E402
+    format_date, parse_date, parse_datetime, parse_time
+)
+from report_writer import ReportWriter, writer_for  # noqa: E402
+from reservation_snapshot import fresh_snapshot, read_snapshot  # noqa: E402
+
+_CREATED_BASE = datetime(1, 1, 1)
+
+
+class StringPool:
+    """
+    Interns repeated strings and hands out small integer codes for them.
+    """
+
+    def __init__(self):
+        self.values: list[str] = []
+        self.codes: dict[str, int] = {}
+
+    def add(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.codes[value] = code
+            self.values.append(value)
+        return code
+
+    def __getitem__(self, code: int) -> str:
+        return self.values[code]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class StringColumn:
+    """
+    Strings that rarely repeat, stored back to back as UTF-8 in one
+    bytearray with an offset column marking where each one ends.
+    """
+
+    def __init__(self):
+        self.data = bytearray()
+        self.ends = array("q")
+
+    def append(self, value: str) -> None:
+        self.data += value.encode("utf-8")
+        self.ends.append(len(self.data))
+
+    def extend(self, other: "StringColumn") -> None:
+        base = len(self.data)
+        self.data += other.data
+        if base:
+            self.ends.extend(array("q", [base + end for end in other.ends]))
+        else:
+            self.ends.extend(other.ends)
+
+    def __getitem__(self, index: int) -> str:
+        start = self.ends[index - 1] if index else 0
+        return self.data[start:self.ends[index]].decode("utf-8")
+
+    def __len__(self) -> int:
+        return len(self.ends)
+
+
+class BitSet:
+    """
+    Growable bitset backed by a bytearray, one bit per row.
+    """
+
+    def __init__(self):
+        self.bits = bytearray()
+        self.size = 0
+
+    def append(self, value: bool) -> None:
+        if self.size % 8 == 0:
+            self.bits.append(0)
+        if value:
+            self.bits[self.size >> 3] |= 1 << (self.size & 7)
+        self.size += 1
+
+    def extend(self, other: "BitSet") -> None:
+        if self.size % 8 == 0:
+            # Byte aligned, so the other set's bytes can be copied as is.
+            self.bits.extend(other.bits)
+            self.size += other.size
+            return
+        for index in range(other.size):
+            self.append(other[index])
+
+    def __getitem__(self, index: int) -> bool:
+        return bool(self.bits[index >> 3] & (1 << (index & 7)))
+
+    def __len__(self) -> int:
+        return self.size
+
+    def count(self) -> int:
+        return int.from_bytes(self.bits, "little").bit_count()
+
+
+class ReservationTable:
+    """
+    Column-oriented reservation store.
+
+    Every field lives in its own typed column instead of one object per row:
+    dates are stored as proleptic ordinals, times as minutes after midnight
+    and created_at as seconds since 0001-01-01. Names and resources repeat
+    and are interned; emails and phones are mostly unique and are kept in
+    string columns.
+    """
+
+    def __init__(self):
+        self.reservation_ids = array("q")
+        self.names = array("i")
+        self.emails = StringColumn()
+        self.phones = StringColumn()
+        self.reservation_dates = array("q")
+        self.reservation_times = array("q")
+        self.durations = array("q")
+        self.prices = array("d")
+        self.confirmed = BitSet()
+        self.resources = array("i")
+        self.created_at = array("q")
+
+        self.name_pool = StringPool()
+        self.resource_pool = StringPool()
+
+    def __len__(self) -> int:
+        return len(self.reservation_ids)
+
+    def append(self, reservation: list[str]) -> None:
+        """
+        Parses one split reservation line and appends it to the columns.
+        """
+        self.append_row((
+            int(reservation[0]),
+            reservation[1],
+            reservation[2],
+            reservation[3],
+            parse_date(reservation[4]),
+            parse_time(reservation[5]),
+            int(reservation[6]),
+            float(reservation[7]),
+            reservation[8].strip() == "True",
+            reservation[9],
+            parse_datetime(reservation[10].strip()),
+        ))
+
+    def append_row(self, row: tuple) -> None:
+        """
+        Appends one already parsed reservation, with the fields in
+        convert_reservation_data order.
+        """
+        (
+            reservation_id, name, email, phone, reservation_date,
+            reservation_time, duration, price, confirmed, resource, created_at,
+        ) = row
+
+        self.reservation_ids.append(reservation_id)
+        self.names.append(self.name_pool.add(name))
+        self.emails.append(email)
+        self.phones.append(phone)
+        self.reservation_dates.append(reservation_date.toordinal())
+        self.reservation_times.append(
+            reservation_time.hour * 60 + reservation_time.minute
+        )
+        self.durations.append(duration)
+        self.prices.append(price)
+        self.confirmed.append(confirmed)
+        self.resources.append(self.resource_pool.add(resource))
+        self.created_at.append(
+            (created_at.toordinal() - 1) * 86400
+            + created_at.hour * 3600
+            + created_at.minute * 60
+            + created_at.second
+        )
+
+    def extend(self, other: "ReservationTable") -> None:
+        """
+        Appends every row of another table, remapping its string codes.
+        """
+        names = [self.name_pool.add(value) for value in other.name_pool.values]
+        resources = [
+            self.resource_pool.add(value) for value in other.resource_pool.values
+        ]
+
+        self.reservation_ids.extend(other.reservation_ids)
+        self.names.extend(array("i", [names[code] for code in other.names]))
+        self.emails.extend(other.emails)
+        self.phones.extend(other.phones)
+        self.reservation_dates.extend(other.reservation_dates)
+        self.reservation_times.extend(other.reservation_times)
+        self.durations.extend(other.durations)
+        self.prices.extend(other.prices)
+        self.confirmed.extend(other.confirmed)
+        self.resources.extend(array("i", [resources[code] for code in other.resources]))
+        self.created_at.extend(other.created_at)
+
+    def rows(self) -> Iterator[tuple]:
+        """
+        Yields every row as a tuple in convert_reservation_data order.
+        """
+        dates: dict[int, date] = {}
+        times: dict[int, time] = {}
+
+        for row in range(len(self)):
+            ordinal = self.reservation_dates[row]
+            reservation_date = dates.get(ordinal)
+            if reservation_date is None:
+                reservation_date = dates[ordinal] = date.fromordinal(ordinal)
+
+            minutes = self.reservation_times[row]
+            reservation_time = times.get(minutes)
+            if reservation_time is None:
+                reservation_time = times[minutes] = time(minutes // 60, minutes % 60)
+
+            yield (
+                self.reservation_ids[row],
+                self.name(row),
+                self.emails[row],
+                self.phones[row],
+                reservation_date,
+                reservation_time,
+                self.durations[row],
+                self.prices[row],
+                self.confirmed[row],
+                self.resource(row),
+                _CREATED_BASE + timedelta(seconds=self.created_at[row]),
+            )
+
+    def name(self, row: int) -> str:
+        return self.name_pool[self.names[row]]
+
+    def resource(self, row: int) -> str:
+        return self.resource_pool[self.resources[row]]
+
+    def reservation_date(self, row: int) -> date:
+        return date.fromordinal(self.reservation_dates[row])
+
+
+def fetch_reservation_table(reservation_file: str) -> ReservationTable:
+    table = ReservationTable()
+
+    snapshot_file = fresh_snapshot(reservation_file)
+    if snapshot_file is not None:
+        for row in read_snapshot(snapshot_file):
+            table.append_row(row)
+        return table
+
+    with open(reservation_file, "r", encoding="utf-8") as f:
+        for line in f:
+            if len(line.strip()) > 0:
+                table.append(line.split("|"))
+
+    return table
+
+
+def format_ordinal(ordinal: int, cache: dict[int, str]) -> str:
+    text = cache.get(ordinal)
+    if text is None:
+        text = cache[ordinal] = format_date(date.fromordinal(ordinal))
+    return text
+
+
+def format_minutes(minutes: int) -> str:
+    return f"{minutes // 60:02d}.{minutes % 60:02d}"
+
+
+def confirmed_reservations(
+    table: ReservationTable, out: Optional[ReportWriter] = None
+) -> None:
+    dates: dict[int, str] = {}
+    with writer_for(out) as writer:
+        for row in range(len(table)):
+            if table.confirmed[row]:
+                writer.line(
+                    f'- {table.name(row)}, '
+                    f'{table.resource(row)}, '
+                    f'{format_ordinal(table.reservation_dates[row], dates)} '
+                    f'at {format_minutes(table.reservation_times[row])}'
+                )
+
+
+def long_reservations(
+    table: ReservationTable, out: Optional[ReportWriter] = None
+) -> None:
+    dates: dict[int, str] = {}
+    with writer_for(out) as writer:
+        for row, duration in enumerate(table.durations):
+            if duration >= 3:
+                writer.line(
+                    f'- {table.name(row)}, '
+                    f'{format_ordinal(table.reservation_dates[row], dates)} '
+                    f'at {format_minutes(table.reservation_times[row])}, '
+                    f'duration {duration} h, '
+                    f'{table.resource(row)}'
+                )
+
+
+def confirmation_statuses(
+    table: ReservationTable, out: Optional[ReportWriter] = None
+) -> None:
+    with writer_for(out) as writer:
+        for row in range(len(table)):
+            writer.line(
+                f'{table.name(row)} → '
+                f'{"Confirmed" if table.confirmed[row] else "NOT Confirmed"}'
+            )
+
+
+def confirmation_summary(
+    table: ReservationTable, out: Optional[ReportWriter] = None
+) -> None:
+    confirmed_count = table.confirmed.count()
+    with writer_for(out) as writer:
+        writer.line(
+            f'- Confirmed reservations: {confirmed_count} pcs\n'
+            f'- Not confirmed reservations: {len(table) - confirmed_count} pcs'
+        )
+
+
+def total_revenue(
+    table: ReservationTable, out: Optional[ReportWriter] = None
+) -> None:
+    confirmed = table.confirmed
+    revenue = sum(
+        duration * price
+        for row, (duration, price) in enumerate(zip(table.durations, table.prices))
+        if confirmed[row]
+    )
+    with writer_for(out) as writer:
+        writer.line(
+            f'Total revenue from confirmed reservations: {revenue:.2f} €'.replace(".", ",")
+        )
+
+
+def main():
+    table = fetch_reservation_table("reservations.txt")
+
+    with ReportWriter() as out:
+        out.line("1) Confirmed Reservations")
+        confirmed_reservations(table, out)
+
+        out.line("2) Long Reservations (≥ 3 h)")
+        long_reservations(table, out)
+
+        out.line("3) Reservation Confirmation Status")
+        confirmation_statuses(table, out)
+
+        out.line("4) Confirmation Summary")
+        confirmation_summary(table, out)
+
+        out.line("5) Total Revenue from Confirmed Reservations")
+        total_revenue(table, out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Multi-process loader for large reservation files.
+
+The file is split into byte ranges that start and end on line boundaries.
+Every range is parsed in a worker process straight into a ReservationTable
+(with the same field parsing as convert_reservation_data), which is sent
+back as typed columns and string pools instead of pickled objects. The
+tables are merged in file order, so the result is the same as parsing the
+file on one core.
+
+Usage: python sharded_loader.py [reservations.txt] [workers]
+"""
+
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from common.shards import read_lines, shard_ranges  # noqa: E402
+from reservation_table import ReservationTable  # noqa: E402
+from task_g_class import Reservation  # noqa: E402
+
+
+def parse_shard(reservation_file: str, start: int, end: int) -> ReservationTable:
+    table = ReservationTable()
+    for line in read_lines(reservation_file, start, end):
+        if len(line.strip()) > 0:
+            table.append(line.split("|"))
+    return table
+
+
+def load_table(
+    reservation_file: str, workers: Optional[int] = None
+) -> ReservationTable:
+    """
+    Parses the file on several processes and returns the merged table.
+    """
+    workers = workers or os.cpu_count() or 1
+    ranges = shard_ranges(reservation_file, workers)
+
+    if len(ranges) == 1:
+        return parse_shard(reservation_file, *ranges[0])
+
+    table = ReservationTable()
+    with ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as pool:
+        # map yields the shards in submission order, which is file order.
+        for part in pool.map(
+            parse_shard,
+            [reservation_file] * len(ranges),
+            [start for start, _ in ranges],
+            [end for _, end in ranges],
+        ):
+            table.extend(part)
+    return table
+
+
+def fetch_reservations(
+    reservation_file: str, workers: Optional[int] = None
+) -> list[Reservation]:
+    """
+    Same result as task_g_class.fetch_reservations, parsed in parallel.
+    """
+    return [
+        Reservation(*row)
+        for row in load_table(reservation_file, workers).rows()
+    ]
+
+
+def main():
+    reservation_file = sys.argv[1] if len(sys.argv) > 1 else "reservations.txt"
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+
+    table = load_table(reservation_file, workers)
+    print(f"Loaded {len(table)} reservations from {reservation_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,50 @@
-from datetime import datetime
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Union
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from common import profiling  # noqa: E402
+from common.fast_dates import (  # noqa: E402
+    format_date, format_time, parse_date, parse_datetime, parse_time
+)
+from report_writer import ReportWriter, writer_for  # noqa: E402
+from reservation_index import ReservationIndex  # noqa: E402
+from reservation_snapshot import fresh_snapshot, read_snapshot  # noqa: E402
+
+def check_created_at(text: str) -> None:
+    """
+    Raises ValueError unless text is a valid created_at timestamp.
+
+    The C parser is the cheapest complete check (about 0.16 µs, less than a
+    regular expression); only its result is thrown away, so a Reservation
+    still stores the undecoded text until created_at is read.
+    """
+    parse_datetime(text.strip())
 
 
 class Reservation:
+    # Fixed slots instead of a per-instance __dict__. Email, phone and
+    # created_at are rarely read by the reports, so reservations read from a
+    # file keep them as the undecoded "email|phone|created_at" text and only
+    # split and parse it the first time one of them is accessed.
+    __slots__ = (
+        "reservation_id",
+        "name",
+        "reservation_date",
+        "reservation_time",
+        "duration_hours",
+        "price",
+        "confirmed",
+        "reserved_resource",
+        "_raw",
+        "_email",
+        "_phone",
+        "_created_at",
+    )
+
     def __init__(
         self,
         reservation_id: int,
@@ -18,15 +61,82 @@ class Reservation:
     ):
         self.reservation_id = reservation_id
         self.name = name
-        self.email = email
-        self.phone = phone
         self.reservation_date = reservation_date
         self.reservation_time = reservation_time
         self.duration_hours = duration_hours
         self.price = price
         self.confirmed = confirmed
-        self.reserved_resource = reserved_resource
-        self.created_at = created_at
+        self.reserved_resource = sys.intern(reserved_resource)
+        self._raw = None
+        self._email = email
+        self._phone = phone
+        self._created_at = created_at
+
+    @classmethod
+    def from_fields(cls, reservation: list[str]) -> "Reservation":
+        """
+        Builds a reservation from a split line, leaving email, phone and
+        created_at undecoded. The format of created_at is still checked, so
+        a malformed line raises ValueError here.
+        """
+        check_created_at(reservation[10])
+        self = cls.__new__(cls)
+        self.reservation_id = int(reservation[0])
+        self.name = reservation[1]
+        self.reservation_date = parse_date(reservation[4])
+        self.reservation_time = parse_time(reservation[5])
+        self.duration_hours = int(reservation[6])
+        self.price = float(reservation[7])
+        self.confirmed = reservation[8].strip() == "True"
+        self.reserved_resource = sys.intern(reservation[9])
+        self._raw = f"{reservation[2]}|{reservation[3]}|{reservation[10]}"
+        self._email = None
+        self._phone = None
+        self._created_at = None
+        return self
+
+    def _decode(self) -> None:
+        email, phone, created_at = self._raw.split("|")
+        self._email = email
+        self._phone = phone
+        self._created_at = parse_datetime(created_at.strip())
+        self._raw = None
+
+    @property
+    def email(self) -> str:
+        if self._raw is not None:
+            self._decode()
+        return self._email
+
+    @email.setter
+    def email(self, value: str) -> None:
+        if self._raw is not None:
+            self._decode()
+        self._email = value
+
+    @property
+    def phone(self) -> str:
+        if self._raw is not None:
+            self._decode()
+        return self._phone
+
+    @phone.setter
+    def phone(self, value: str) -> None:
+        if self._raw is not None:
+            self._decode()
+        self._phone = value
+
+    @property
+    def created_at(self):
+        if self._raw is not None:
+            self._decode()
+        return self._created_at
+
+    @created_at.setter
+    def created_at(self, value) -> None:
+        if self._raw is not None:
+            self._decode()
+        self._created_at = value
 
     def is_confirmed(self) -> bool:
         return self.confirmed
@@ -38,103 +148,194 @@ class Reservation:
         return self.duration_hours * self.price
 
 
+@profiling.timed("parse")
 def convert_reservation_data(reservation: list[str]) -> Reservation:
-    return Reservation(
-        reservation_id=int(reservation[0]),
-        name=reservation[1],
-        email=reservation[2],
-        phone=reservation[3],
-        reservation_date=datetime.strptime(reservation[4], "%Y-%m-%d").date(),
-        reservation_time=datetime.strptime(reservation[5], "%H:%M").time(),
-        duration_hours=int(reservation[6]),
-        price=float(reservation[7]),
-        confirmed=True if reservation[8].strip() == "True" else False,
-        reserved_resource=reservation[9],
-        created_at=datetime.strptime(
-            reservation[10].strip(), "%Y-%m-%d %H:%M:%S"
-        ),
-    )
+    return Reservation.from_fields(reservation)
 
 
-def fetch_reservations(reservation_file: str) -> list[Reservation]:
-    reservations = []
+def iter_reservations(reservation_file: str) -> Iterator[Reservation]:
+    snapshot_file = fresh_snapshot(reservation_file)
+    if snapshot_file is not None:
+        for row in read_snapshot(snapshot_file):
+            yield Reservation(*row)
+        return
 
     with open(reservation_file, "r", encoding="utf-8") as f:
         for line in f:
             if len(line.strip()) > 0:
                 fields = line.split("|")
-                reservations.append(convert_reservation_data(fields))
+                yield convert_reservation_data(fields)
 
-    return reservations
 
+def fetch_reservations(reservation_file: str) -> list[Reservation]:
+    return list(iter_reservations(reservation_file))
+
+
+# The report functions take the loaded list, which they scan, or a
+# ReservationIndex over it, which answers their filters from its indexes.
+Reservations = Union[list[Reservation], ReservationIndex]
 
-def confirmed_reservations(reservations: list[Reservation]) -> None:
-    for reservation in reservations:
-        if reservation.is_confirmed():
-            print(
-                f'- {reservation.name}, '
-                f'{reservation.reserved_resource}, '
-                f'{reservation.reservation_date.strftime("%d.%m.%Y")} '
-                f'at {reservation.reservation_time.strftime("%H.%M")}'
-            )
 
+@profiling.timed("render")
+def confirmed_reservations(
+    reservations: Reservations, out: Optional[ReportWriter] = None
+) -> None:
+    if isinstance(reservations, ReservationIndex):
+        reservations = reservations.select(confirmed=True)
+    with writer_for(out) as writer:
+        for reservation in reservations:
+            if reservation.is_confirmed():
+                writer.line(
+                    f'- {reservation.name}, '
+                    f'{reservation.reserved_resource}, '
+                    f'{format_date(reservation.reservation_date)} '
+                    f'at {format_time(reservation.reservation_time)}'
+                )
 
-def long_reservations(reservations: list[Reservation]) -> None:
-    for reservation in reservations:
-        if reservation.is_long():
-            print(
-                f'- {reservation.name}, '
-                f'{reservation.reservation_date.strftime("%d.%m.%Y")} '
-                f'at {reservation.reservation_time.strftime("%H.%M")}, '
-                f'duration {reservation.duration_hours} h, '
-                f'{reservation.reserved_resource}'
+
+@profiling.timed("render")
+def long_reservations(
+    reservations: Reservations, out: Optional[ReportWriter] = None
+) -> None:
+    if isinstance(reservations, ReservationIndex):
+        reservations = reservations.select(min_duration=3)
+    with writer_for(out) as writer:
+        for reservation in reservations:
+            if reservation.is_long():
+                writer.line(
+                    f'- {reservation.name}, '
+                    f'{format_date(reservation.reservation_date)} '
+                    f'at {format_time(reservation.reservation_time)}, '
+                    f'duration {reservation.duration_hours} h, '
+                    f'{reservation.reserved_resource}'
+                )
+
+
+@profiling.timed("render")
+def confirmation_statuses(
+    reservations: Reservations, out: Optional[ReportWriter] = None
+) -> None:
+    with writer_for(out) as writer:
+        for reservation in reservations:
+            writer.line(
+                f'{reservation.name} → '
+                f'{"Confirmed" if reservation.is_confirmed() else "NOT Confirmed"}'
             )
 
 
-def confirmation_statuses(reservations: list[Reservation]) -> None:
-    for reservation in reservations:
-        print(
-            f'{reservation.name} → '
-            f'{"Confirmed" if reservation.is_confirmed() else "NOT Confirmed"}'
+@profiling.timed("render")
+def confirmation_summary(
+    reservations: Reservations, out: Optional[ReportWriter] = None
+) -> None:
+    if isinstance(reservations, ReservationIndex):
+        confirmed_count = reservations.count(confirmed=True)
+    else:
+        confirmed_count = len([r for r in reservations if r.is_confirmed()])
+    with writer_for(out) as writer:
+        writer.line(
+            f'- Confirmed reservations: {confirmed_count} pcs\n'
+            f'- Not confirmed reservations: {len(reservations) - confirmed_count} pcs'
         )
 
 
-def confirmation_summary(reservations: list[Reservation]) -> None:
-    confirmed_count = len([r for r in reservations if r.is_confirmed()])
-    print(
-        f'- Confirmed reservations: {confirmed_count} pcs\n'
-        f'- Not confirmed reservations: {len(reservations) - confirmed_count} pcs'
-    )
+@profiling.timed("render")
+def total_revenue(
+    reservations: Reservations, out: Optional[ReportWriter] = None
+) -> None:
+    if isinstance(reservations, ReservationIndex):
+        revenue = reservations.revenue(confirmed=True)
+    else:
+        revenue = sum(
+            r.total_price()
+            for r in reservations
+            if r.is_confirmed()
+        )
+    with writer_for(out) as writer:
+        writer.line(
+            f'Total revenue from confirmed reservations: {revenue:.2f} €'.replace(".", ",")
+        )
 
 
-def total_revenue(reservations: list[Reservation]) -> None:
-    revenue = sum(
-        r.total_price()
-        for r in reservations
-        if r.is_confirmed()
-    )
-    print(
-        f'Total revenue from confirmed reservations: {revenue:.2f} €'.replace(".", ",")
-    )
+def stream_reports(
+    reservations: Iterable[Reservation], out: Optional[ReportWriter] = None
+) -> None:
+    # Confirmed lines go straight to the output; long and status lines are
+    # spooled to temporary files so memory stays flat however large the
+    # input is.
+    counts = {"total": 0, "confirmed": 0}
 
+    with writer_for(out) as writer, \
+            tempfile.TemporaryFile("w+", encoding="utf-8") as long_file, \
+            tempfile.TemporaryFile("w+", encoding="utf-8") as status_file:
+        long_spool = ReportWriter(long_file)
+        status_spool = ReportWriter(status_file)
 
-def main():
-    reservations = fetch_reservations("reservations.txt")
+        def confirmed_amounts() -> Iterator[float]:
+            for reservation in reservations:
+                counts["total"] += 1
+                confirmed = reservation.is_confirmed()
+
+                if confirmed or reservation.is_long():
+                    date_str = format_date(reservation.reservation_date)
+                    time_str = format_time(reservation.reservation_time)
 
-    print("1) Confirmed Reservations")
-    confirmed_reservations(reservations)
+                if confirmed:
+                    counts["confirmed"] += 1
+                    writer.line(
+                        f'- {reservation.name}, '
+                        f'{reservation.reserved_resource}, '
+                        f'{date_str} at {time_str}'
+                    )
+                    yield reservation.total_price()
 
-    print("2) Long Reservations (≥ 3 h)")
-    long_reservations(reservations)
+                if reservation.is_long():
+                    long_spool.line(
+                        f'- {reservation.name}, '
+                        f'{date_str} at {time_str}, '
+                        f'duration {reservation.duration_hours} h, '
+                        f'{reservation.reserved_resource}'
+                    )
 
-    print("3) Reservation Confirmation Status")
-    confirmation_statuses(reservations)
+                status_spool.line(
+                    f'{reservation.name} → '
+                    f'{"Confirmed" if confirmed else "NOT Confirmed"}'
+                )
 
-    print("4) Confirmation Summary")
-    confirmation_summary(reservations)
+        writer.line("1) Confirmed Reservations")
+        # Summed with sum() like total_revenue so the rounding is identical.
+        revenue = sum(confirmed_amounts())
+
+        writer.line("2) Long Reservations (≥ 3 h)")
+        writer.flush()
+        long_spool.flush()
+        long_file.seek(0)
+        shutil.copyfileobj(long_file, writer.stream)
+
+        writer.line("3) Reservation Confirmation Status")
+        writer.flush()
+        status_spool.flush()
+        status_file.seek(0)
+        shutil.copyfileobj(status_file, writer.stream)
+
+        writer.line("4) Confirmation Summary")
+        writer.line(
+            f'- Confirmed reservations: {counts["confirmed"]} pcs\n'
+            f'- Not confirmed reservations: {counts["total"] - counts["confirmed"]} pcs'
+        )
+
+        writer.line("5) Total Revenue from Confirmed Reservations")
+        writer.line(
+            f'Total revenue from confirmed reservations: {revenue:.2f} €'.replace(".", ",")
+        )
+
+    profiling.add_rows(counts["total"])
+
+
+def main():
+    profiling.start("task_g_class")
 
-    print("5) Total Revenue from Confirmed Reservations")
-    total_revenue(reservations)
+    with profiling.stage("render"):
+        stream_reports(iter_reservations("reservations.txt"))
 
 
 if __name__ == "__main__":
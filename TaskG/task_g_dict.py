@@ -1,6 +1,35 @@
-from datetime import datetime
-
-
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Union
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from common import profiling  # noqa: E402
+from common.fast_dates import (  # noqa: E402
+    format_date, format_time, parse_date, parse_datetime, parse_time
+)
+from report_writer import ReportWriter, writer_for  # noqa: E402
+from reservation_index import ReservationIndex  # noqa: E402
+from reservation_snapshot import fresh_snapshot, read_snapshot  # noqa: E402
+
+FIELD_NAMES = (
+    "reservationId",
+    "name",
+    "email",
+    "phone",
+    "reservationDate",
+    "reservationTime",
+    "durationHours",
+    "price",
+    "confirmed",
+    "reservedResource",
+    "createdAt",
+)
+
+
+@profiling.timed("parse")
 def convert_reservation_data(reservation: list[str]) -> dict:
     """
     Convert reservation list into a dictionary
@@ -10,97 +39,209 @@ def convert_reservation_data(reservation: list[str]) -> dict:
         "name": reservation[1],
         "email": reservation[2],
         "phone": reservation[3],
-        "reservationDate": datetime.strptime(reservation[4], "%Y-%m-%d").date(),
-        "reservationTime": datetime.strptime(reservation[5], "%H:%M").time(),
+        "reservationDate": parse_date(reservation[4]),
+        "reservationTime": parse_time(reservation[5]),
         "durationHours": int(reservation[6]),
         "price": float(reservation[7]),
         "confirmed": True if reservation[8].strip() == "True" else False,
         "reservedResource": reservation[9],
-        "createdAt": datetime.strptime(reservation[10].strip(), "%Y-%m-%d %H:%M:%S"),
+        "createdAt": parse_datetime(reservation[10].strip()),
     }
 
 
-def fetch_reservations(reservation_file: str) -> list[dict]:
+def iter_reservations(reservation_file: str) -> Iterator[dict]:
     """
-    Reads reservations from file and returns list of dictionaries
+    Reads reservations from file one line at a time,
+    or from its binary snapshot when that is up to date
     """
-    reservations = []
+    snapshot_file = fresh_snapshot(reservation_file)
+    if snapshot_file is not None:
+        for row in read_snapshot(snapshot_file):
+            yield dict(zip(FIELD_NAMES, row))
+        return
 
     with open(reservation_file, "r", encoding="utf-8") as f:
         for line in f:
             if len(line.strip()) > 0:
                 fields = line.split("|")
-                reservations.append(convert_reservation_data(fields))
-
-    return reservations
-
-
-def confirmed_reservations(reservations: list[dict]) -> None:
-    for reservation in reservations:
-        if reservation["confirmed"]:
-            print(
-                f'- {reservation["name"]}, '
-                f'{reservation["reservedResource"]}, '
-                f'{reservation["reservationDate"].strftime("%d.%m.%Y")} '
-                f'at {reservation["reservationTime"].strftime("%H.%M")}'
-            )
-
-
-def long_reservations(reservations: list[dict]) -> None:
-    for reservation in reservations:
-        if reservation["durationHours"] >= 3:
-            print(
-                f'- {reservation["name"]}, '
-                f'{reservation["reservationDate"].strftime("%d.%m.%Y")} '
-                f'at {reservation["reservationTime"].strftime("%H.%M")}, '
-                f'duration {reservation["durationHours"]} h, '
-                f'{reservation["reservedResource"]}'
-            )
-
-
-def confirmation_statuses(reservations: list[dict]) -> None:
-    for reservation in reservations:
-        name = reservation["name"]
-        confirmed = reservation["confirmed"]
-        print(f'{name} → {"Confirmed" if confirmed else "NOT Confirmed"}')
-
+                yield convert_reservation_data(fields)
 
-def confirmation_summary(reservations: list[dict]) -> None:
-    confirmed_count = len([r for r in reservations if r["confirmed"]])
-    print(
-        f'- Confirmed reservations: {confirmed_count} pcs\n'
-        f'- Not confirmed reservations: {len(reservations) - confirmed_count} pcs'
-    )
 
-
-def total_revenue(reservations: list[dict]) -> None:
-    revenue = sum(
-        r["durationHours"] * r["price"]
-        for r in reservations
-        if r["confirmed"]
-    )
-    print(
-        f'Total revenue from confirmed reservations: {revenue:.2f} €'.replace(".", ",")
-    )
+def fetch_reservations(reservation_file: str) -> list[dict]:
+    """
+    Reads reservations from file and returns list of dictionaries
+    """
+    return list(iter_reservations(reservation_file))
+
+
+# The report functions take the loaded list, which they scan, or a
+# ReservationIndex over it built with DICT_FIELDS, which answers their
+# filters from its indexes.
+Reservations = Union[list[dict], ReservationIndex]
+
+
+@profiling.timed("render")
+def confirmed_reservations(
+    reservations: Reservations, out: Optional[ReportWriter] = None
+) -> None:
+    if isinstance(reservations, ReservationIndex):
+        reservations = reservations.select(confirmed=True)
+    with writer_for(out) as writer:
+        for reservation in reservations:
+            if reservation["confirmed"]:
+                writer.line(
+                    f'- {reservation["name"]}, '
+                    f'{reservation["reservedResource"]}, '
+                    f'{format_date(reservation["reservationDate"])} '
+                    f'at {format_time(reservation["reservationTime"])}'
+                )
+
+
+@profiling.timed("render")
+def long_reservations(
+    reservations: Reservations, out: Optional[ReportWriter] = None
+) -> None:
+    if isinstance(reservations, ReservationIndex):
+        reservations = reservations.select(min_duration=3)
+    with writer_for(out) as writer:
+        for reservation in reservations:
+            if reservation["durationHours"] >= 3:
+                writer.line(
+                    f'- {reservation["name"]}, '
+                    f'{format_date(reservation["reservationDate"])} '
+                    f'at {format_time(reservation["reservationTime"])}, '
+                    f'duration {reservation["durationHours"]} h, '
+                    f'{reservation["reservedResource"]}'
+                )
+
+
+@profiling.timed("render")
+def confirmation_statuses(
+    reservations: Reservations, out: Optional[ReportWriter] = None
+) -> None:
+    with writer_for(out) as writer:
+        for reservation in reservations:
+            name = reservation["name"]
+            confirmed = reservation["confirmed"]
+            writer.line(f'{name} → {"Confirmed" if confirmed else "NOT Confirmed"}')
+
+
+@profiling.timed("render")
+def confirmation_summary(
+    reservations: Reservations, out: Optional[ReportWriter] = None
+) -> None:
+    if isinstance(reservations, ReservationIndex):
+        confirmed_count = reservations.count(confirmed=True)
+    else:
+        confirmed_count = len([r for r in reservations if r["confirmed"]])
+    with writer_for(out) as writer:
+        writer.line(
+            f'- Confirmed reservations: {confirmed_count} pcs\n'
+            f'- Not confirmed reservations: {len(reservations) - confirmed_count} pcs'
+        )
+
+
+@profiling.timed("render")
+def total_revenue(
+    reservations: Reservations, out: Optional[ReportWriter] = None
+) -> None:
+    if isinstance(reservations, ReservationIndex):
+        revenue = reservations.revenue(confirmed=True)
+    else:
+        revenue = sum(
+            r["durationHours"] * r["price"]
+            for r in reservations
+            if r["confirmed"]
+        )
+    with writer_for(out) as writer:
+        writer.line(
+            f'Total revenue from confirmed reservations: {revenue:.2f} €'.replace(".", ",")
+        )
+
+
+def stream_reports(
+    reservations: Iterable[dict], out: Optional[ReportWriter] = None
+) -> None:
+    """
+    Writes all five reports in a single pass over the reservations
+    """
+    # Confirmed lines go straight to the output; long and status lines are
+    # spooled to temporary files so memory stays flat however large the
+    # input is.
+    counts = {"total": 0, "confirmed": 0}
+
+    with writer_for(out) as writer, \
+            tempfile.TemporaryFile("w+", encoding="utf-8") as long_file, \
+            tempfile.TemporaryFile("w+", encoding="utf-8") as status_file:
+        long_spool = ReportWriter(long_file)
+        status_spool = ReportWriter(status_file)
+
+        def confirmed_amounts() -> Iterator[float]:
+            for reservation in reservations:
+                counts["total"] += 1
+                confirmed = reservation["confirmed"]
+
+                if confirmed or reservation["durationHours"] >= 3:
+                    date_str = format_date(reservation["reservationDate"])
+                    time_str = format_time(reservation["reservationTime"])
+
+                if confirmed:
+                    counts["confirmed"] += 1
+                    writer.line(
+                        f'- {reservation["name"]}, '
+                        f'{reservation["reservedResource"]}, '
+                        f'{date_str} at {time_str}'
+                    )
+                    yield reservation["durationHours"] * reservation["price"]
+
+                if reservation["durationHours"] >= 3:
+                    long_spool.line(
+                        f'- {reservation["name"]}, '
+                        f'{date_str} at {time_str}, '
+                        f'duration {reservation["durationHours"]} h, '
+                        f'{reservation["reservedResource"]}'
+                    )
+
+                status_spool.line(
+                    f'{reservation["name"]} → '
+                    f'{"Confirmed" if confirmed else "NOT Confirmed"}'
+                )
+
+        writer.line("1) Confirmed Reservations")
+        # Summed with sum() like total_revenue so the rounding is identical.
+        revenue = sum(confirmed_amounts())
+
+        writer.line("2) Long Reservations (≥ 3 h)")
+        writer.flush()
+        long_spool.flush()
+        long_file.seek(0)
+        shutil.copyfileobj(long_file, writer.stream)
+
+        writer.line("3) Reservation Confirmation Status")
+        writer.flush()
+        status_spool.flush()
+        status_file.seek(0)
+        shutil.copyfileobj(status_file, writer.stream)
+
+        writer.line("4) Confirmation Summary")
+        writer.line(
+            f'- Confirmed reservations: {counts["confirmed"]} pcs\n'
+            f'- Not confirmed reservations: {counts["total"] - counts["confirmed"]} pcs'
+        )
+
+        writer.line("5) Total Revenue from Confirmed Reservations")
+        writer.line(
+            f'Total revenue from confirmed reservations: {revenue:.2f} €'.replace(".", ",")
+        )
+
+    profiling.add_rows(counts["total"])
 
 
 def main():
-    reservations = fetch_reservations("reservations.txt")
-
-    print("1) Confirmed Reservations")
-    confirmed_reservations(reservations)
-
-    print("2) Long Reservations (≥ 3 h)")
-    long_reservations(reservations)
-
-    print("3) Reservation Confirmation Status")
-    confirmation_statuses(reservations)
-
-    print("4) Confirmation Summary")
-    confirmation_summary(reservations)
+    profiling.start("task_g_dict")
 
-    print("5) Total Revenue from Confirmed Reservations")
-    total_revenue(reservations)
+    with profiling.stage("render"):
+        stream_reports(iter_reservations("reservations.txt"))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,319 @@
+"""
+The original implementations of the paths the benchmarks time, copied from
+the task scripts as they were before they were optimised.
+
+The benchmarks check the result of every optimised path against these
+before timing it, so a speedup never comes from computing something else.
+"""
+
+import csv
+import math
+import re
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+FINNISH_WEEKDAYS = {
+    0: "Monday",
+    1: "Tuesday",
+    2: "Wednesday",
+    3: "Thursday",
+    4: "Friday",
+    5: "Saturday",
+    6: "Sunday",
+}
+
+
+# Reservations (TaskC, TaskG)
+
+def convert_reservation_data(row: List[str]) -> list:
+    """
+    Parses one split reservation line with strptime, in field order.
+    """
+    return [
+        int(row[0]),
+        row[1],
+        row[2],
+        row[3],
+        datetime.strptime(row[4], "%Y-%m-%d").date(),
+        datetime.strptime(row[5], "%H:%M").time(),
+        int(row[6]),
+        float(row[7]),
+        row[8].strip() == "True",
+        row[9],
+        datetime.strptime(row[10].strip(), "%Y-%m-%d %H:%M:%S"),
+    ]
+
+
+def read_reservations(filename: str) -> List[list]:
+    with open(filename, "r", encoding="utf-8") as file:
+        return [
+            convert_reservation_data(line.strip().split("|"))
+            for line in file
+            if line.strip()
+        ]
+
+
+def taskc_report(reservations: List[list]) -> str:
+    """
+    The text TaskC main printed.
+    """
+    lines = ["1) Confirmed Reservations"]
+    for r in reservations:
+        if r[8]:
+            date_str = r[4].strftime("%d.%m.%Y")
+            time_str = r[5].strftime("%H.%M")
+            lines.append(f"- {r[1]}, {r[9]}, {date_str} at {time_str}")
+    lines.append("")
+
+    lines.append("2) Long Reservations (≥ 3 h)")
+    for r in reservations:
+        if r[6] >= 3:
+            date_str = r[4].strftime("%d.%m.%Y")
+            time_str = r[5].strftime("%H.%M")
+            lines.append(f"- {r[1]}, {date_str} at {time_str}, duration {r[6]} h, {r[9]}")
+    lines.append("")
+
+    lines.append("3) Reservation Confirmation Status")
+    for r in reservations:
+        status = "Confirmed" if r[8] else "NOT Confirmed"
+        lines.append(f"{r[1]} → {status}")
+    lines.append("")
+
+    confirmed = sum(1 for r in reservations if r[8])
+    lines.append("4) Confirmation Summary")
+    lines.append(f"- Confirmed reservations: {confirmed} pcs")
+    lines.append(f"- Not confirmed reservations: {len(reservations) - confirmed} pcs")
+    lines.append("")
+
+    total = 0.0
+    for r in reservations:
+        if r[8]:
+            total += r[6] * r[7]
+    amount_str = f"{total:.2f}".replace(".", ",")
+    lines.append("5) Total Revenue from Confirmed Reservations")
+    lines.append(f"Total revenue from confirmed reservations: {amount_str} €")
+    return "\n".join(lines) + "\n"
+
+
+def taskg_report(reservations: List[list]) -> str:
+    """
+    The text TaskG main printed, for the class and the dict version alike.
+    """
+    lines = ["1) Confirmed Reservations"]
+    for r in reservations:
+        if r[8]:
+            lines.append(
+                f'- {r[1]}, {r[9]}, '
+                f'{r[4].strftime("%d.%m.%Y")} at {r[5].strftime("%H.%M")}'
+            )
+
+    lines.append("2) Long Reservations (≥ 3 h)")
+    for r in reservations:
+        if r[6] >= 3:
+            lines.append(
+                f'- {r[1]}, {r[4].strftime("%d.%m.%Y")} '
+                f'at {r[5].strftime("%H.%M")}, duration {r[6]} h, {r[9]}'
+            )
+
+    lines.append("3) Reservation Confirmation Status")
+    for r in reservations:
+        lines.append(f'{r[1]} → {"Confirmed" if r[8] else "NOT Confirmed"}')
+
+    confirmed_count = len([r for r in reservations if r[8]])
+    lines.append("4) Confirmation Summary")
+    lines.append(
+        f'- Confirmed reservations: {confirmed_count} pcs\n'
+        f'- Not confirmed reservations: {len(reservations) - confirmed_count} pcs'
+    )
+
+    revenue = sum(r[6] * r[7] for r in reservations if r[8])
+    lines.append("5) Total Revenue from Confirmed Reservations")
+    lines.append(
+        f'Total revenue from confirmed reservations: {revenue:.2f} €'.replace(".", ",")
+    )
+    return "\n".join(lines) + "\n"
+
+
+# Week files (TaskD, TaskE)
+
+def read_week(filename: str) -> List[Dict]:
+    rows = []
+
+    with open(filename, "r", encoding="utf-8") as file:
+        reader = csv.reader(file, delimiter=";")
+        next(reader)
+
+        for row in reader:
+            rows.append({
+                "datetime": datetime.fromisoformat(row[0]),
+                "consumption": [int(row[1]), int(row[2]), int(row[3])],
+                "production": [int(row[4]), int(row[5]), int(row[6])],
+            })
+
+    return rows
+
+
+def week_daily_totals(rows: List[Dict]) -> Dict[date, Dict]:
+    """
+    Groups hourly rows by date and calculates daily totals in Wh.
+    """
+    daily: Dict[date, Dict] = {}
+
+    for row in rows:
+        day = row["datetime"].date()
+
+        if day not in daily:
+            daily[day] = {
+                "consumption": [0, 0, 0],
+                "production": [0, 0, 0],
+            }
+
+        for i in range(3):
+            daily[day]["consumption"][i] += row["consumption"][i]
+            daily[day]["production"][i] += row["production"][i]
+
+    return daily
+
+
+def format_week_section(week_number: int, daily_data: Dict[date, Dict]) -> str:
+    lines: List[str] = []
+
+    lines.append(f"Week {week_number} electricity consumption and production (kWh, by phase)")
+    lines.append("")
+    lines.append("Day        Date         Consumption [kWh]            Production [kWh]")
+    lines.append("                         v1      v2      v3           v1     v2     v3")
+    lines.append("-" * 75)
+
+    for day in sorted(daily_data.keys()):
+        weekday = FINNISH_WEEKDAYS[day.weekday()]
+        date_str = day.strftime("%d.%m.%Y")
+
+        cons_str = [f"{v / 1000.0:.2f}".replace(".", ",") for v in daily_data[day]["consumption"]]
+        prod_str = [f"{v / 1000.0:.2f}".replace(".", ",") for v in daily_data[day]["production"]]
+
+        lines.append(
+            f"{weekday:<10} {date_str:<12} "
+            f"{cons_str[0]:>6}  {cons_str[1]:>6}  {cons_str[2]:>6}      "
+            f"{prod_str[0]:>5}  {prod_str[1]:>5}  {prod_str[2]:>5}"
+        )
+
+    lines.append("\n")
+    return "\n".join(lines)
+
+
+def taske_report(filenames: Sequence[str]) -> str:
+    """
+    The summary TaskE wrote, with the sections in chronological order and
+    the week number taken from the file name.
+    """
+    sections = []
+    for filename in filenames:
+        daily_totals = week_daily_totals(read_week(filename))
+        week_number = int(re.search(r"week(\d+)", filename).group(1))
+        sections.append((min(daily_totals), week_number, daily_totals))
+    sections.sort(key=lambda section: section[:2])
+    return "\n".join(
+        format_week_section(week_number, daily_totals)
+        for _, week_number, daily_totals in sections
+    )
+
+
+# Energy files (TaskF)
+
+def read_energy(filename: str) -> List[Dict]:
+    data: List[Dict] = []
+
+    with open(filename, "r", encoding="utf-8") as file:
+        next(file)  # skip header
+
+        for line in file:
+            parts = line.strip().split(";")
+
+            dt = datetime.fromisoformat(parts[0])
+            data.append(
+                {
+                    "datetime": dt,
+                    "date": dt.date(),
+                    "consumption": float(parts[1].replace(",", ".")),
+                    "production": float(parts[2].replace(",", ".")),
+                    "temperature": float(parts[3].replace(",", ".")),
+                }
+            )
+
+    return data
+
+
+Totals = Tuple[float, float, float]
+
+
+def _by_day(data: List[Dict]) -> Dict[date, List[Dict]]:
+    days: Dict[date, List[Dict]] = {}
+    for row in data:
+        days.setdefault(row["date"], []).append(row)
+    return days
+
+
+def range_totals(data: List[Dict], start_date: date, end_date: date) -> Totals:
+    total_consumption = 0.0
+    total_production = 0.0
+    temperatures: List[float] = []
+
+    for row in data:
+        if start_date <= row["date"] <= end_date:
+            total_consumption += row["consumption"]
+            total_production += row["production"]
+            temperatures.append(row["temperature"])
+
+    avg_temp = sum(temperatures) / len(temperatures) if temperatures else 0.0
+    return total_consumption, total_production, avg_temp
+
+
+def many_range_totals(
+    data: List[Dict], ranges: Iterable[Tuple[date, date]]
+) -> List[Totals]:
+    """
+    range_totals for every range, over the rows of the days in the range
+    only, so that checking thousands of queries stays affordable.
+    """
+    days = _by_day(data)
+    results = []
+    for start_date, end_date in ranges:
+        rows = [
+            row for day in sorted(days) if start_date <= day <= end_date
+            for row in days[day]
+        ]
+        results.append(range_totals(rows, start_date, end_date))
+    return results
+
+
+def month_totals(data: List[Dict], month: int, year: Optional[int] = None) -> Totals:
+    total_consumption = 0.0
+    total_production = 0.0
+    daily_temps: Dict[date, float] = {}
+
+    for row in data:
+        if row["date"].month == month and (year is None or row["date"].year == year):
+            total_consumption += row["consumption"]
+            total_production += row["production"]
+            daily_temps[row["date"]] = row["temperature"]
+
+    avg_temp = sum(daily_temps.values()) / len(daily_temps) if daily_temps else 0.0
+    return total_consumption, total_production, avg_temp
+
+
+def year_totals(data: List[Dict]) -> Totals:
+    total_consumption = sum(row["consumption"] for row in data)
+    total_production = sum(row["production"] for row in data)
+    temperatures = [row["temperature"] for row in data]
+    avg_temp = sum(temperatures) / len(temperatures) if temperatures else 0.0
+    return total_consumption, total_production, avg_temp
+
+
+def same_totals(actual: Sequence[float], expected: Sequence[float]) -> bool:
+    """
+    Compares totals computed in exact integer units with the float sums
+    above, which differ only by rounding.
+    """
+    return len(actual) == len(expected) and all(
+        math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-6) for a, b in zip(actual, expected)
+    )
@@ -0,0 +1,143 @@
+"""
+Double-booking detection with TaskG/booking_conflicts.py. The conflicts
+and the is_free answers are checked against a plain pairwise scan.
+
+Usage: python benchmarks/bench_booking_conflicts.py [bookings] [resources]
+"""
+
+import random
+import sys
+import time
+from datetime import date, datetime, time as clock_time, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "TaskG"))
+
+from booking_conflicts import (  # noqa: E402
+    BookingIndex,
+    booking_interval,
+    find_conflicts,
+)
+from task_g_class import Reservation  # noqa: E402
+
+
+def random_bookings(count: int, resources: int, seed: int = 42) -> list:
+    rng = random.Random(seed)
+    first_day = date(2025, 1, 1)
+    created = datetime(2024, 12, 1)
+    return [
+        Reservation(
+            reservation_id=i,
+            name="Booker",
+            email="booker@example.com",
+            phone="0400000000",
+            reservation_date=first_day + timedelta(days=rng.randrange(365)),
+            reservation_time=clock_time(rng.randrange(7, 20), rng.choice((0, 30))),
+            duration_hours=rng.randint(1, 4),
+            price=20.0,
+            confirmed=True,
+            reserved_resource=f"Room {rng.randrange(resources)}",
+            created_at=created,
+        )
+        for i in range(count)
+    ]
+
+
+def day_buckets(bookings: list) -> dict:
+    """
+    Files every booking under its resource and each day it touches, so
+    that the pairwise scans below only compare bookings of the same day.
+    """
+    buckets: dict = {}
+    for booking in bookings:
+        start, end = booking_interval(booking)
+        for day in range(start // 1440, (end - 1) // 1440 + 1):
+            buckets.setdefault((booking.reserved_resource, day), []).append(
+                (start, end, booking.reservation_id)
+            )
+    return buckets
+
+
+def naive_conflicts(buckets: dict) -> set:
+    pairs = set()
+    for intervals in buckets.values():
+        for i, (start, end, first) in enumerate(intervals):
+            for other_start, other_end, second in intervals[i + 1:]:
+                if start < other_end and other_start < end:
+                    pairs.add((min(first, second), max(first, second)))
+    return pairs
+
+
+def naive_is_free(buckets: dict, resource, day, start_time, duration_hours) -> bool:
+    start = day.toordinal() * 1440 + start_time.hour * 60 + start_time.minute
+    end = start + duration_hours * 60
+    return not any(
+        other_start < end and start < other_end
+        for bucket in range(start // 1440, (end - 1) // 1440 + 1)
+        for other_start, other_end, _ in buckets.get((resource, bucket), ())
+    )
+
+
+def timed(label: str, function):
+    start = time.perf_counter()
+    result = function()
+    print(f"{label:<28} {time.perf_counter() - start:8.2f} s")
+    return result
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    resources = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000
+    queries = 100_000
+
+    bookings = random_bookings(count, resources)
+    print(f"{count} bookings over {resources} resources")
+
+    conflicts = timed("find_conflicts (sweep)", lambda: find_conflicts(bookings))
+    print(f"{'':<28} {len(conflicts)} overlapping pairs")
+
+    buckets = day_buckets(bookings)
+    pairs = {
+        (min(a.reservation_id, b.reservation_id), max(a.reservation_id, b.reservation_id))
+        for a, b in conflicts
+    }
+    assert len(pairs) == len(conflicts) and pairs == naive_conflicts(buckets), (
+        "find_conflicts differs from the pairwise scan"
+    )
+
+    index = timed("build BookingIndex", lambda: BookingIndex(bookings))
+
+    rng = random.Random(7)
+    probes = [
+        (
+            f"Room {rng.randrange(resources)}",
+            date(2025, 1, 1) + timedelta(days=rng.randrange(365)),
+            clock_time(rng.randrange(7, 20)),
+            rng.randint(1, 4),
+        )
+        for _ in range(queries)
+    ]
+    free = timed(
+        f"{queries} is_free queries",
+        lambda: sum(index.is_free(*probe) for probe in probes),
+    )
+    print(f"{'':<28} {free} free slots")
+    answers = [index.is_free(*probe) for probe in probes]
+    assert answers == [naive_is_free(buckets, *probe) for probe in probes], (
+        "is_free differs from the pairwise scan"
+    )
+
+    cancelled = bookings[:queries]
+    timed(
+        f"{len(cancelled)} cancellations",
+        lambda: [index.cancel(r.reservation_id) for r in cancelled],
+    )
+    timed(f"{len(cancelled)} inserts", lambda: [index.add(r) for r in cancelled])
+    assert [index.is_free(*probe) for probe in probes] == answers, (
+        "is_free changed after cancelling and adding the same bookings again"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""
+Peak memory of loading an hourly CSV whole vs in chunks.
+
+Every load runs in a fresh process and reports its peak RSS, so the
+numbers do not include earlier runs:
+
+  taskd_read_data     week_data.calculate_daily_totals(read_data(...))
+  taskd_chunked       week_data.load_daily_totals(..., chunk_rows)
+  taskf_read_columns  EnergyIndex(read_columns(...))
+  taskf_chunked       task_f.load_index(..., chunk_rows)
+
+With chunking, the RSS stays flat apart from the per-day aggregates
+(a few hundred bytes per day, i.e. per 24 rows). Each load also prints a
+summary of its result, which is checked against the original code in
+baselines.py unless --no-check is given.
+
+Usage: python benchmarks/bench_chunked_memory.py [--sizes 100000 1000000 ...]
+                                                 [--chunk-rows N]
+                                                 [--modes NAME ...]
+                                                 [--data-dir DIR] [--no-check]
+(sizes up to 100000000 work, but generating the files takes a while;
+generated files are reused from --data-dir when given)
+"""
+
+import argparse
+import contextlib
+import functools
+import hashlib
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+import baselines  # noqa: E402
+from generators import generate_energy_csv, generate_week_csv  # noqa: E402
+
+MODES = ["taskd_read_data", "taskd_chunked", "taskf_read_columns", "taskf_chunked"]
+
+
+def daily_digest(daily_totals: dict) -> str:
+    """
+    Hashes daily totals, so that a subprocess can report them in one line
+    whatever the number of days.
+    """
+    digest = hashlib.sha256()
+    for day in sorted(daily_totals):
+        values = daily_totals[day]
+        digest.update(
+            f"{day} {[int(v) for v in values['consumption']]} "
+            f"{[int(v) for v in values['production']]}\n".encode()
+        )
+    return digest.hexdigest()
+
+
+def index_summary(index) -> list:
+    return [index.year_totals()] + [index.month_totals(month) for month in range(1, 13)]
+
+
+@functools.lru_cache(maxsize=None)
+def expected_result(mode: str, filename: str):
+    if mode.startswith("taskd"):
+        return daily_digest(baselines.week_daily_totals(baselines.read_week(filename)))
+    data = baselines.read_energy(filename)
+    return [baselines.year_totals(data)] + [
+        baselines.month_totals(data, month) for month in range(1, 13)
+    ]
+
+
+def check(mode: str, filename: str, result) -> None:
+    expected = expected_result(mode, filename)
+    if mode.startswith("taskd"):
+        same = result == expected
+    else:
+        same = len(result) == len(expected) and all(
+            baselines.same_totals(*pair) for pair in zip(result, expected)
+        )
+    assert same, f"{mode} on {filename} differs from the original code"
+
+
+def measure(mode: str, filename: str, chunk_rows: int) -> None:
+    """
+    Loads filename with mode and prints seconds and peak RSS in bytes, then
+    a summary of the result as JSON on a second line.
+    """
+    sys.path.insert(0, str(ROOT))
+
+    if mode.startswith("taskd"):
+        from common import week_data
+
+        loads = {
+            "taskd_read_data": lambda: week_data.calculate_daily_totals(
+                week_data.read_data(filename)
+            ),
+            "taskd_chunked": lambda: week_data.load_daily_totals(filename, chunk_rows),
+        }
+    else:
+        sys.path.insert(0, str(ROOT / "TaskF"))
+        import task_f
+        from energy_columns import read_columns
+        from energy_index import EnergyIndex
+
+        loads = {
+            "taskf_read_columns": lambda: EnergyIndex(read_columns(filename)),
+            "taskf_chunked": lambda: task_f.load_index(filename, chunk_rows),
+        }
+
+    start = time.perf_counter()
+    result = loads[mode]()
+    elapsed = time.perf_counter() - start
+
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform != "darwin":
+        peak *= 1024
+    print(f"{elapsed} {peak}")
+    summary = (
+        daily_digest(result) if mode.startswith("taskd") else index_summary(result)
+    )
+    print(json.dumps(summary))
+
+
+def data_file(directory: str, mode: str, rows: int) -> str:
+    os.makedirs(directory, exist_ok=True)
+    if mode.startswith("taskd"):
+        filename = os.path.join(directory, f"week-{rows}.csv")
+        generator = generate_week_csv
+    else:
+        filename = os.path.join(directory, f"energy-{rows}.csv")
+        generator = generate_energy_csv
+
+    if not os.path.exists(filename):
+        generator(filename, rows)
+    return filename
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--chunk-rows", type=int, default=50_000)
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=MODES)
+    parser.add_argument("--data-dir", help="keep generated files here and reuse them")
+    parser.add_argument("--no-check", dest="check", action="store_false",
+                        help="skip checking the results against baselines.py, "
+                             "which loads the whole file in this process")
+    parser.add_argument("--measure", nargs=2, metavar=("MODE", "FILE"),
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        measure(args.measure[0], args.measure[1], args.chunk_rows)
+        return
+
+    print(f"chunk rows: {args.chunk_rows}")
+    print(f"{'mode':<20} {'rows':>11} {'seconds':>9} {'peak MB':>9}")
+
+    with contextlib.ExitStack() as stack:
+        directory = args.data_dir or stack.enter_context(tempfile.TemporaryDirectory())
+
+        for rows in args.sizes:
+            for mode in args.modes:
+                filename = data_file(directory, mode, rows)
+                result = subprocess.run(
+                    [
+                        sys.executable, __file__,
+                        "--measure", mode, filename,
+                        "--chunk-rows", str(args.chunk_rows),
+                    ],
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                )
+                timing, summary = result.stdout.splitlines()
+                seconds, peak = timing.split()
+                if args.check:
+                    check(mode, filename, json.loads(summary))
+                print(
+                    f"{mode:<20} {rows:>11} {float(seconds):>9.2f} "
+                    f"{int(peak) / 2 ** 20:>9.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
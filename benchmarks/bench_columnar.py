@@ -0,0 +1,195 @@
+"""
+Disk size and load time of the CSV files vs their columnar exports.
+
+For each size a week CSV (TaskD) and an energy CSV (TaskF) are generated,
+exported with export_columnar and loaded both ways:
+
+  taskd_load_daily_totals   week_data.load_daily_totals(...)
+  taskf_read_columns        read_columns(...)
+  taskf_consumption_only    read_columns(..., ["consumption"]) (columnar only)
+  taskf_load_index          task_f.load_index(...)
+
+Both loads of every case must return the same result as the original code
+in baselines.py before they are timed.
+
+Usage: python benchmarks/bench_columnar.py [--sizes 100000 1000000 ...]
+                                           [--repeat N] [--data-dir DIR]
+(generated files and their exports are reused from --data-dir when given)
+"""
+
+import argparse
+import contextlib
+import math
+import os
+import sys
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import Callable, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "TaskF"))
+sys.path.insert(0, str(ROOT))
+
+import baselines  # noqa: E402
+import task_f  # noqa: E402
+from common import week_data  # noqa: E402
+from energy_columns import export_columnar, read_columns  # noqa: E402
+from generators import generate_energy_csv, generate_week_csv  # noqa: E402
+
+
+def best_time(function: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def prepare(directory: str, name: str, rows: int, generate, export) -> tuple:
+    filename = os.path.join(directory, f"{name}-{rows}.csv")
+    columnar = os.path.join(directory, f"{name}-{rows}.ecol")
+    if not os.path.exists(filename):
+        generate(filename, rows)
+    if not os.path.exists(columnar):
+        export(filename, columnar)
+    return filename, columnar
+
+
+COLUMNS = ("hours", "offsets", "consumption", "production", "temperature")
+
+
+def comparable(label: str, result) -> object:
+    """
+    Turns what each case loads into plain lists that compare with ==.
+    """
+    if label == "taskd_load_daily_totals":
+        return {
+            day: {name: list(values[name]) for name in ("consumption", "production")}
+            for day, values in result.items()
+        }
+    if label == "taskf_load_index":
+        return [result.year_totals()] + [
+            result.month_totals(month) for month in range(1, 13)
+        ]
+    return {name: list(getattr(result, name)) for name in COLUMNS}
+
+
+def expected_result(label: str, filename: str) -> object:
+    if label == "taskd_load_daily_totals":
+        return baselines.week_daily_totals(baselines.read_week(filename))
+    data = baselines.read_energy(filename)
+    if label == "taskf_load_index":
+        return [baselines.year_totals(data)] + [
+            baselines.month_totals(data, month) for month in range(1, 13)
+        ]
+    return {
+        "hours": [math.floor(r["datetime"].timestamp() / 3600) for r in data],
+        "offsets": [r["datetime"].utcoffset() // timedelta(minutes=1) for r in data],
+        "consumption": [round(r["consumption"] * 1000) for r in data],
+        "production": [round(r["production"] * 1000) for r in data],
+        "temperature": [round(r["temperature"] * 10) for r in data],
+    }
+
+
+def check(label: str, filename: str, csv_result, columnar_result) -> None:
+    csv_result = comparable(label, csv_result)
+    assert comparable(label, columnar_result) == csv_result, (
+        f"{label}: the columnar export loads differently from the CSV"
+    )
+    expected = expected_result(label, filename)
+    if label == "taskf_load_index":
+        assert all(
+            baselines.same_totals(*pair) for pair in zip(csv_result, expected)
+        ), f"{label}: totals differ from the original code"
+    else:
+        assert csv_result == expected, f"{label}: differs from the original code"
+
+
+def row(
+    label: str,
+    rows: int,
+    csv_size: int,
+    columnar_size: int,
+    csv_seconds: Optional[float],
+    columnar_seconds: float,
+) -> None:
+    csv_text = f"{csv_seconds:>9.3f}" if csv_seconds is not None else f"{'-':>9}"
+    speedup = (
+        f"{csv_seconds / columnar_seconds:>7.1f}x"
+        if csv_seconds is not None else f"{'-':>8}"
+    )
+    print(
+        f"{label:<26} {rows:>10} {csv_size / 2 ** 20:>8.2f} "
+        f"{columnar_size / 2 ** 20:>8.2f} {csv_size / columnar_size:>6.1f}x "
+        f"{csv_text} {columnar_seconds:>9.3f} {speedup}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--data-dir", help="keep generated files here and reuse them")
+    args = parser.parse_args()
+
+    print(
+        f"{'case':<26} {'rows':>10} {'csv MB':>8} {'col MB':>8} {'size':>7} "
+        f"{'csv s':>9} {'col s':>9} {'speedup':>8}"
+    )
+
+    with contextlib.ExitStack() as stack:
+        directory = args.data_dir or stack.enter_context(tempfile.TemporaryDirectory())
+        os.makedirs(directory, exist_ok=True)
+
+        for rows in args.sizes:
+            week, week_columnar = prepare(
+                directory, "week", rows, generate_week_csv, week_data.export_columnar
+            )
+            energy, energy_columnar = prepare(
+                directory, "energy", rows, generate_energy_csv, export_columnar
+            )
+            week_sizes = os.path.getsize(week), os.path.getsize(week_columnar)
+            energy_sizes = os.path.getsize(energy), os.path.getsize(energy_columnar)
+
+            for label, source, columnar, sizes, load in [
+                ("taskd_load_daily_totals", week, week_columnar, week_sizes,
+                 week_data.load_daily_totals),
+                ("taskf_read_columns", energy, energy_columnar, energy_sizes,
+                 read_columns),
+                ("taskf_load_index", energy, energy_columnar, energy_sizes,
+                 task_f.load_index),
+            ]:
+                check(label, source, load(source), load(columnar))
+                row(
+                    label,
+                    rows,
+                    *sizes,
+                    best_time(lambda: load(source), args.repeat),
+                    best_time(lambda: load(columnar), args.repeat),
+                )
+
+            consumption = read_columns(energy_columnar, ["consumption"])
+            assert list(consumption.consumption) == list(
+                read_columns(energy).consumption
+            ), "taskf_consumption_only: consumption differs from the CSV"
+            assert not any(
+                len(getattr(consumption, name))
+                for name in ("production", "temperature")
+            ), "read_columns read measurements it was not asked for"
+            row(
+                "taskf_consumption_only",
+                rows,
+                *energy_sizes,
+                None,
+                best_time(
+                    lambda: read_columns(energy_columnar, ["consumption"]),
+                    args.repeat,
+                ),
+            )
+
+
+if __name__ == "__main__":
+    main()
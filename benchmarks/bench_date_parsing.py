@@ -0,0 +1,68 @@
+"""
+Per-row cost of the reservation date fields: strptime vs common.fast_dates.
+Both must parse every generated row to the same values.
+
+Usage: python benchmarks/bench_date_parsing.py [rows]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from common.fast_dates import parse_date, parse_datetime, parse_time  # noqa: E402
+from generators import generate_reservations  # noqa: E402
+
+
+def parse_with_strptime(fields: list[str]) -> tuple:
+    return (
+        datetime.strptime(fields[4], "%Y-%m-%d").date(),
+        datetime.strptime(fields[5], "%H:%M").time(),
+        datetime.strptime(fields[10], "%Y-%m-%d %H:%M:%S"),
+    )
+
+
+def parse_with_fast_dates(fields: list[str]) -> tuple:
+    return (
+        parse_date(fields[4]),
+        parse_time(fields[5]),
+        parse_datetime(fields[10]),
+    )
+
+
+def time_per_row(parse, rows: list[list[str]]) -> float:
+    start = time.perf_counter()
+    for fields in rows:
+        parse(fields)
+    return (time.perf_counter() - start) / len(rows)
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "reservations.txt")
+        generate_reservations(filename, count)
+        with open(filename, "r", encoding="utf-8") as f:
+            rows = [line.strip().split("|") for line in f]
+
+    assert [parse_with_strptime(r) for r in rows] == [
+        parse_with_fast_dates(r) for r in rows
+    ], "fast_dates parses some rows differently from strptime"
+
+    slow = time_per_row(parse_with_strptime, rows)
+    fast = time_per_row(parse_with_fast_dates, rows)
+
+    print(f"{count} rows")
+    print(f"strptime:   {slow * 1e6:.2f} µs/row")
+    print(f"fast_dates: {fast * 1e6:.2f} µs/row")
+    print(f"speedup:    {slow / fast:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
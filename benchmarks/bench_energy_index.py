@@ -0,0 +1,84 @@
+"""
+Random date-range queries on TaskF/2025.csv: EnergyIndex vs the linear scan.
+
+Usage: python benchmarks/bench_energy_index.py [queries] [scan_queries]
+
+The linear scan is timed on scan_queries queries (default 1000) and its cost
+for the full query count is extrapolated from the per-query time. On those
+queries the index, the scan and the original range_totals in baselines.py
+must all give the same totals.
+"""
+
+import random
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "TaskF"))
+sys.path.insert(0, str(ROOT))
+
+import baselines  # noqa: E402
+import task_f  # noqa: E402
+from energy_columns import read_columns  # noqa: E402
+from energy_index import EnergyIndex  # noqa: E402
+
+
+def random_ranges(count: int, seed: int = 42) -> list:
+    rng = random.Random(seed)
+    first = date(2025, 1, 1)
+    ranges = []
+    for _ in range(count):
+        start = first + timedelta(days=rng.randrange(365))
+        ranges.append((start, start + timedelta(days=rng.randrange(60))))
+    return ranges
+
+
+def time_queries(data, ranges) -> tuple:
+    start = time.perf_counter()
+    results = [
+        task_f.range_totals(data, start_date, end_date)
+        for start_date, end_date in ranges
+    ]
+    return results, time.perf_counter() - start
+
+
+def main() -> None:
+    queries = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    scan_queries = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    filename = str(ROOT / "TaskF" / "2025.csv")
+
+    rows = task_f.read_data(filename)
+
+    start = time.perf_counter()
+    index = EnergyIndex(read_columns(filename))
+    build = time.perf_counter() - start
+
+    ranges = random_ranges(queries)
+    index_results, indexed = time_queries(index, ranges)
+    scan_results, scanned = time_queries(rows, ranges[:scan_queries])
+    scanned /= min(scan_queries, queries)
+
+    expected = baselines.many_range_totals(
+        baselines.read_energy(filename), ranges[:scan_queries]
+    )
+    for (start_date, end_date), indexed_totals, scanned_totals, original in zip(
+        ranges, index_results, scan_results, expected
+    ):
+        assert indexed_totals == scanned_totals and baselines.same_totals(
+            indexed_totals, original
+        ), f"{start_date}..{end_date}: index, scan and original totals differ"
+
+    print(f"{len(rows)} hourly rows, {queries} range queries")
+    print(f"index build:  {build * 1000:.1f} ms")
+    print(f"index:        {indexed:.3f} s ({indexed / queries * 1e6:.2f} µs/query)")
+    print(
+        f"linear scan:  {scanned * queries:.1f} s "
+        f"({scanned * 1e6:.0f} µs/query, timed on {scan_queries} queries)"
+    )
+    print(f"speedup:      {scanned * queries / indexed:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
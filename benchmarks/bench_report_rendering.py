@@ -0,0 +1,106 @@
+"""
+Report rendering: one print() per line with strftime on every row vs the
+batched ReportWriter with cached date and time strings.
+
+Every run renders the confirmed, long and status reports of the given
+number of reservations to os.devnull, so the status report alone is one
+line per reservation. Before timing, both renderers write the reports
+to memory once and the texts must be identical.
+
+Usage: python benchmarks/bench_report_rendering.py [rows ...]
+(default: 1000000)
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "TaskG"))
+
+import task_g_class  # noqa: E402
+from generators import generate_reservations  # noqa: E402
+from report_writer import ReportWriter  # noqa: E402
+
+
+def print_reports(reservations: list) -> None:
+    """
+    The report functions before ReportWriter.
+    """
+    for reservation in reservations:
+        if reservation.is_confirmed():
+            print(
+                f'- {reservation.name}, '
+                f'{reservation.reserved_resource}, '
+                f'{reservation.reservation_date.strftime("%d.%m.%Y")} '
+                f'at {reservation.reservation_time.strftime("%H.%M")}'
+            )
+    for reservation in reservations:
+        if reservation.is_long():
+            print(
+                f'- {reservation.name}, '
+                f'{reservation.reservation_date.strftime("%d.%m.%Y")} '
+                f'at {reservation.reservation_time.strftime("%H.%M")}, '
+                f'duration {reservation.duration_hours} h, '
+                f'{reservation.reserved_resource}'
+            )
+    for reservation in reservations:
+        print(
+            f'{reservation.name} → '
+            f'{"Confirmed" if reservation.is_confirmed() else "NOT Confirmed"}'
+        )
+
+
+def writer_reports(reservations: list) -> None:
+    with ReportWriter() as out:
+        task_g_class.confirmed_reservations(reservations, out)
+        task_g_class.long_reservations(reservations, out)
+        task_g_class.confirmation_statuses(reservations, out)
+
+
+def render(report, reservations: list) -> float:
+    with open(os.devnull, "w", encoding="utf-8") as sink, \
+            contextlib.redirect_stdout(sink):
+        start = time.perf_counter()
+        report(reservations)
+        return time.perf_counter() - start
+
+
+def rendered(report, reservations: list) -> str:
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        report(reservations)
+    return output.getvalue()
+
+
+def main() -> None:
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1_000_000]
+
+    print(f"{'rows':>9} {'renderer':<14} {'seconds':>8} {'lines/s':>12}")
+    for rows in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, "reservations.txt")
+            generate_reservations(filename, rows)
+            reservations = task_g_class.fetch_reservations(filename)
+
+        assert rendered(writer_reports, reservations) == rendered(
+            print_reports, reservations
+        ), "ReportWriter renders the reports differently from print()"
+
+        lines = rows + sum(
+            r.is_confirmed() + r.is_long() for r in reservations
+        )
+        for name, report in (
+            ("print", print_reports),
+            ("ReportWriter", writer_reports),
+        ):
+            elapsed = render(report, reservations)
+            print(f"{rows:>9} {name:<14} {elapsed:>8.2f} {lines / elapsed:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Memory per object and load time: slotted lazy Reservation vs the original
+__dict__-based class, measured with tracemalloc. Both classes must hold
+the same field values for every row.
+
+Usage: python benchmarks/bench_reservation_slots.py [rows ...]
+(default: 100000 1000000)
+"""
+
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "TaskG"))
+
+import task_g_class  # noqa: E402
+from generators import generate_reservations  # noqa: E402
+
+
+class DictReservation:
+    """
+    The Reservation class before __slots__ and lazy decoding.
+    """
+
+    def __init__(self, reservation_id, name, email, phone, reservation_date,
+                 reservation_time, duration_hours, price, confirmed,
+                 reserved_resource, created_at):
+        self.reservation_id = reservation_id
+        self.name = name
+        self.email = email
+        self.phone = phone
+        self.reservation_date = reservation_date
+        self.reservation_time = reservation_time
+        self.duration_hours = duration_hours
+        self.price = price
+        self.confirmed = confirmed
+        self.reserved_resource = reserved_resource
+        self.created_at = created_at
+
+
+def load_dict_reservations(filename: str) -> list:
+    reservations = []
+    with open(filename, "r", encoding="utf-8") as f:
+        for line in f:
+            if len(line.strip()) > 0:
+                r = line.split("|")
+                reservations.append(DictReservation(
+                    int(r[0]), r[1], r[2], r[3],
+                    datetime.strptime(r[4], "%Y-%m-%d").date(),
+                    datetime.strptime(r[5], "%H:%M").time(),
+                    int(r[6]), float(r[7]), r[8].strip() == "True", r[9],
+                    datetime.strptime(r[10].strip(), "%Y-%m-%d %H:%M:%S"),
+                ))
+    return reservations
+
+
+FIELDS = (
+    "reservation_id", "name", "email", "phone", "reservation_date",
+    "reservation_time", "duration_hours", "price", "confirmed",
+    "reserved_resource", "created_at",
+)
+
+
+def fields(reservations: list) -> list:
+    return [[getattr(r, name) for name in FIELDS] for r in reservations]
+
+
+def measure(load, filename: str, rows: int) -> tuple:
+    gc.collect()
+    start = time.perf_counter()
+    reservations = load(filename)
+    elapsed = time.perf_counter() - start
+    del reservations
+
+    gc.collect()
+    tracemalloc.start()
+    reservations = load(filename)
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del reservations
+
+    return memory / rows, elapsed
+
+
+def main() -> None:
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100_000, 1_000_000]
+
+    print(f"{'rows':>9} {'class':<14} {'bytes/row':>12} {'load s':>8}")
+    for rows in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, "reservations.txt")
+            generate_reservations(filename, rows)
+            assert fields(task_g_class.fetch_reservations(filename)) == fields(
+                load_dict_reservations(filename)
+            ), "the slotted Reservation holds other values than the original"
+
+            for name, load in (
+                ("__dict__", load_dict_reservations),
+                ("slots + lazy", task_g_class.fetch_reservations),
+            ):
+                per_object, elapsed = measure(load, filename, rows)
+                print(f"{rows:>9} {name:<14} {per_object:>12.0f} {elapsed:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
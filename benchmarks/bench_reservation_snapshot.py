@@ -0,0 +1,78 @@
+"""
+Text parse vs binary snapshot reload for TaskG reservations. Both loads
+must return the rows of the original parser in baselines.py.
+
+Usage: python benchmarks/bench_reservation_snapshot.py [rows]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "TaskG"))
+
+import baselines  # noqa: E402
+import reservation_snapshot  # noqa: E402
+import task_g_class  # noqa: E402
+from generators import generate_reservations  # noqa: E402
+
+
+def fields(reservation) -> tuple:
+    return (
+        reservation.reservation_id, reservation.name, reservation.email,
+        reservation.phone, reservation.reservation_date,
+        reservation.reservation_time, reservation.duration_hours,
+        reservation.price, reservation.confirmed,
+        reservation.reserved_resource, reservation.created_at,
+    )
+
+
+def timed(function, *args) -> tuple:
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "reservations.txt")
+        generate_reservations(filename, rows)
+
+        text_time, from_text = timed(task_g_class.fetch_reservations, filename)
+        build_time, _ = timed(reservation_snapshot.build_snapshot, filename)
+        snap_time, from_snapshot = timed(task_g_class.fetch_reservations, filename)
+        raw_time, _ = timed(
+            lambda: sum(1 for _ in reservation_snapshot.read_snapshot(filename + ".snap"))
+        )
+
+        expected = [tuple(row) for row in baselines.read_reservations(filename)]
+        assert list(map(fields, from_text)) == expected, (
+            "parsing the text differs from the original parser"
+        )
+        assert list(map(fields, from_snapshot)) == expected, (
+            "loading the snapshot differs from the original parser"
+        )
+
+        text_size = os.path.getsize(filename)
+        snap_size = os.path.getsize(filename + ".snap")
+
+    print(f"{rows} reservations")
+    print(f"text file:           {text_size / 1e6:.1f} MB")
+    print(f"snapshot file:       {snap_size / 1e6:.1f} MB")
+    print(f"parse text:          {text_time:.2f} s")
+    print(f"build snapshot:      {build_time:.2f} s")
+    ratio = (
+        f"{text_time / snap_time:.1f}x faster" if snap_time <= text_time
+        else f"{snap_time / text_time:.1f}x slower"
+    )
+    print(f"load snapshot:       {snap_time:.2f} s ({ratio})")
+    print(f"decode records only: {raw_time:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
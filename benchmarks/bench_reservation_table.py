@@ -0,0 +1,105 @@
+"""
+Compares the TaskG Reservation class, the dict version and ReservationTable.
+Every variant must print the same reports as the original TaskG code in
+baselines.py.
+
+Usage: python benchmarks/bench_reservation_table.py [rows]
+"""
+
+import contextlib
+import gc
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "TaskG"))
+
+import baselines  # noqa: E402
+import reservation_table  # noqa: E402
+import task_g_class  # noqa: E402
+import task_g_dict  # noqa: E402
+from generators import generate_reservations  # noqa: E402
+
+VARIANTS = [
+    ("class", task_g_class, task_g_class.fetch_reservations),
+    ("dict", task_g_dict, task_g_dict.fetch_reservations),
+    ("table", reservation_table, reservation_table.fetch_reservation_table),
+]
+
+
+def run_reports(module, reservations) -> None:
+    module.confirmed_reservations(reservations)
+    module.long_reservations(reservations)
+    module.confirmation_summary(reservations)
+    module.total_revenue(reservations)
+
+
+def expected_reports(filename: str) -> str:
+    """
+    The original report text without the section titles and without the
+    status section, which run_reports leaves out.
+    """
+    lines = []
+    section = ""
+    for line in baselines.taskg_report(baselines.read_reservations(filename)).splitlines():
+        if line[:1].isdigit() and line[1:3] == ") ":
+            section = line[0]
+        elif section != "3":
+            lines.append(line)
+    return "\n".join(lines) + "\n"
+
+
+def measure_memory(fetch, filename: str) -> int:
+    gc.collect()
+    tracemalloc.start()
+    reservations = fetch(filename)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del reservations
+    return current
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "reservations.txt")
+        generate_reservations(filename, rows)
+
+        expected = expected_reports(filename)
+        print(f"{rows} reservations")
+        print(f"{'variant':<8} {'memory MB':>10} {'load s':>8} {'reports s':>10}")
+
+        for name, module, fetch in VARIANTS:
+            memory = measure_memory(fetch, filename)
+
+            gc.collect()
+            start = time.perf_counter()
+            reservations = fetch(filename)
+            loaded = time.perf_counter()
+            with open(os.devnull, "w", encoding="utf-8") as devnull:
+                with contextlib.redirect_stdout(devnull):
+                    run_reports(module, reservations)
+            finished = time.perf_counter()
+
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                run_reports(module, reservations)
+            assert output.getvalue() == expected, (
+                f"the {name} variant prints other reports than the original"
+            )
+            del reservations
+
+            print(
+                f"{name:<8} {memory / 1e6:>10.1f} "
+                f"{loaded - start:>8.2f} {finished - loaded:>10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
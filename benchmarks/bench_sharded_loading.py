@@ -0,0 +1,79 @@
+"""
+Load time of a reservations file: task_g_class.fetch_reservations on one
+core vs sharded_loader.load_table with an increasing number of worker
+processes. Every loader's rows are checked against the original parser
+in baselines.py before they are timed.
+
+Usage: python benchmarks/bench_sharded_loading.py [rows] [workers ...]
+(default: 1000000 rows, 1 2 4 ... up to the CPU count)
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "TaskG"))
+
+import baselines  # noqa: E402
+import sharded_loader  # noqa: E402
+import task_g_class  # noqa: E402
+from generators import generate_reservations  # noqa: E402
+
+FIELDS = (
+    "reservation_id", "name", "email", "phone", "reservation_date",
+    "reservation_time", "duration_hours", "price", "confirmed",
+    "reserved_resource", "created_at",
+)
+
+
+def timed(load, *args) -> tuple:
+    start = time.perf_counter()
+    result = load(*args)
+    return result, time.perf_counter() - start
+
+
+def ratio(baseline: float, elapsed: float) -> str:
+    # Above 1 the loader beats fetch_reservations, below 1 it loses to it.
+    if elapsed <= baseline:
+        return f"{baseline / elapsed:.2f}x faster"
+    return f"{elapsed / baseline:.2f}x slower"
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    cpus = os.cpu_count() or 1
+    worker_counts = [int(arg) for arg in sys.argv[2:]] or [
+        2 ** power for power in range(cpus.bit_length()) if 2 ** power <= cpus
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "reservations.txt")
+        generate_reservations(filename, rows)
+        size_mb = os.path.getsize(filename) / 2 ** 20
+        expected = baselines.read_reservations(filename)
+
+        reservations, baseline = timed(task_g_class.fetch_reservations, filename)
+        assert [
+            [getattr(r, name) for name in FIELDS] for r in reservations
+        ] == expected, "fetch_reservations differs from the original parser"
+        del reservations
+
+        print(f"{rows} rows, {size_mb:.0f} MB, {cpus} CPUs")
+        print(f"{'loader':<24} {'seconds':>8} {'vs fetch':>14}")
+        print(f"{'fetch_reservations':<24} {baseline:>8.2f} {'-':>14}")
+
+        for workers in worker_counts:
+            table, elapsed = timed(sharded_loader.load_table, filename, workers)
+            assert [list(row) for row in table.rows()] == expected, (
+                f"load_table x{workers} differs from the original parser"
+            )
+            del table
+            name = f"load_table x{workers}"
+            print(f"{name:<24} {elapsed:>8.2f} {ratio(baseline, elapsed):>14}")
+
+
+if __name__ == "__main__":
+    main()
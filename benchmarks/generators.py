@@ -0,0 +1,145 @@
+"""
+Deterministic synthetic data for the benchmarks.
+
+Every generator takes a row count and a seed and always writes the same file
+for the same arguments, so timings from different runs are comparable.
+"""
+
+import random
+from datetime import datetime, timedelta
+
+FIRST_NAMES = [
+    "Moomin", "Snork", "Little My", "Sniff", "Hemulen", "Snufkin",
+    "Too-ticky", "Stinky", "Fillyjonk", "Groke", "Mymble", "Thingumy",
+]
+LAST_NAMES = [
+    "Valley", "Maiden", "Storm", "Moneywise", "Collector", "Wanderer",
+    "Lighthouse", "Forest", "Harbour", "Meadow", "Bob", "Lonely",
+]
+RESOURCES = [
+    "Meeting Room A", "Meeting Room B", "Forest Area 1", "Forest Area 2",
+    "Flower Room", "Red Room", "Storage Area N", "Botanical Lab",
+    "Sauna", "Boat House",
+]
+
+
+def generate_reservations(filename: str, rows: int, seed: int = 42) -> None:
+    """
+    Writes a reservations.txt file in the TaskC/TaskG pipe format.
+    """
+    rng = random.Random(seed)
+    first_day = datetime(2025, 1, 1)
+
+    with open(filename, "w", encoding="utf-8") as file:
+        for i in range(rows):
+            first = rng.choice(FIRST_NAMES)
+            last = rng.choice(LAST_NAMES)
+            day = first_day + timedelta(days=rng.randrange(365))
+            hour = rng.randrange(7, 20)
+            minute = rng.choice((0, 15, 30, 45))
+            created = day - timedelta(seconds=rng.randrange(1, 90 * 86400))
+
+            file.write(
+                f"{i + 1}|{first} {last}|"
+                f"{first.lower()}.{last.lower()}{i}@example.com|"
+                f"04{rng.randrange(10 ** 8):08d}|"
+                f"{day:%Y-%m-%d}|{hour:02d}:{minute:02d}|"
+                f"{rng.randint(1, 5)}|{rng.randrange(500, 5000) / 100:.2f}|"
+                f"{rng.random() < 0.6}|{rng.choice(RESOURCES)}|"
+                f"{created:%Y-%m-%d %H:%M:%S}\n"
+            )
+
+
+def _hourly_wh(rng: random.Random, hour: int, base: int) -> int:
+    daytime = 1.5 if 7 <= hour <= 21 else 1.0
+    return int(base * daytime * rng.uniform(0.6, 1.4))
+
+
+def generate_week_csv(
+    filename: str, rows: int, seed: int = 42, start: datetime = datetime(2025, 1, 1)
+) -> None:
+    """
+    Writes hourly rows in the TaskD/TaskE semicolon format: local time and
+    consumption / production per phase in whole Wh.
+    """
+    rng = random.Random(seed)
+
+    with open(filename, "w", encoding="utf-8") as file:
+        file.write(
+            "Time;Consumption phase 1 Wh;Consumption phase 2 Wh;"
+            "Consumption phase 3 Wh;Production phase 1 Wh;"
+            "Production phase 2 Wh;Production phase 3 Wh\n"
+        )
+        for i in range(rows):
+            moment = start + timedelta(hours=i)
+            sunny = 8 <= moment.hour <= 18 and 3 <= moment.month <= 10
+            production = [rng.randrange(0, 1500) if sunny else 0 for _ in range(3)]
+
+            file.write(
+                f"{moment:%Y-%m-%dT%H:%M:%S};"
+                f"{_hourly_wh(rng, moment.hour, 300)};"
+                f"{_hourly_wh(rng, moment.hour, 120)};"
+                f"{_hourly_wh(rng, moment.hour, 180)};"
+                f"{production[0]};{production[1]};{production[2]}\n"
+            )
+
+
+def generate_week_files(
+    directory: str, rows: int, files: int = 4, seed: int = 42
+) -> list[str]:
+    """
+    Splits rows consecutive hours over week files (week01.csv, ...) for
+    TaskE and returns their paths.
+    """
+    start = datetime(2025, 1, 1)
+    per_file = -(-rows // files)
+    filenames = []
+
+    for number in range(files):
+        count = min(per_file, rows - number * per_file)
+        if count <= 0:
+            break
+        filename = f"{directory}/week{number + 1:02d}.csv"
+        generate_week_csv(
+            filename,
+            count,
+            seed + number,
+            start + timedelta(hours=number * per_file),
+        )
+        filenames.append(filename)
+
+    return filenames
+
+
+def generate_energy_csv(filename: str, rows: int, seed: int = 42) -> None:
+    """
+    Writes hourly rows in the TaskF decimal-comma format: local time with
+    its UTC offset (+03:00 from April to October, +02:00 otherwise), net
+    consumption and production in kWh and the daily average temperature.
+    """
+    rng = random.Random(seed)
+    first = datetime(2024, 12, 31, 22)  # 2025-01-01 00:00 at +02:00
+    temperature = 0.0
+
+    with open(filename, "w", encoding="utf-8") as file:
+        file.write(
+            "Time; Consumption (net) kWh; Production (net) kWh; "
+            "Daily average temperature\n"
+        )
+        for i in range(rows):
+            utc = first + timedelta(hours=i)
+            offset = 3 if 4 <= utc.month <= 10 else 2
+            local = utc + timedelta(hours=offset)
+            if local.hour == 0 or i == 0:
+                seasonal = 12 - 14 * abs(local.month - 7) / 6
+                temperature = round(seasonal + rng.uniform(-5, 5), 1)
+
+            sunny = 8 <= local.hour <= 18 and 3 <= local.month <= 10
+            consumption = rng.uniform(0.3, 2.5)
+            production = rng.uniform(0, 3.0) if sunny else 0.0
+
+            values = f"{consumption:.3f};{production:.3f};{temperature:.1f}"
+            file.write(
+                f"{local:%Y-%m-%dT%H:%M:%S}.000+0{offset}:00;"
+                f"{values.replace('.', ',')}\n"
+            )
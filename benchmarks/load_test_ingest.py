@@ -0,0 +1,125 @@
+"""
+Load test for TaskG/ingest_server.py with local asyncio clients.
+
+Starts the server in-process on a free port unless --port is given, then
+every client sends --batches batches of --batch-size reservation lines and
+waits for the "OK" after each one. Reports batch latency and throughput;
+with the in-process server, its totals must also match what the original
+parser in baselines.py makes of the lines sent.
+
+Usage: python benchmarks/load_test_ingest.py [--clients N] [--batches N]
+       [--batch-size N] [--host HOST --port PORT]
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "TaskG"))
+
+import baselines  # noqa: E402
+from generators import generate_reservations  # noqa: E402
+from ingest_server import IngestServer  # noqa: E402
+
+
+def sample_lines(count: int) -> list[bytes]:
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "reservations.txt")
+        generate_reservations(filename, count)
+        with open(filename, "rb") as f:
+            return f.readlines()
+
+
+def expected_stats(lines: list[bytes], copies: int) -> dict:
+    reservations = [
+        baselines.convert_reservation_data(line.decode("utf-8").strip().split("|"))
+        for line in lines
+        if line.strip()
+    ]
+    confirmed = [r for r in reservations if r[8]]
+    return {
+        "reservations": len(reservations) * copies,
+        "confirmed": len(confirmed) * copies,
+        "not_confirmed": (len(reservations) - len(confirmed)) * copies,
+        "long": sum(r[6] >= 3 for r in reservations) * copies,
+        "revenue": sum(r[6] * r[7] for r in confirmed) * copies,
+        "errors": 0,
+    }
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def client(host, port, payload: bytes, batches: int, latencies: list) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    for _ in range(batches):
+        start = time.perf_counter()
+        writer.write(payload)
+        await writer.drain()
+        await reader.readline()
+        latencies.append(time.perf_counter() - start)
+    writer.close()
+    await writer.wait_closed()
+
+
+async def run(args) -> None:
+    server = None
+    port = args.port
+    if port is None:
+        server = IngestServer()
+        port = await server.start(args.host, 0)
+
+    lines = sample_lines(args.batch_size)
+    payload = b"".join(lines) + b"\n"
+    latencies: list[float] = []
+
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        client(args.host, port, payload, args.batches, latencies)
+        for _ in range(args.clients)
+    ))
+    elapsed = time.perf_counter() - start
+
+    reader, writer = await asyncio.open_connection(args.host, port)
+    writer.write(b"STATS\n")
+    stats = json.loads(await reader.readline())
+    writer.close()
+    await writer.wait_closed()
+
+    if server is not None:
+        await server.stop()
+        expected = expected_stats(lines, args.clients * args.batches)
+        # The server rounds its float revenue to cents.
+        assert stats.keys() == expected.keys() and all(
+            math.isclose(stats[key], expected[key], abs_tol=0.01) for key in stats
+        ), f"server totals {stats} differ from the original parser's {expected}"
+
+    total = args.clients * args.batches * args.batch_size
+    print(f"{args.clients} clients x {args.batches} batches x {args.batch_size} lines")
+    print(f"batch latency p50: {percentile(latencies, 0.50) * 1000:.1f} ms")
+    print(f"batch latency p99: {percentile(latencies, 0.99) * 1000:.1f} ms")
+    print(f"throughput:        {total / elapsed:,.0f} reservations/s")
+    print(f"server stats:      {stats}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--batches", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=None)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
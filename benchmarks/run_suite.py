@@ -0,0 +1,691 @@
+"""
+Benchmark suite over every reader and report path.
+
+run:      generates reservation, week and energy files of each size with the
+          deterministic generators, checks the result of every case against
+          the original implementation in baselines.py, times the case and
+          writes the results to a JSON file
+compare:  compares two result files and flags cases that got slower by more
+          than the threshold; exits with status 1 when there are any
+
+Usage:
+  python benchmarks/run_suite.py run [--sizes 1000 10000 ...] [--repeat N]
+                                     [--cases NAME ...] [--data-dir DIR]
+                                     [--no-check] [-o results.json]
+  python benchmarks/run_suite.py compare OLD.json NEW.json [--threshold 0.1]
+                                         [--min-seconds 0.001]
+
+Default sizes are 10^3 to 10^5 rows; pass --sizes up to 10000000 for the
+large runs, with --no-check to skip the checks, which parse every file with
+the original, slow code. Generated files are reused from --data-dir when
+given.
+"""
+
+import argparse
+import contextlib
+import functools
+import glob
+import io
+import json
+import math
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+
+ROOT = Path(__file__).resolve().parent.parent
+for task in ("TaskC", "TaskD", "TaskE", "TaskF", "TaskG"):
+    sys.path.insert(0, str(ROOT / task))
+sys.path.insert(0, str(ROOT))
+
+import baselines  # noqa: E402
+import reservation_table  # noqa: E402
+import task_c  # noqa: E402
+import task_e  # noqa: E402
+import task_f  # noqa: E402
+import task_g_class  # noqa: E402
+import task_g_dict  # noqa: E402
+from common import week_data  # noqa: E402
+from common.rollup import day_date  # noqa: E402
+from energy_columns import (  # noqa: E402
+    MEASUREMENTS,
+    export_columnar,
+    parse_lines,
+    read_columns,
+)
+from energy_index import EnergyIndex  # noqa: E402
+from energy_store import EnergyStore  # noqa: E402
+from report_cache import CachedData, ReportCache  # noqa: E402
+from generators import (  # noqa: E402
+    generate_energy_csv,
+    generate_reservations,
+    generate_week_csv,
+    generate_week_files,
+)
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+RANGE_QUERIES = 1000
+
+
+class Case(NamedTuple):
+    name: str
+    data: str  # "reservations", "week", "weeks" or "energy"
+    # Gets the data path, returns the function to time.
+    prepare: Callable[[str], Callable[[], object]]
+    # Gets the data path, the result of one run and what it printed, and
+    # asserts that they match the original implementation.
+    check: Callable[[str, object, str], None]
+
+
+def in_directory(directory: str, function: Callable[[], object]) -> Callable[[], object]:
+    def run():
+        with contextlib.chdir(directory):
+            return function()
+    return run
+
+
+def query_ranges(days: Sequence[date]) -> List[tuple]:
+    rng = random.Random(42)
+    ranges = []
+    for _ in range(RANGE_QUERIES):
+        start = rng.choice(days)
+        ranges.append((start, start + timedelta(days=rng.randrange(60))))
+    return ranges
+
+
+def taskf_queries(path: str, totals: Callable) -> Callable[[], object]:
+    index = EnergyIndex(read_columns(path))
+    ranges = query_ranges([day_date(day) for day in index.days])
+    return lambda: totals(index, ranges)
+
+
+def taskf_store_months(path: str, cached: bool = False) -> Callable[[], object]:
+    root = os.path.join(os.path.dirname(path), "store")
+    store = EnergyStore(root)
+    if not store.sites():
+        store.import_csv("site", path)
+    months = store.months("site")
+    # Every run after the first is answered from the in-memory cache.
+    data = CachedData(store, ReportCache(), root) if cached else store
+    return lambda: [
+        task_f.month_totals(data, month, year, "site") for year, month in months
+    ]
+
+
+def columnar_copy(path: str, export: Callable[[str, str], int]) -> str:
+    # Exported once next to the generated CSV; the export is not timed.
+    columnar = os.path.splitext(path)[0] + ".ecol"
+    if not os.path.exists(columnar):
+        export(path, columnar)
+    return columnar
+
+
+def taskd_columnar_totals(path: str) -> Callable[[], object]:
+    columnar = columnar_copy(path, week_data.export_columnar)
+    return lambda: week_data.load_daily_totals(columnar)
+
+
+def taskf_columnar(
+    path: str, measurements: Sequence[str] = MEASUREMENTS
+) -> Callable[[], object]:
+    columnar = columnar_copy(path, export_columnar)
+    return lambda: read_columns(columnar, measurements)
+
+
+def taskf_follow_refresh(path: str) -> Callable[[], object]:
+    # One refresh of follow mode: a day of new rows on top of the whole file.
+    index = EnergyIndex(read_columns(path))
+    lines = follow_lines(path)
+
+    def refresh():
+        rows = parse_lines(lines)
+        index.extend(rows)
+        return task_f.affected_reports(index, rows)
+
+    return refresh
+
+
+def follow_lines(path: str) -> List[bytes]:
+    with open(path, "rb") as f:
+        return f.read().splitlines()[-24:]
+
+
+def batch_queries(ranges) -> List[str]:
+    return [
+        f"daily {start:%d.%m.%Y} {end:%d.%m.%Y}" for start, end in ranges
+    ] + [f"monthly {month}" for month in range(1, 13)] + ["yearly"]
+
+
+def taskf_batch(index, ranges) -> str:
+    output = io.StringIO()
+    task_f.run_batch(index, batch_queries(ranges), output)
+    return output.getvalue()
+
+
+# The original results, computed once per data file.
+
+@functools.lru_cache(maxsize=None)
+def baseline_reservations(path: str) -> List[list]:
+    return baselines.read_reservations(path)
+
+
+@functools.lru_cache(maxsize=None)
+def baseline_week_totals(path: str) -> Dict[date, Dict]:
+    return baselines.week_daily_totals(baselines.read_week(path))
+
+
+@functools.lru_cache(maxsize=None)
+def baseline_energy(path: str) -> List[Dict]:
+    return baselines.read_energy(path)
+
+
+def energy_days(path: str) -> List[date]:
+    return sorted({row["date"] for row in baseline_energy(path)})
+
+
+RESERVATION_FIELDS = (
+    "reservation_id", "name", "email", "phone", "reservation_date",
+    "reservation_time", "duration_hours", "price", "confirmed",
+    "reserved_resource", "created_at",
+)
+
+
+def check_reservation_rows(path: str, rows) -> None:
+    assert [list(row) for row in rows] == baseline_reservations(path), (
+        "parsed reservations differ from the original parser"
+    )
+
+
+def check_output(expected: Callable[[List[list]], str]) -> Callable:
+    def check(path: str, result: object, output: str) -> None:
+        assert output == expected(baseline_reservations(path)), (
+            "report text differs from the original report"
+        )
+    return check
+
+
+def check_week_totals(path: str, totals: Dict[date, Dict], output: str = "") -> None:
+    normalized = {
+        day: {name: list(values[name]) for name in ("consumption", "production")}
+        for day, values in totals.items()
+    }
+    assert normalized == baseline_week_totals(path), (
+        "daily totals differ from the original calculate_daily_totals"
+    )
+
+
+def check_rollup(path: str, levels: List[list], output: str) -> None:
+    daily = baseline_week_totals(path)
+    by_day = {
+        day_date(summary.key): list(summary.sums) for summary in levels[0]
+    }
+    assert by_day == {
+        day: totals["consumption"] + totals["production"]
+        for day, totals in daily.items()
+    }, "daily buckets differ from the original calculate_daily_totals"
+
+    overall = [sum(values) for values in zip(*by_day.values())]
+    for buckets in levels[1:]:
+        assert [sum(values) for values in zip(*(b.sums for b in buckets))] == overall, (
+            "week, month or year buckets do not add up to the daily totals"
+        )
+
+
+def check_taske_summary(path: str, result: object, output: str) -> None:
+    with open(os.path.join(path, "summary.txt"), encoding="utf-8") as f:
+        summary = f.read()
+    assert summary == baselines.taske_report(
+        sorted(glob.glob(os.path.join(path, "week*.csv")))
+    ), "summary.txt differs from the original report"
+
+
+def check_energy_rows(path: str, rows: List[Dict], output: str) -> None:
+    expected = baseline_energy(path)
+    assert len(rows) == len(expected), "row counts differ"
+    for row, original in zip(rows, expected):
+        assert (
+            row["datetime"] == original["datetime"]
+            and row["date"] == original["date"]
+            and row["consumption"] == round(original["consumption"] * 1000)
+            and row["production"] == round(original["production"] * 1000)
+            and row["temperature"] == round(original["temperature"] * 10)
+        ), f"row {original['datetime']} differs from the original read_data"
+
+
+def check_energy_columns(
+    measurements: Sequence[str] = MEASUREMENTS
+) -> Callable[[str, object, str], None]:
+    scales = {"consumption": 1000, "production": 1000, "temperature": 10}
+
+    def check(path: str, columns, output: str) -> None:
+        expected = baseline_energy(path)
+        assert list(columns.hours) == [
+            math.floor(row["datetime"].timestamp() / 3600) for row in expected
+        ], "hours differ from the original timestamps"
+        assert list(columns.offsets) == [
+            row["datetime"].utcoffset() // timedelta(minutes=1) for row in expected
+        ], "UTC offsets differ from the original timestamps"
+        for name, scale in scales.items():
+            values = list(getattr(columns, name))
+            if name not in measurements:
+                assert not values, f"{name} was read although it was not asked for"
+                continue
+            assert values == [round(row[name] * scale) for row in expected], (
+                f"{name} differs from the original read_data"
+            )
+
+    return check
+
+
+def assert_totals(actual, expected, what: str) -> None:
+    assert baselines.same_totals(actual, expected), (
+        f"{what}: {actual} differs from the original {expected}"
+    )
+
+
+def check_index(path: str, index: EnergyIndex, output: str) -> None:
+    data = baseline_energy(path)
+    for month in range(1, 13):
+        assert_totals(
+            index.month_totals(month), baselines.month_totals(data, month), f"month {month}"
+        )
+    assert_totals(index.year_totals(), baselines.year_totals(data), "all years")
+
+
+def check_range_totals(path: str, results: list, output: str) -> None:
+    ranges = query_ranges(energy_days(path))
+    expected = baselines.many_range_totals(baseline_energy(path), ranges)
+    for (start, end), actual, original in zip(ranges, results, expected):
+        assert_totals(actual, original, f"{start}..{end}")
+
+
+def check_month_totals(path: str, results: list, output: str) -> None:
+    data = baseline_energy(path)
+    for month, actual in enumerate(results, start=1):
+        assert_totals(actual, baselines.month_totals(data, month), f"month {month}")
+
+
+def check_year_totals(path: str, result: tuple, output: str) -> None:
+    assert_totals(result, baselines.year_totals(baseline_energy(path)), "all years")
+
+
+def check_store_months(path: str, results: list, output: str) -> None:
+    data = baseline_energy(path)
+    months = sorted({(row["date"].year, row["date"].month) for row in data})
+    assert len(results) == len(months), "the store has other months than the file"
+    for (year, month), actual in zip(months, results):
+        assert_totals(actual, baselines.month_totals(data, month, year), f"{month}/{year}")
+
+
+def report_numbers(lines: Sequence[str]) -> List[float]:
+    # "- Total consumption: 1234,57 kWh" and the like, after the title.
+    return [float(line.split(": ")[1].split()[0].replace(",", ".")) for line in lines[2:]]
+
+
+def assert_report(lines: Sequence[str], expected, what: str) -> None:
+    # The reports round to two decimals; the original sums in floats.
+    numbers = report_numbers(lines)
+    assert len(numbers) == len(expected) and all(
+        math.isclose(number, value, abs_tol=0.0051)
+        for number, value in zip(numbers, expected)
+    ), f"{what} report {lines} differs from the original {expected}"
+
+
+def check_follow_refresh(path: str, reports: list, output: str) -> None:
+    data = baseline_energy(path)
+    data = data + data[-len(follow_lines(path)):]
+    days = sorted({row["date"] for row in data[-len(follow_lines(path)):]})
+    months = sorted({(day.year, day.month) for day in days})
+    years = sorted({day.year for day in days})
+
+    expected = (
+        [baselines.range_totals(data, day, day) for day in days]
+        + [baselines.month_totals(data, month, year) for year, month in months]
+        + [
+            baselines.year_totals([row for row in data if row["date"].year == year])
+            for year in years
+        ]
+    )
+    assert len(reports) == len(expected), "other reports than the original"
+    for lines, totals in zip(reports, expected):
+        assert_report(lines, totals, lines[1])
+
+
+def check_batch(path: str, text: str, output: str) -> None:
+    data = baseline_energy(path)
+    ranges = query_ranges(energy_days(path))
+    expected = (
+        baselines.many_range_totals(data, ranges)
+        + [baselines.month_totals(data, month) for month in range(1, 13)]
+        + [baselines.year_totals(data)]
+    )
+    separator = "-----------------------------------------------------"
+    reports = [
+        [separator] + block.strip("\n").split("\n")
+        for block in text.split(separator + "\n")[1:]
+    ]
+    assert len(reports) == len(expected), "not every query was answered"
+    for lines, totals in zip(reports, expected):
+        assert_report(lines, totals, lines[1])
+
+
+CASES = [
+    Case(
+        "taskc_read_reservations",
+        "reservations",
+        lambda path: lambda: list(task_c.read_reservations(path)),
+        lambda path, rows, output: check_reservation_rows(path, rows),
+    ),
+    Case(
+        "taskc_main",
+        "reservations",
+        lambda path: in_directory(os.path.dirname(path), lambda: task_c.main([])),
+        check_output(baselines.taskc_report),
+    ),
+    Case(
+        "taskg_class_fetch",
+        "reservations",
+        lambda path: lambda: task_g_class.fetch_reservations(path),
+        lambda path, reservations, output: check_reservation_rows(path, (
+            [getattr(r, name) for name in RESERVATION_FIELDS] for r in reservations
+        )),
+    ),
+    Case(
+        "taskg_dict_fetch",
+        "reservations",
+        lambda path: lambda: task_g_dict.fetch_reservations(path),
+        lambda path, reservations, output: check_reservation_rows(
+            path, (r.values() for r in reservations)
+        ),
+    ),
+    Case(
+        "taskg_table_fetch",
+        "reservations",
+        lambda path: lambda: reservation_table.fetch_reservation_table(path),
+        lambda path, table, output: check_reservation_rows(path, table.rows()),
+    ),
+    Case(
+        "taskg_class_main",
+        "reservations",
+        lambda path: in_directory(os.path.dirname(path), task_g_class.main),
+        check_output(baselines.taskg_report),
+    ),
+    Case(
+        "taskg_dict_main",
+        "reservations",
+        lambda path: in_directory(os.path.dirname(path), task_g_dict.main),
+        check_output(baselines.taskg_report),
+    ),
+    Case(
+        "taskd_calculate_daily_totals",
+        "week",
+        lambda path: lambda: week_data.calculate_daily_totals(week_data.read_data(path)),
+        check_week_totals,
+    ),
+    Case(
+        "taskd_build_rollup",
+        "week",
+        lambda path: lambda: [
+            week_data.build_rollup(week_data.read_data(path)).buckets(level)
+            for level in ("day", "week", "month", "year")
+        ],
+        check_rollup,
+    ),
+    Case(
+        "taskd_load_daily_totals",
+        "week",
+        lambda path: lambda: week_data.load_daily_totals(path),
+        check_week_totals,
+    ),
+    Case(
+        "taskd_load_daily_totals_columnar",
+        "week",
+        taskd_columnar_totals,
+        check_week_totals,
+    ),
+    Case(
+        "taske_main",
+        "weeks",
+        lambda path: lambda: task_e.main([
+            os.path.join(path, "week*.csv"),
+            "--no-cache",
+            "-o", os.path.join(path, "summary.txt"),
+        ]),
+        check_taske_summary,
+    ),
+    Case(
+        "taskf_read_data",
+        "energy",
+        lambda path: lambda: task_f.read_data(path),
+        check_energy_rows,
+    ),
+    Case(
+        "taskf_read_columns",
+        "energy",
+        lambda path: lambda: read_columns(path),
+        check_energy_columns(),
+    ),
+    Case(
+        "taskf_read_columnar",
+        "energy",
+        taskf_columnar,
+        check_energy_columns(),
+    ),
+    Case(
+        "taskf_read_columnar_consumption",
+        "energy",
+        lambda path: taskf_columnar(path, ["consumption"]),
+        check_energy_columns(["consumption"]),
+    ),
+    Case(
+        "taskf_build_index",
+        "energy",
+        lambda path: lambda: EnergyIndex(read_columns(path)),
+        check_index,
+    ),
+    Case(
+        "taskf_range_totals",
+        "energy",
+        lambda path: taskf_queries(path, lambda index, ranges: [
+            task_f.range_totals(index, start, end) for start, end in ranges
+        ]),
+        check_range_totals,
+    ),
+    Case(
+        "taskf_month_totals",
+        "energy",
+        lambda path: taskf_queries(path, lambda index, ranges: [
+            task_f.month_totals(index, month) for month in range(1, 13)
+        ]),
+        check_month_totals,
+    ),
+    Case(
+        "taskf_year_totals",
+        "energy",
+        lambda path: taskf_queries(path, lambda index, ranges: task_f.year_totals(index)),
+        check_year_totals,
+    ),
+    Case(
+        "taskf_store_month_totals",
+        "energy",
+        taskf_store_months,
+        check_store_months,
+    ),
+    Case(
+        "taskf_cached_store_month_totals",
+        "energy",
+        lambda path: taskf_store_months(path, cached=True),
+        check_store_months,
+    ),
+    Case(
+        "taskf_follow_refresh",
+        "energy",
+        taskf_follow_refresh,
+        check_follow_refresh,
+    ),
+    Case(
+        "taskf_batch_reports",
+        "energy",
+        lambda path: taskf_queries(path, taskf_batch),
+        check_batch,
+    ),
+]
+
+
+def data_file(directory: str, kind: str, rows: int) -> str:
+    """
+    Returns the generated data for kind and rows, writing it when missing.
+    """
+    path = os.path.join(directory, f"{kind}-{rows}")
+    os.makedirs(path, exist_ok=True)
+
+    if kind == "weeks":
+        if not any(name.startswith("week") for name in os.listdir(path)):
+            generate_week_files(path, rows)
+        return path
+
+    filename = {
+        "reservations": "reservations.txt",
+        "week": "week.csv",
+        "energy": "energy.csv",
+    }[kind]
+    filename = os.path.join(path, filename)
+    if not os.path.exists(filename):
+        generator = {
+            "reservations": generate_reservations,
+            "week": generate_week_csv,
+            "energy": generate_energy_csv,
+        }[kind]
+        generator(filename, rows)
+    return filename
+
+
+def best_time(function: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    with open(os.devnull, "w", encoding="utf-8") as sink:
+        for _ in range(repeat):
+            with contextlib.redirect_stdout(sink):
+                start = time.perf_counter()
+                function()
+                elapsed = time.perf_counter() - start
+            best = min(best, elapsed)
+    return best
+
+
+def verify(case: Case, path: str) -> None:
+    """
+    Runs the case once on fresh state and checks it against the original.
+    """
+    function = case.prepare(path)
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        result = function()
+    case.check(path, result, output.getvalue())
+
+
+def run(args: argparse.Namespace) -> None:
+    cases = [case for case in CASES if not args.cases or case.name in args.cases]
+    results = []
+
+    with contextlib.ExitStack() as stack:
+        directory = args.data_dir or stack.enter_context(tempfile.TemporaryDirectory())
+
+        for rows in args.sizes:
+            for case in cases:
+                path = data_file(directory, case.data, rows)
+                if args.check:
+                    verify(case, path)
+                function = case.prepare(path)
+                seconds = best_time(function, args.repeat)
+                results.append({
+                    "case": case.name,
+                    "rows": rows,
+                    "seconds": round(seconds, 6),
+                    "rows_per_second": round(rows / seconds) if seconds else None,
+                })
+                print(f"{case.name:<30} {rows:>9} {seconds:>10.4f} s")
+
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "repeat": args.repeat,
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+
+def compare(args: argparse.Namespace) -> int:
+    with open(args.old, encoding="utf-8") as f:
+        old = {(r["case"], r["rows"]): r["seconds"] for r in json.load(f)["results"]}
+    with open(args.new, encoding="utf-8") as f:
+        new = {(r["case"], r["rows"]): r["seconds"] for r in json.load(f)["results"]}
+
+    regressions = 0
+    print(f"{'case':<30} {'rows':>9} {'old s':>10} {'new s':>10} {'change':>8}")
+    for key in sorted(old.keys() & new.keys()):
+        change = new[key] / old[key] - 1 if old[key] else 0.0
+        flag = ""
+        # Sub-millisecond cases are mostly timer noise.
+        if change > args.threshold and new[key] >= args.min_seconds:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(
+            f"{key[0]:<30} {key[1]:>9} {old[key]:>10.4f} {new[key]:>10.4f} "
+            f"{change:>+8.1%}{flag}"
+        )
+
+    for key in sorted(old.keys() - new.keys()):
+        print(f"{key[0]:<30} {key[1]:>9} missing from {args.new}")
+
+    print(f"{regressions} regression(s) above {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+def parse_args(argv: Optional[list] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="time every case")
+    run_parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    run_parser.add_argument("--repeat", type=int, default=3,
+                            help="runs per case, the best is kept (default: 3)")
+    run_parser.add_argument("--cases", nargs="+", metavar="NAME",
+                            help="only run these cases")
+    run_parser.add_argument("--data-dir",
+                            help="keep generated files here and reuse them")
+    run_parser.add_argument("--no-check", dest="check", action="store_false",
+                            help="skip checking the results against baselines.py")
+    run_parser.add_argument("-o", "--output", default="benchmark_results.json")
+
+    compare_parser = commands.add_parser("compare", help="compare two runs")
+    compare_parser.add_argument("old")
+    compare_parser.add_argument("new")
+    compare_parser.add_argument("--threshold", type=float, default=0.10,
+                                help="slowdown that counts as a regression "
+                                     "(default: 0.10)")
+    compare_parser.add_argument("--min-seconds", type=float, default=0.001,
+                                help="never flag cases faster than this "
+                                     "(default: 0.001)")
+
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list] = None) -> int:
+    args = parse_args(argv)
+    if args.command == "run":
+        run(args)
+        return 0
+    return compare(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,6 @@
+"""
+Modules shared by the task scripts.
+
+The scripts are run from their own directories, so each one puts the
+repository root on sys.path before importing from here.
+"""
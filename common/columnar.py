@@ -0,0 +1,318 @@
+"""
+Compressed columnar files for hourly measurements.
+
+A file holds integer columns split into row groups, much like a minimal
+Parquet file:
+
+  magic | group | group | ... | footer (JSON) | footer length | CRC | magic
+
+Within a group every column is its own zlib-compressed block, so a reader
+decodes only the columns it asks for and seeks past the others. Before
+compression a column is narrowed to the smallest array typecode that holds
+its values, and delta columns (timestamps) are stored as differences of
+consecutive values, which for hourly data are nearly all equal and
+compress to almost nothing. Values are stored little-endian.
+
+The footer and every block carry a CRC-32, so a damaged or truncated file
+is reported with ValueError instead of being read as wrong numbers.
+
+Files whose name ends in .parquet are written and read with pyarrow
+instead, when it is installed.
+"""
+
+import json
+import operator
+import os
+import struct
+import sys
+import zlib
+from array import array
+from itertools import accumulate, chain
+from typing import (
+    Collection, Dict, Iterable, Iterator, Optional, Sequence, Tuple
+)
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is optional, only .parquet files need it
+    pa = pq = None
+
+
+MAGIC = b"ECOL"
+VERSION = 2
+EXTENSION = ".ecol"
+
+# footer length, footer CRC-32, magic
+TRAILER = struct.Struct("<QI4s")
+
+# Storage typecodes from the narrowest up.
+_NARROW = [
+    (code, -(1 << (8 * size - 1)), (1 << (8 * size - 1)) - 1)
+    for code, size in (("b", 1), ("h", 2), ("i", 4), ("q", 8))
+]
+
+# Maps the most significant byte of a value to its sign extension byte.
+_SIGN = bytes(0xFF if byte & 0x80 else 0 for byte in range(256))
+
+_ARROW_TYPES = {"b": "int8", "h": "int16", "i": "int32", "q": "int64"}
+
+Schema = Dict[str, str]
+Group = Dict[str, Sequence[int]]
+
+
+def is_columnar(filename: str) -> bool:
+    """
+    Tells whether filename is a columnar file rather than a CSV.
+    """
+    if filename.endswith(".parquet"):
+        return True
+    try:
+        with open(filename, "rb") as file:
+            return file.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def _narrow(values: Sequence[int]) -> array:
+    low = min(values, default=0)
+    high = max(values, default=0)
+    for code, smallest, largest in _NARROW:
+        if smallest <= low and high <= largest:
+            return array(code, values)
+    raise OverflowError("value does not fit in 64 bits")
+
+
+def _encode(values: Sequence[int], delta: bool, level: int) -> Tuple[str, bytes]:
+    if delta:
+        values = list(map(operator.sub, values, chain((0,), values)))
+    stored = _narrow(values)
+    if sys.byteorder == "big":
+        stored.byteswap()
+    return stored.typecode, zlib.compress(stored.tobytes(), level)
+
+
+def _widen(data: bytes, narrow: int, wide: int) -> bytearray:
+    """
+    Sign-extends little-endian integers of narrow bytes to wide bytes with
+    slice assignments, which is much faster than converting them one by one.
+    """
+    widened = bytearray(len(data) // narrow * wide)
+    for byte in range(narrow):
+        widened[byte::wide] = data[byte::narrow]
+    sign = data[narrow - 1::narrow].translate(_SIGN)
+    for byte in range(narrow, wide):
+        widened[byte::wide] = sign
+    return widened
+
+
+def _decode(block: bytes, storage: str, typecode: str, delta: bool) -> array:
+    data = zlib.decompress(block)
+    if not delta and storage != typecode:
+        data = _widen(data, array(storage).itemsize, array(typecode).itemsize)
+        storage = typecode
+
+    stored = array(storage)
+    stored.frombytes(data)
+    if sys.byteorder == "big":
+        stored.byteswap()
+    if delta:
+        return array(typecode, accumulate(stored))
+    return stored
+
+
+def write_table(
+    filename: str,
+    schema: Schema,
+    groups: Iterable[Group],
+    delta: Collection[str] = (),
+    level: int = 6,
+) -> int:
+    """
+    Writes row groups of integer columns and returns the number of rows.
+
+    schema maps each column name to the array typecode it is read back as;
+    every group maps the same names to equally long sequences. The groups
+    are written as they come, so they can be the chunks of a file that does
+    not fit in memory.
+    """
+    if filename.endswith(".parquet"):
+        return _write_parquet(filename, schema, groups, delta)
+
+    footer = {
+        "version": VERSION,
+        "rows": 0,
+        "columns": [
+            {"name": name, "type": typecode, "delta": name in delta}
+            for name, typecode in schema.items()
+        ],
+        "groups": [],
+    }
+    temporary = filename + ".tmp"
+
+    with open(temporary, "wb") as file:
+        file.write(MAGIC)
+
+        for group in groups:
+            rows = len(group[next(iter(schema))]) if schema else 0
+            if rows == 0:
+                continue
+
+            blocks = {}
+            for name in schema:
+                storage, block = _encode(group[name], name in delta, level)
+                blocks[name] = [file.tell(), len(block), storage, zlib.crc32(block)]
+                file.write(block)
+
+            footer["groups"].append({"rows": rows, "columns": blocks})
+            footer["rows"] += rows
+
+        encoded = json.dumps(footer, separators=(",", ":")).encode("utf-8")
+        file.write(encoded)
+        file.write(TRAILER.pack(len(encoded), zlib.crc32(encoded), MAGIC))
+
+    os.replace(temporary, filename)
+    return footer["rows"]
+
+
+def read_footer(filename: str) -> Dict:
+    """
+    Returns the footer of a columnar file: its version, row count, columns
+    and row groups.
+    """
+    with open(filename, "rb") as file:
+        return _footer(file, filename)
+
+
+def _footer(file, filename: str) -> Dict:
+    if file.read(len(MAGIC)) != MAGIC:
+        raise ValueError(f"{filename} is not a columnar file")
+
+    size = file.seek(0, os.SEEK_END)
+    if size < len(MAGIC) + TRAILER.size:
+        raise ValueError(f"{filename} is truncated")
+    file.seek(-TRAILER.size, os.SEEK_END)
+    length, crc, magic = TRAILER.unpack(file.read(TRAILER.size))
+    if magic != MAGIC or length > size - len(MAGIC) - TRAILER.size:
+        raise ValueError(f"{filename} is truncated")
+
+    file.seek(-TRAILER.size - length, os.SEEK_END)
+    encoded = file.read(length)
+    if zlib.crc32(encoded) != crc:
+        raise ValueError(f"{filename} is corrupt: footer checksum mismatch")
+    footer = json.loads(encoded)
+    if footer.get("version") != VERSION:
+        raise ValueError(
+            f"{filename} has columnar version {footer.get('version')}, "
+            f"expected {VERSION}"
+        )
+    return footer
+
+
+def iter_groups(
+    filename: str, names: Optional[Sequence[str]] = None
+) -> Iterator[Dict[str, array]]:
+    """
+    Yields the row groups of a file, each as arrays of the requested
+    columns (all of them by default). Other columns are not decompressed.
+    """
+    if filename.endswith(".parquet"):
+        yield from _iter_parquet(filename, names)
+        return
+
+    with open(filename, "rb") as file:
+        footer = _footer(file, filename)
+        columns = {column["name"]: column for column in footer["columns"]}
+        if names is None:
+            names = list(columns)
+        unknown = [name for name in names if name not in columns]
+        if unknown:
+            raise ValueError(f"{filename} has no column {', '.join(unknown)}")
+
+        for index, group in enumerate(footer["groups"]):
+            arrays = {}
+            for name in names:
+                offset, length, storage, crc = group["columns"][name]
+                file.seek(offset)
+                block = file.read(length)
+                if zlib.crc32(block) != crc:
+                    raise ValueError(
+                        f"{filename} is corrupt: column {name} of row group "
+                        f"{index} fails its checksum"
+                    )
+                arrays[name] = _decode(
+                    block,
+                    storage,
+                    columns[name]["type"],
+                    columns[name]["delta"],
+                )
+            yield arrays
+
+
+def read_table(
+    filename: str, names: Optional[Sequence[str]] = None
+) -> Dict[str, array]:
+    """
+    Reads whole columns of a file; see iter_groups.
+    """
+    if filename.endswith(".parquet"):
+        table: Dict[str, array] = {}
+    else:
+        footer = read_footer(filename)
+        table = {
+            column["name"]: array(column["type"])
+            for column in footer["columns"]
+            if names is None or column["name"] in names
+        }
+
+    for group in iter_groups(filename, names):
+        for name, values in group.items():
+            table.setdefault(name, array(values.typecode)).extend(values)
+    return table
+
+
+def _require_pyarrow() -> None:
+    if pq is None:
+        raise RuntimeError(".parquet files need pyarrow, which is not installed")
+
+
+def _write_parquet(
+    filename: str, schema: Schema, groups: Iterable[Group], delta: Collection[str]
+) -> int:
+    _require_pyarrow()
+    arrow_schema = pa.schema(
+        [(name, getattr(pa, _ARROW_TYPES[code])()) for name, code in schema.items()]
+    )
+    rows = 0
+
+    with pq.ParquetWriter(
+        filename,
+        arrow_schema,
+        compression="zstd",
+        use_dictionary=False,
+        column_encoding={name: "DELTA_BINARY_PACKED" for name in delta},
+    ) as writer:
+        for group in groups:
+            table = pa.table(
+                {name: pa.array(group[name]) for name in schema},
+                schema=arrow_schema,
+            )
+            writer.write_table(table)
+            rows += table.num_rows
+
+    return rows
+
+
+def _iter_parquet(
+    filename: str, names: Optional[Sequence[str]]
+) -> Iterator[Dict[str, array]]:
+    _require_pyarrow()
+    parquet = pq.ParquetFile(filename)
+    typecodes = {str(pa_type): code for code, pa_type in _ARROW_TYPES.items()}
+
+    for index in range(parquet.num_row_groups):
+        table = parquet.read_row_group(index, columns=names)
+        yield {
+            name: array(typecodes[str(column.type)], column.to_pylist())
+            for name, column in zip(table.column_names, table.columns)
+        }
@@ -0,0 +1,84 @@
+"""
+Cached date and time parsing and formatting for the task readers.
+
+Reservation and energy files only ever contain a few thousand distinct days
+and at most 1440 distinct start times, so parsed and formatted values are
+computed once and shared between rows. Parsing uses the fromisoformat
+constructors, which are implemented in C and several times faster than
+strptime for these fixed formats.
+"""
+
+from datetime import date, datetime, time
+
+_DATES: dict[str, date] = {}
+# The distinct time parts seen after a date, e.g. "T13:00:00+02:00".
+_TIME_RESTS: set[str] = set()
+_TIMES: dict[str, time] = {}
+_DATE_TEXT: dict[date, str] = {}
+_TIME_TEXT: dict[time, str] = {}
+
+
+def parse_date(text: str) -> date:
+    """
+    Parses a YYYY-MM-DD date, or the date part of an ISO timestamp, reusing
+    the date object for repeated days. Anything after the date must be a
+    valid time after a T or space separator.
+    """
+    key = text[:10]
+    parsed = _DATES.get(key)
+    if parsed is None:
+        if len(key) != 10 or key[4] != "-" or key[7] != "-":
+            raise ValueError(f"Invalid isoformat string: {text!r}")
+        parsed = _DATES[key] = date.fromisoformat(key)
+    if len(text) > 10 and text[10:] not in _TIME_RESTS:
+        _check_time_rest(text)
+    return parsed
+
+
+def _check_time_rest(text: str) -> None:
+    rest = text[10:]
+    try:
+        if rest[0] not in "T ":
+            raise ValueError
+        time.fromisoformat(rest[1:])
+    except ValueError:
+        raise ValueError(f"Invalid isoformat string: {text!r}") from None
+    _TIME_RESTS.add(rest)
+
+
+def parse_time(text: str) -> time:
+    """
+    Parses a HH:MM start time, reusing the time object for repeated values.
+    """
+    parsed = _TIMES.get(text)
+    if parsed is None:
+        parsed = _TIMES[text] = time.fromisoformat(text)
+    return parsed
+
+
+def parse_datetime(text: str) -> datetime:
+    """
+    Parses a YYYY-MM-DD HH:MM:SS timestamp, or an ISO timestamp with a T
+    separator and an optional UTC offset.
+    """
+    return datetime.fromisoformat(text)
+
+
+def format_date(day: date) -> str:
+    """
+    Formats a date as dd.mm.yyyy, once per distinct date.
+    """
+    text = _DATE_TEXT.get(day)
+    if text is None:
+        text = _DATE_TEXT[day] = day.strftime("%d.%m.%Y")
+    return text
+
+
+def format_time(moment: time) -> str:
+    """
+    Formats a time as HH.MM, once per distinct time.
+    """
+    text = _TIME_TEXT.get(moment)
+    if text is None:
+        text = _TIME_TEXT[moment] = moment.strftime("%H.%M")
+    return text
@@ -0,0 +1,156 @@
+"""
+Opt-in run profiling.
+
+Enabled by the TASK_PROFILE environment variable or a --profile argument.
+A run then writes one JSON line with the seconds spent per stage, the
+number of rows processed, the tracemalloc peak and the number of
+strptime calls. TASK_PROFILE=1 (or true, yes, on, or --profile alone)
+writes the line to stderr; 0, false, no, off or an empty value leave
+profiling off, and any other value is a file the line is appended to.
+
+Every task reports the same stages, listed in STAGES: read, parse,
+aggregate, render and write. Stages can nest, and the time spent in a
+nested stage counts only towards that stage: in a streaming run the
+render stage pulls rows whose parse time is reported under parse.
+Work done in worker processes is not included.
+
+When disabled, stage() hands out one shared no-op context manager and
+timed() returns the function unchanged, so the hooks cost next to nothing.
+"""
+
+import atexit
+import functools
+import json
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import nullcontext
+from datetime import datetime
+from typing import Callable, Optional
+
+STAGES = ("read", "parse", "aggregate", "render", "write")
+
+_TRUE = ("1", "true", "yes", "on")
+_FALSE = ("", "0", "false", "no", "off")
+
+_TARGET = os.environ.get("TASK_PROFILE", "").strip()
+if _TARGET.lower() in _TRUE:
+    _TARGET = ""
+    ENABLED = True
+elif _TARGET.lower() in _FALSE:
+    _TARGET = ""
+    ENABLED = "--profile" in sys.argv
+else:
+    ENABLED = True
+
+_NOOP = nullcontext()
+_stages: dict = {}
+# Time spent in nested stages, one entry per open stage.
+_nested: list = []
+_counters = {"rows": 0, "strptime": 0}
+_started = 0.0
+
+
+class _Stage:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self) -> None:
+        _nested.append(0.0)
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        elapsed = time.perf_counter() - self.start
+        own = elapsed - _nested.pop()
+        _stages[self.name] = _stages.get(self.name, 0.0) + own
+        if _nested:
+            _nested[-1] += elapsed
+
+
+class _CountingDatetime(datetime):
+    @classmethod
+    def strptime(cls, date_string: str, format: str) -> datetime:
+        _counters["strptime"] += 1
+        return datetime.strptime(date_string, format)
+
+
+def _check(name: str) -> None:
+    if name not in STAGES:
+        raise ValueError(f"unknown profiling stage {name!r}, expected one of {STAGES}")
+
+
+def stage(name: str):
+    """
+    Context manager that adds the time spent inside it to the named stage.
+    """
+    if not ENABLED:
+        return _NOOP
+    _check(name)
+    return _Stage(name)
+
+
+def timed(name: str) -> Callable:
+    """
+    Decorator that adds the time spent in every call to the named stage.
+    """
+    _check(name)
+
+    def decorate(function: Callable) -> Callable:
+        if not ENABLED:
+            return function
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with _Stage(name):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def add_rows(count: int) -> None:
+    if ENABLED:
+        _counters["rows"] += count
+
+
+def start(script: str, namespace: Optional[dict] = None) -> None:
+    """
+    Starts measuring the run; the JSON line is written when the process
+    exits. Passing the script's globals() also counts its strptime calls.
+    """
+    global _started
+    if not ENABLED:
+        return
+
+    if namespace is not None and namespace.get("datetime") is datetime:
+        namespace["datetime"] = _CountingDatetime
+
+    tracemalloc.start()
+    _started = time.perf_counter()
+    atexit.register(_report, script)
+
+
+def _report(script: str) -> None:
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    line = json.dumps({
+        "script": script,
+        "args": [arg for arg in sys.argv[1:] if arg != "--profile"],
+        "time": datetime.now().isoformat(timespec="seconds"),
+        "seconds": round(time.perf_counter() - _started, 6),
+        "stages": {name: round(seconds, 6) for name, seconds in _stages.items()},
+        "rows": _counters["rows"],
+        "strptime_calls": _counters["strptime"],
+        "tracemalloc_peak_bytes": peak,
+    })
+
+    if not _TARGET:
+        print(line, file=sys.stderr)
+    else:
+        with open(_TARGET, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
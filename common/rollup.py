@@ -0,0 +1,538 @@
+"""
+Time-bucketed rollups of hourly measurements.
+
+Hourly rows are ingested once into daily buckets; ISO-week, monthly and
+yearly buckets are then materialised from the daily ones. Every bucket keeps
+per-channel sums, minimums and maximums, the number of hours and days and,
+optionally, temperature sums, all in compact integer arrays. A query on a
+coarse level therefore costs time proportional to the number of its buckets
+instead of the number of hourly rows.
+
+Values are integers in whatever unit the caller chooses (Wh, or kWh scaled
+by 1000), so sums are exact. Days are numbered from 1970-01-01.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+LEVELS = ("day", "week", "month", "year")
+
+
+def day_number(day: date) -> int:
+    return day.toordinal() - EPOCH_ORDINAL
+
+
+def day_date(number: int) -> date:
+    return date.fromordinal(EPOCH_ORDINAL + number)
+
+
+def bucket_key(level: str, day: date) -> int:
+    """
+    Returns the key of the bucket containing day: the day number, ISO year
+    * 100 + ISO week, year * 100 + month, or the year.
+    """
+    if level == "day":
+        return day_number(day)
+    if level == "week":
+        iso_year, week, _ = day.isocalendar()
+        return iso_year * 100 + week
+    if level == "month":
+        return day.year * 100 + day.month
+    if level == "year":
+        return day.year
+    raise ValueError(f"Unknown rollup level: {level}")
+
+
+class Summary(NamedTuple):
+    """
+    Aggregates of one bucket, or of several merged buckets.
+
+    temperature is the sum of the hourly temperatures and daily_temperature
+    the sum of the last temperature of every day.
+    """
+
+    key: int
+    hours: int
+    days: int
+    sums: Tuple[int, ...]
+    mins: Tuple[int, ...]
+    maxs: Tuple[int, ...]
+    temperature: int = 0
+    daily_temperature: int = 0
+
+    def mean(self, channel: int) -> float:
+        return self.sums[channel] / self.hours if self.hours else 0.0
+
+    def mean_temperature(self) -> float:
+        return self.temperature / self.hours if self.hours else 0.0
+
+    def mean_daily_temperature(self) -> float:
+        return self.daily_temperature / self.days if self.days else 0.0
+
+
+def merge(summaries: Iterable[Summary], channels: int, key: int = 0) -> Summary:
+    """
+    Combines summaries into one; an empty input gives an all-zero summary.
+    """
+    hours = days = temperature = daily_temperature = 0
+    sums = [0] * channels
+    mins: List[Optional[int]] = [None] * channels
+    maxs: List[Optional[int]] = [None] * channels
+
+    for summary in summaries:
+        hours += summary.hours
+        days += summary.days
+        temperature += summary.temperature
+        daily_temperature += summary.daily_temperature
+        for channel in range(channels):
+            sums[channel] += summary.sums[channel]
+            low = summary.mins[channel]
+            high = summary.maxs[channel]
+            if mins[channel] is None or low < mins[channel]:
+                mins[channel] = low
+            if maxs[channel] is None or high > maxs[channel]:
+                maxs[channel] = high
+
+    return Summary(
+        key,
+        hours,
+        days,
+        tuple(sums),
+        tuple(0 if value is None else value for value in mins),
+        tuple(0 if value is None else value for value in maxs),
+        temperature,
+        daily_temperature,
+    )
+
+
+class _Level:
+    """
+    Buckets of one level, column by column. Bucket i covers the daily
+    buckets first_day[i]:first_day[i + 1].
+    """
+
+    def __init__(self, channels: int):
+        self.keys = array("q")
+        self.first_day = array("q")
+        self.hours = array("q")
+        self.sums = [array("q") for _ in range(channels)]
+        self.mins = [array("q") for _ in range(channels)]
+        self.maxs = [array("q") for _ in range(channels)]
+        self.temperature = array("q")
+        self.daily_temperature = array("q")
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def append(
+        self,
+        key: int,
+        first_day: int,
+        hours: int,
+        sums: Sequence[int],
+        mins: Sequence[int],
+        maxs: Sequence[int],
+        temperature: int,
+        daily_temperature: int,
+    ) -> None:
+        """
+        Adds a bucket at the end. The caller keeps the closing entry of
+        first_day up to date.
+        """
+        self.keys.append(key)
+        self.first_day.append(first_day)
+        self.hours.append(hours)
+        for channel, values in enumerate(self.sums):
+            values.append(sums[channel])
+            self.mins[channel].append(mins[channel])
+            self.maxs[channel].append(maxs[channel])
+        self.temperature.append(temperature)
+        self.daily_temperature.append(daily_temperature)
+
+    def insert(
+        self,
+        index: int,
+        key: int,
+        hours: int,
+        sums: Sequence[int],
+        mins: Sequence[int],
+        maxs: Sequence[int],
+        temperature: int,
+        daily_temperature: int,
+    ) -> None:
+        self.keys.insert(index, key)
+        self.hours.insert(index, hours)
+        for channel, values in enumerate(self.sums):
+            values.insert(index, sums[channel])
+            self.mins[channel].insert(index, mins[channel])
+            self.maxs[channel].insert(index, maxs[channel])
+        self.temperature.insert(index, temperature)
+        self.daily_temperature.insert(index, daily_temperature)
+
+    def add(
+        self,
+        index: int,
+        hours: int,
+        sums: Sequence[int],
+        mins: Sequence[int],
+        maxs: Sequence[int],
+        temperature: int,
+        daily_temperature: int,
+    ) -> None:
+        """
+        Adds hours to an existing bucket.
+        """
+        self.hours[index] += hours
+        for channel, values in enumerate(self.sums):
+            values[index] += sums[channel]
+            if mins[channel] < self.mins[channel][index]:
+                self.mins[channel][index] = mins[channel]
+            if maxs[channel] > self.maxs[channel][index]:
+                self.maxs[channel][index] = maxs[channel]
+        self.temperature[index] += temperature
+        self.daily_temperature[index] += daily_temperature
+
+    def add_to_prefix(
+        self,
+        index: int,
+        hours: int,
+        sums: Sequence[int],
+        temperature: int,
+        daily_temperature: int,
+    ) -> None:
+        """
+        Updates prefix sums for hours added to the index-th day, which is a
+        new last day when index is the number of days so far. Costs time
+        proportional to the number of later days.
+        """
+        columns = [self.hours, self.temperature, self.daily_temperature, *self.sums]
+        changes = [hours, temperature, daily_temperature, *sums]
+        for values, change in zip(columns, changes):
+            if index + 1 == len(values):
+                values.append(values[-1] + change)
+            else:
+                for position in range(index + 1, len(values)):
+                    values[position] += change
+
+    def summary(self, index: int) -> Summary:
+        return Summary(
+            self.keys[index],
+            self.hours[index],
+            self.first_day[index + 1] - self.first_day[index],
+            tuple(values[index] for values in self.sums),
+            tuple(values[index] for values in self.mins),
+            tuple(values[index] for values in self.maxs),
+            self.temperature[index],
+            self.daily_temperature[index],
+        )
+
+
+class Rollup:
+    """
+    Daily, ISO-week, monthly and yearly aggregates of hourly measurements.
+
+    channels names the value columns, e.g. ("consumption", "production").
+    Rows may arrive in any order, but chronological input is the fast path:
+    hours of a day that already has a bucket are merged into it, and an
+    earlier day is inserted in place.
+    """
+
+    def __init__(self, channels: Sequence[str]):
+        self.channels = tuple(channels)
+        self._days = _Level(len(self.channels))
+        self._days.first_day.append(0)
+        self._levels: Dict[str, _Level] = {}
+        self._cumulative: Optional[_Level] = None
+
+    @classmethod
+    def from_hours(
+        cls,
+        channels: Sequence[str],
+        days: Iterable[int],
+        values: Iterable[Sequence[int]],
+        temperatures: Optional[Iterable[int]] = None,
+    ) -> "Rollup":
+        rollup = cls(channels)
+        rollup.add_hours(days, values, temperatures)
+        return rollup
+
+    def __len__(self) -> int:
+        """
+        Returns the number of daily buckets.
+        """
+        return len(self._days)
+
+    def add_hours(
+        self,
+        days: Iterable[int],
+        values: Iterable[Sequence[int]],
+        temperatures: Optional[Iterable[int]] = None,
+    ) -> None:
+        """
+        Adds hourly rows: the day number of every row, its channel values and
+        optionally its temperature.
+        """
+        channels = len(self.channels)
+        if temperatures is None:
+            temperatures = iter(int, 1)  # endless zeros
+
+        current = None
+        hours = temperature = last_temperature = 0
+        sums: List[int] = []
+        mins: List[int] = []
+        maxs: List[int] = []
+
+        for day, row, hour_temperature in zip(days, values, temperatures):
+            if day != current:
+                if current is not None:
+                    self.add_day(
+                        current, hours, sums, mins, maxs,
+                        temperature, last_temperature,
+                    )
+                current = day
+                hours = temperature = 0
+                sums = list(row)
+                mins = list(row)
+                maxs = list(row)
+            else:
+                for channel in range(channels):
+                    value = row[channel]
+                    sums[channel] += value
+                    if value < mins[channel]:
+                        mins[channel] = value
+                    elif value > maxs[channel]:
+                        maxs[channel] = value
+            hours += 1
+            temperature += hour_temperature
+            last_temperature = hour_temperature
+
+        if current is not None:
+            self.add_day(
+                current, hours, sums, mins, maxs, temperature, last_temperature
+            )
+
+    def add_columns(
+        self,
+        days: Sequence[int],
+        columns: Sequence[Sequence[int]],
+        temperatures: Optional[Sequence[int]] = None,
+    ) -> None:
+        """
+        Adds hourly rows given column by column, e.g. as arrays. Every run of
+        rows of one day is aggregated with sum, min and max over slices,
+        which is much faster than add_hours for long columns.
+        """
+        rows = len(days)
+        start = 0
+        while start < rows:
+            day = days[start]
+            end = start + 1
+            while end < rows and days[end] == day:
+                end += 1
+
+            runs = [values[start:end] for values in columns]
+            if temperatures is None:
+                temperature = last_temperature = 0
+            else:
+                temperature = sum(temperatures[start:end])
+                last_temperature = temperatures[end - 1]
+            self.add_day(
+                day,
+                end - start,
+                [sum(run) for run in runs],
+                [min(run) for run in runs],
+                [max(run) for run in runs],
+                temperature,
+                last_temperature,
+            )
+            start = end
+
+    def add_day(
+        self,
+        day: int,
+        hours: int,
+        sums: Sequence[int],
+        mins: Sequence[int],
+        maxs: Sequence[int],
+        temperature: int = 0,
+        last_temperature: int = 0,
+    ) -> None:
+        """
+        Adds the aggregates of some hours of one day. When the day already
+        has a bucket the hours are merged into it, and last_temperature
+        replaces the stored one if the hours are later than the stored ones,
+        which is the case for chronological input.
+
+        Materialised levels and prefix sums are updated in place when the
+        day already has a bucket or is a new last day, so appending recent
+        hours costs the same however much data there already is. Inserting
+        an earlier day drops them; they are rebuilt on the next query.
+        """
+        level = self._days
+        index = bisect_left(level.keys, day)
+
+        if index < len(level) and level.keys[index] == day:
+            daily_change = last_temperature - level.daily_temperature[index]
+            level.add(index, hours, sums, mins, maxs, temperature, daily_change)
+            new_day = False
+        elif index == len(level):
+            # Every daily bucket is its own single day.
+            level.append(
+                day, level.first_day.pop(), hours, sums, mins, maxs,
+                temperature, last_temperature,
+            )
+            level.first_day.append(len(level))
+            daily_change = last_temperature
+            new_day = True
+        else:
+            level.insert(
+                index, day, hours, sums, mins, maxs, temperature, last_temperature
+            )
+            level.first_day.append(len(level))
+            self._levels.clear()
+            self._cumulative = None
+            return
+
+        if self._cumulative is not None:
+            self._cumulative.add_to_prefix(
+                index, hours, sums, temperature, daily_change
+            )
+
+        current = day_date(day)
+        for name, buckets in list(self._levels.items()):
+            key = bucket_key(name, current)
+            position = bisect_left(buckets.keys, key)
+            if position < len(buckets) and buckets.keys[position] == key:
+                buckets.add(
+                    position, hours, sums, mins, maxs, temperature, daily_change
+                )
+                if new_day:
+                    buckets.first_day[-1] += 1
+            elif new_day and position == len(buckets):
+                buckets.append(
+                    key, buckets.first_day.pop(), hours, sums, mins, maxs,
+                    temperature, last_temperature,
+                )
+                buckets.first_day.append(len(level))
+            else:
+                del self._levels[name]
+
+    def _level(self, name: str) -> _Level:
+        if name == "day":
+            return self._days
+
+        level = self._levels.get(name)
+        if level is None:
+            level = self._levels[name] = self._materialise(name)
+        return level
+
+    def _materialise(self, name: str) -> _Level:
+        """
+        Builds the buckets of a coarser level from the daily buckets.
+        """
+        days = self._days
+        level = _Level(len(self.channels))
+
+        for index, day in enumerate(days.keys):
+            key = bucket_key(name, day_date(day))
+            day_values = (
+                days.hours[index],
+                [values[index] for values in days.sums],
+                [values[index] for values in days.mins],
+                [values[index] for values in days.maxs],
+                days.temperature[index],
+                days.daily_temperature[index],
+            )
+            if len(level) and key == level.keys[-1]:
+                level.add(len(level) - 1, *day_values)
+            else:
+                level.append(key, index, *day_values)
+
+        level.first_day.append(len(days))
+        return level
+
+    def buckets(self, level: str = "day") -> List[Summary]:
+        """
+        Returns the buckets of a level in chronological order.
+        """
+        buckets = self._level(level)
+        return [buckets.summary(index) for index in range(len(buckets))]
+
+    def keys(self, level: str = "day") -> array:
+        return self._level(level).keys
+
+    def bucket(self, level: str, index: int) -> Summary:
+        """
+        Returns the index-th bucket of a level.
+        """
+        return self._level(level).summary(index)
+
+    def find(self, level: str, key: int) -> Optional[Summary]:
+        """
+        Returns the bucket with the given key, or None.
+        """
+        buckets = self._level(level)
+        index = bisect_left(buckets.keys, key)
+        if index < len(buckets) and buckets.keys[index] == key:
+            return buckets.summary(index)
+        return None
+
+    def total(self) -> Summary:
+        """
+        Returns the aggregates of every row.
+        """
+        return merge(self.buckets("year"), len(self.channels))
+
+    def _prefix_sums(self) -> _Level:
+        """
+        Returns prefix sums over the daily buckets, with a leading zero.
+        """
+        if self._cumulative is None:
+            days = self._days
+            cumulative = _Level(len(self.channels))
+            for values in [
+                cumulative.hours,
+                cumulative.temperature,
+                cumulative.daily_temperature,
+                *cumulative.sums,
+            ]:
+                values.append(0)
+            for index in range(len(days)):
+                cumulative.add_to_prefix(
+                    index,
+                    days.hours[index],
+                    [values[index] for values in days.sums],
+                    days.temperature[index],
+                    days.daily_temperature[index],
+                )
+            self._cumulative = cumulative
+        return self._cumulative
+
+    def range(self, first_day: int, last_day: int, extremes: bool = True) -> Summary:
+        """
+        Returns the aggregates of the days first_day..last_day (inclusive).
+        Sums take two lookups in prefix sums over the daily buckets; the
+        minimums and maximums take one pass over the days in the range, and
+        are left empty when extremes is False.
+        """
+        days = self._days
+        lo = bisect_left(days.keys, first_day)
+        hi = bisect_right(days.keys, last_day)
+        if lo >= hi:
+            return merge([], len(self.channels), first_day)
+
+        cumulative = self._prefix_sums()
+        return Summary(
+            first_day,
+            cumulative.hours[hi] - cumulative.hours[lo],
+            hi - lo,
+            tuple([sums[hi] - sums[lo] for sums in cumulative.sums]),
+            tuple([min(values[lo:hi]) for values in days.mins]) if extremes else (),
+            tuple([max(values[lo:hi]) for values in days.maxs]) if extremes else (),
+            cumulative.temperature[hi] - cumulative.temperature[lo],
+            cumulative.daily_temperature[hi] - cumulative.daily_temperature[lo],
+        )
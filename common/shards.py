@@ -0,0 +1,50 @@
+"""
+Splitting a text file into byte ranges for parallel parsing.
+"""
+
+import os
+from typing import Iterator
+
+# Ranges smaller than this are not worth a process.
+MIN_SHARD_BYTES = 1 << 20
+
+
+def shard_ranges(
+    filename: str, shards: int, min_shard_bytes: int = MIN_SHARD_BYTES
+) -> list[tuple[int, int]]:
+    """
+    Splits the file into at most shards [start, end) byte ranges, each
+    ending right after a newline (or at the end of the file).
+    """
+    size = os.path.getsize(filename)
+    shards = max(1, min(shards, size // min_shard_bytes))
+
+    boundaries = [0]
+    with open(filename, "rb") as f:
+        for shard in range(1, shards):
+            # Reading the rest of the line from one byte before the split
+            # point also handles a split point that is already a line start.
+            f.seek(size * shard // shards - 1)
+            f.readline()
+            boundary = f.tell()
+            if boundaries[-1] < boundary < size:
+                boundaries.append(boundary)
+    boundaries.append(size)
+
+    return list(zip(boundaries, boundaries[1:]))
+
+
+def read_lines(filename: str, start: int, end: int) -> Iterator[str]:
+    """
+    Yields the decoded lines of the [start, end) byte range of the file one
+    at a time, with their line endings. start must be a line start, as the
+    ranges of shard_ranges are.
+    """
+    with open(filename, "rb") as f:
+        f.seek(start)
+        position = start
+        for raw in f:
+            if position >= end:
+                break
+            position += len(raw)
+            yield raw.decode("utf-8")
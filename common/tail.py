@@ -0,0 +1,103 @@
+"""
+Follows a growing measurement file.
+
+FileTail remembers the byte offset it has read up to and on every poll
+returns only the complete lines appended since then. A last line without a
+newline is returned only if the file did not grow while it was read, as
+files written by hand or by some exporters do not end with a newline. When
+the file is replaced by another one (rotation), becomes shorter than the
+offset (truncation), or a line that was already returned turns out to
+continue, the poll reports a reset and reads the new content from the
+start, so the caller can rebuild whatever it derived from the old content.
+"""
+
+import os
+from typing import Callable, List, NamedTuple, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class Poll(NamedTuple):
+    reset: bool
+    lines: List[bytes]
+
+
+class FileTail:
+    """
+    Reads the lines appended to a file since the previous poll.
+    """
+
+    def __init__(self, filename: str, header: bool = True):
+        self.filename = filename
+        self.header = header
+        self.offset = 0
+        self._identity: Optional[Tuple[int, int]] = None
+        self._partial = b""
+        self._partial_returned = False
+        self._skip_header = header
+
+    def _restart(self) -> None:
+        self.offset = 0
+        self._partial = b""
+        self._partial_returned = False
+        self._skip_header = self.header
+
+    def poll(self) -> Poll:
+        """
+        Returns the new complete, non-empty lines without their newlines.
+        A file that does not exist (yet) has no lines.
+        """
+        try:
+            stat = os.stat(self.filename)
+        except FileNotFoundError:
+            return Poll(False, [])
+
+        identity = (stat.st_dev, stat.st_ino)
+        reset = self._identity is not None and (
+            identity != self._identity or stat.st_size < self.offset
+        )
+        if reset:
+            self._restart()
+        self._identity = identity
+
+        if stat.st_size > self.offset:
+            with open(self.filename, "rb") as file:
+                file.seek(self.offset)
+                data = file.read(stat.st_size - self.offset)
+
+            if self._partial_returned:
+                self._partial_returned = False
+                if not data.startswith((b"\n", b"\r\n")):
+                    # The returned line was cut short by a write in progress.
+                    self._restart()
+                    return Poll(True, self.poll().lines)
+
+            self.offset += len(data)
+            lines = (self._partial + data).split(b"\n")
+            self._partial = lines.pop()
+
+            if self._skip_header and lines:
+                del lines[0]
+                self._skip_header = False
+        else:
+            lines = []
+
+        if self._partial.strip() and not self._skip_header:
+            if os.stat(self.filename).st_size == self.offset:
+                lines.append(self._partial)
+                self._partial = b""
+                self._partial_returned = True
+
+        return Poll(reset, [line.rstrip(b"\r") for line in lines if line.strip()])
+
+
+def parse_polled(parse: Callable[[List[bytes]], T], lines: List[bytes]) -> T:
+    """
+    Parses the lines of a poll with parse. A last line that does not parse
+    is still being written and is left out; once it is finished, the tail
+    reports a reset and it is read again with the rest of the file.
+    """
+    try:
+        return parse(lines)
+    except ValueError:
+        return parse(lines[:-1])
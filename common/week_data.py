@@ -0,0 +1,401 @@
+"""
+Reading, exporting and aggregating the hourly week files of TaskD and TaskE.
+
+A week file is a semicolon-separated CSV with a header line and one row per
+hour: the local time followed by consumption phases 1-3 and production
+phases 1-3 in Wh. Files written by export_columnar are read the same way.
+The daily totals are built with a Rollup, with NumPy when it is installed
+and in pure Python otherwise.
+"""
+
+import csv
+import os
+import re
+from array import array
+from datetime import datetime, date, timedelta
+from itertools import islice
+from typing import Dict, Iterator, List, Tuple
+
+from common import profiling
+from common.fast_dates import parse_datetime
+from common.columnar import is_columnar, iter_groups, read_table, write_table
+from common.rollup import Rollup, day_date, day_number
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, the pure-Python path is used without it
+    np = None
+
+
+FINNISH_WEEKDAYS = {
+    0: "Monday",
+    1: "Tuesday",
+    2: "Wednesday",
+    3: "Thursday",
+    4: "Friday",
+    5: "Saturday",
+    6: "Sunday",
+}
+
+# Consumption phases 1-3 followed by production phases 1-3, in Wh.
+CHANNELS = (
+    "consumption1", "consumption2", "consumption3",
+    "production1", "production2", "production3",
+)
+
+# Rows parsed at a time by load_daily_totals; bounds its memory use however
+# long the file is.
+CHUNK_ROWS = 50_000
+
+# Columns of a week file in columnar form (see columnar.py): the local time
+# in seconds since 1970-01-01, then the channels.
+COLUMNAR_SCHEMA = {"time": "q", **{channel: "q" for channel in CHANNELS}}
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def read_chunks(filename: str, chunk_rows: int = CHUNK_ROWS) -> Iterator[List[Dict]]:
+    """
+    Reads the CSV file in blocks of at most chunk_rows rows, each a list in
+    the format of read_data. Only the current block is kept in memory.
+    A columnar file is read a row group at a time instead.
+    """
+    if is_columnar(filename):
+        yield from read_columnar_chunks(filename)
+        return
+
+    rows: List[Dict] = []
+
+    with open(filename, "r", encoding="utf-8") as file:
+        reader = csv.reader(file, delimiter=";")
+        next(reader)
+
+        for row in reader:
+            rows.append({
+                "datetime": parse_datetime(row[0]),
+                "consumption": [int(row[1]), int(row[2]), int(row[3])],
+                "production": [int(row[4]), int(row[5]), int(row[6])],
+            })
+
+            if len(rows) == chunk_rows:
+                profiling.add_rows(len(rows))
+                yield rows
+                rows = []
+
+    if rows:
+        profiling.add_rows(len(rows))
+        yield rows
+
+
+def read_groups(filename: str) -> Iterator[Dict[str, array]]:
+    """
+    Reads a columnar week file a row group at a time.
+    """
+    for group in iter_groups(filename, ("time",) + CHANNELS):
+        profiling.add_rows(len(group["time"]))
+        yield group
+
+
+def read_columnar_chunks(filename: str) -> Iterator[List[Dict]]:
+    """
+    Reads a columnar week file a row group at a time, each group as a list
+    in the format of read_data.
+    """
+    for group in read_groups(filename):
+        yield [
+            {
+                "datetime": EPOCH + timedelta(seconds=seconds),
+                "consumption": [c1, c2, c3],
+                "production": [p1, p2, p3],
+            }
+            for seconds, c1, c2, c3, p1, p2, p3 in zip(
+                group["time"], *(group[channel] for channel in CHANNELS)
+            )
+        ]
+
+
+def columnar_group(rows: List[Dict]) -> Dict[str, List[int]]:
+    """
+    Converts parsed rows to the columns of COLUMNAR_SCHEMA.
+    """
+    group = {
+        "time": [(row["datetime"] - EPOCH) // timedelta(seconds=1) for row in rows]
+    }
+    values = zip(*(row["consumption"] + row["production"] for row in rows))
+    group.update(zip(CHANNELS, map(list, values)))
+    return group
+
+
+def export_columnar(
+    filename: str, output: str, chunk_rows: int = CHUNK_ROWS
+) -> int:
+    """
+    Converts a week CSV file into a compressed columnar file, one row group
+    per chunk_rows rows, and returns the number of rows. Timestamps are
+    delta-encoded.
+    """
+    return write_table(
+        output,
+        COLUMNAR_SCHEMA,
+        (columnar_group(rows) for rows in read_chunks(filename, chunk_rows)),
+        delta=("time",),
+    )
+
+
+@profiling.timed("parse")
+def read_data(filename: str) -> List[Dict]:
+    """
+    Reads the CSV file, or a columnar file written by export_columnar, and
+    returns a list of rows with parsed datetime and values.
+    """
+    rows: List[Dict] = []
+
+    for chunk in read_chunks(filename):
+        rows.extend(chunk)
+
+    return rows
+
+
+def add_rows(rollup: Rollup, rows: List[Dict]) -> None:
+    """
+    Folds parsed hourly rows into a rollup.
+    """
+    rollup.add_hours(
+        (day_number(row["datetime"].date()) for row in rows),
+        (row["consumption"] + row["production"] for row in rows),
+    )
+
+
+def build_rollup(rows: List[Dict]) -> Rollup:
+    """
+    Ingests hourly rows once into daily, weekly, monthly and yearly buckets.
+    """
+    rollup = Rollup(CHANNELS)
+    add_rows(rollup, rows)
+    return rollup
+
+
+def rollup_daily_totals(rollup: Rollup) -> Dict[date, Dict]:
+    """
+    Returns the daily buckets of a rollup as daily totals in Wh.
+    """
+    daily: Dict[date, Dict] = {}
+
+    for index in range(len(rollup)):
+        bucket = rollup.bucket("day", index)
+        daily[day_date(bucket.key)] = {
+            "consumption": list(bucket.sums[:3]),
+            "production": list(bucket.sums[3:]),
+        }
+
+    return daily
+
+
+@profiling.timed("aggregate")
+def calculate_daily_totals(rows: List[Dict]) -> Dict[date, Dict]:
+    """
+    Groups hourly rows by date and calculates daily totals in Wh.
+    """
+    return rollup_daily_totals(build_rollup(rows))
+
+
+@profiling.timed("parse")
+def read_array(filename: str) -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Reads the CSV file, or a columnar file written by export_columnar, into
+    NumPy arrays.
+    Returns the day of every row (datetime64[D]) and an (N, 6) int64 array
+    with consumption phases 1-3 followed by production phases 1-3.
+    """
+    if is_columnar(filename):
+        group = read_table(filename, ("time",) + CHANNELS)
+        profiling.add_rows(len(group["time"]))
+        return group_arrays(group)
+
+    with open(filename, "r", encoding="utf-8") as file:
+        next(file, None)  # skip header
+        days, values = parse_array_lines(file.readlines())
+    profiling.add_rows(len(days))
+
+    return days, values
+
+
+def parse_array_lines(lines: List[str]) -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Parses CSV data lines into the format of read_array. The day is the
+    local date the timestamp starts with, whatever its UTC offset, as in
+    read_data; the values are parsed straight to int64.
+    """
+    lines = [line for line in lines if line.strip()]
+    if not lines:
+        return np.empty(0, dtype="datetime64[D]"), np.empty((0, 6), dtype=np.int64)
+
+    days = np.array([line[:10] for line in lines], dtype="datetime64[D]")
+    values = np.loadtxt(
+        lines, delimiter=";", usecols=range(1, 7), dtype=np.int64, ndmin=2
+    )
+    return days, values
+
+
+def read_array_chunks(
+    filename: str, chunk_rows: int = CHUNK_ROWS
+) -> Iterator[Tuple["np.ndarray", "np.ndarray"]]:
+    """
+    Reads the CSV file in blocks of at most chunk_rows rows, each in the
+    format of read_array. A columnar file is read a row group at a time
+    instead.
+    """
+    if is_columnar(filename):
+        for group in read_groups(filename):
+            yield group_arrays(group)
+        return
+
+    with open(filename, "r", encoding="utf-8") as file:
+        next(file)  # skip header
+
+        while True:
+            lines = list(islice(file, chunk_rows))
+            if not lines:
+                return
+
+            days, values = parse_array_lines(lines)
+            if len(days) == 0:
+                continue
+            profiling.add_rows(len(days))
+
+            yield days, values
+
+
+def group_arrays(group: Dict[str, array]) -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Converts the columns of a columnar week file to the format of read_array.
+    """
+    seconds = np.frombuffer(group["time"], dtype=np.int64)
+    values = np.column_stack(
+        [np.frombuffer(group[channel], dtype=np.int64) for channel in CHANNELS]
+    )
+    return (
+        (seconds // 86400).astype("datetime64[D]"),
+        values.reshape(len(seconds), len(CHANNELS)),
+    )
+
+
+def add_group(rollup: Rollup, group: Dict[str, array]) -> None:
+    """
+    Folds a row group of a columnar week file into a rollup without NumPy;
+    the columns are aggregated with slices.
+    """
+    rollup.add_columns(
+        array("q", [seconds // 86400 for seconds in group["time"]]),
+        [group[channel] for channel in CHANNELS],
+    )
+
+
+def add_array_rows(rollup: Rollup, days: "np.ndarray", values: "np.ndarray") -> None:
+    """
+    Vectorised add_rows: the sums, minimums and maximums of each day's rows
+    are computed with np.add/minimum/maximum.reduceat.
+    """
+    if len(days) == 0:
+        return
+
+    order = np.argsort(days, kind="stable")
+    days = days[order]
+    values = values[order]
+
+    starts = np.flatnonzero(np.concatenate(([True], days[1:] != days[:-1])))
+    hours = np.diff(np.append(starts, len(days)))
+    sums = np.add.reduceat(values, starts, axis=0)
+    mins = np.minimum.reduceat(values, starts, axis=0)
+    maxs = np.maximum.reduceat(values, starts, axis=0)
+
+    for day, count, day_sums, day_mins, day_maxs in zip(
+        days[starts].tolist(),
+        hours.tolist(),
+        sums.tolist(),
+        mins.tolist(),
+        maxs.tolist(),
+    ):
+        rollup.add_day(day_number(day), count, day_sums, day_mins, day_maxs)
+
+
+def build_rollup_array(days: "np.ndarray", values: "np.ndarray") -> Rollup:
+    """
+    Vectorised build_rollup.
+    """
+    rollup = Rollup(CHANNELS)
+    add_array_rows(rollup, days, values)
+    return rollup
+
+
+@profiling.timed("aggregate")
+def calculate_daily_totals_array(
+    days: "np.ndarray", values: "np.ndarray"
+) -> Dict[date, Dict]:
+    """
+    Vectorised calculate_daily_totals.
+    Returns the same structure as calculate_daily_totals.
+    """
+    return rollup_daily_totals(build_rollup_array(days, values))
+
+
+def load_daily_totals(filename: str, chunk_rows: int = CHUNK_ROWS) -> Dict[date, Dict]:
+    """
+    Reads the CSV file and returns its daily totals.
+
+    The file is parsed chunk_rows rows at a time and every block is folded
+    into a rollup and dropped, so memory use grows with the number of days
+    but not with the number of rows held at once.
+    A columnar file is folded a row group at a time.
+    Uses NumPy when it is installed and the pure-Python path otherwise.
+    """
+    rollup = Rollup(CHANNELS)
+    columnar = is_columnar(filename)
+    if np is not None:
+        chunks = read_array_chunks(filename, chunk_rows)
+    elif columnar:
+        chunks = read_groups(filename)
+    else:
+        chunks = read_chunks(filename, chunk_rows)
+
+    while True:
+        with profiling.stage("parse"):
+            chunk = next(chunks, None)
+        if chunk is None:
+            break
+
+        with profiling.stage("aggregate"):
+            if np is not None:
+                add_array_rows(rollup, *chunk)
+            elif columnar:
+                add_group(rollup, chunk)
+            else:
+                add_rows(rollup, chunk)
+
+    return rollup_daily_totals(rollup)
+
+
+def wh_to_kwh(value_wh: int) -> float:
+    """
+    Converts watt-hours to kilowatt-hours.
+    """
+    return value_wh / 1000.0
+
+
+def format_kwh(value_kwh: float) -> str:
+    """
+    Formats kWh value with two decimals and decimal comma.
+    """
+    return f"{value_kwh:.2f}".replace(".", ",")
+
+
+def week_number_of(filename: str, daily_data: Dict[date, Dict]) -> int:
+    """
+    Returns the week number from a name like week42.csv, or the ISO week of
+    the first day in the file when the name does not contain one.
+    """
+    match = re.search(r"week(\d+)", os.path.basename(filename), re.IGNORECASE)
+    if match:
+        return int(match.group(1))
+
+    return min(daily_data).isocalendar()[1] if daily_data else 0
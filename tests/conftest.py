@@ -0,0 +1,23 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# The task scripts are run from their own directories, so their modules are
+# imported by plain name; the shared modules live in the common package.
+ROOT = Path(__file__).resolve().parent.parent
+for task in ("benchmarks", "TaskC", "TaskD", "TaskE", "TaskF", "TaskG"):
+    sys.path.insert(0, str(ROOT / task))
+sys.path.insert(0, str(ROOT))
+
+from generators import generate_reservations  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def generated_reservations(tmp_path_factory) -> str:
+    """
+    A reservations.txt file of 2000 generated rows.
+    """
+    filename = str(tmp_path_factory.mktemp("reservations") / "reservations.txt")
+    generate_reservations(filename, 2000)
+    return filename
@@ -0,0 +1,196 @@
+import random
+from datetime import date, datetime, time, timedelta
+
+from booking_conflicts import BookingIndex, IntervalTree, booking_interval, find_conflicts
+from task_g_class import Reservation
+
+
+def booking(booking_id, hour, duration, resource="Sauna", day=date(2025, 6, 1), minute=0):
+    return Reservation(
+        reservation_id=booking_id,
+        name=f"Booker {booking_id}",
+        email="booker@example.com",
+        phone="0400000000",
+        reservation_date=day,
+        reservation_time=time(hour, minute),
+        duration_hours=duration,
+        price=20.0,
+        confirmed=True,
+        reserved_resource=resource,
+        created_at=datetime(2025, 5, 1),
+    )
+
+
+def overlap(first, second) -> bool:
+    # Half-open intervals; an empty interval contains no time at all.
+    a_start, a_end = booking_interval(first)
+    b_start, b_end = booking_interval(second)
+    return (
+        first.reserved_resource == second.reserved_resource
+        and a_start < a_end and b_start < b_end
+        and a_start < b_end and b_start < a_end
+    )
+
+
+def pairs(conflicts) -> set:
+    return {frozenset((id(first), id(second))) for first, second in conflicts}
+
+
+def test_duplicate_ids_with_equal_ends():
+    # Same id, start and end: the heap used to compare the reservations.
+    first = booking(1, 10, 2)
+    second = booking(1, 10, 2)
+    third = booking(1, 11, 1)
+
+    conflicts = find_conflicts([first, second, third])
+
+    assert pairs(conflicts) == pairs([(first, second), (first, third), (second, third)])
+
+
+def test_zero_length_and_touching_bookings_do_not_conflict():
+    long = booking(1, 9, 4)
+    empty_inside = booking(2, 10, 0)
+    empty_at_start = booking(3, 9, 0)
+    touching = booking(4, 13, 1)
+    overlapping = booking(5, 12, 2)
+
+    conflicts = find_conflicts([long, empty_inside, empty_at_start, touching, overlapping])
+
+    assert pairs(conflicts) == pairs([(long, overlapping), (overlapping, touching)])
+
+
+def test_index_treats_zero_length_bookings_as_free():
+    long = booking(1, 9, 4)
+    empty = booking(2, 10, 0)
+    index = BookingIndex([long, empty])
+
+    assert index.conflicts_with(empty) == []
+    assert index.conflicts_with(long) == []
+    assert index.is_free("Sauna", date(2025, 6, 1), time(10), 0)
+    assert not index.is_free("Sauna", date(2025, 6, 1), time(10), 1)
+    assert index.is_free("Sauna", date(2025, 6, 1), time(13), 1)
+    assert index.cancel(2)
+    assert not index.cancel(2)
+
+
+def random_bookings(count: int, seed: int) -> list:
+    rng = random.Random(seed)
+    return [
+        booking(
+            i,
+            rng.randrange(7, 20),
+            rng.choice((0, 1, 1, 2, 3)),
+            resource=f"Room {rng.randrange(4)}",
+            day=date(2025, 6, 1) + timedelta(days=rng.randrange(3)),
+            minute=rng.choice((0, 30)),
+        )
+        for i in range(count)
+    ]
+
+
+def test_find_conflicts_matches_brute_force():
+    bookings = random_bookings(400, seed=1)
+    expected = [
+        (first, second)
+        for i, first in enumerate(bookings)
+        for second in bookings[i + 1:]
+        if overlap(first, second)
+    ]
+
+    conflicts = find_conflicts(bookings)
+
+    assert len(conflicts) == len(expected)
+    assert pairs(conflicts) == pairs(expected)
+
+
+def test_interval_tree_matches_brute_force():
+    rng = random.Random(3)
+    tree = IntervalTree(seed=5)
+    intervals = {}
+    for booking_id in range(300):
+        start = rng.randrange(1000)
+        end = start + rng.choice((0, 0, 5, 20, 60))
+        tree.insert(start, end, booking_id)
+        intervals[booking_id] = (start, end)
+    for booking_id in range(0, 300, 4):
+        assert tree.remove(intervals.pop(booking_id)[0], booking_id)
+    assert len(tree) == len(intervals)
+
+    for _ in range(500):
+        start = rng.randrange(1050)
+        end = start + rng.choice((0, 1, 10, 50))
+        expected = {
+            booking_id
+            for booking_id, (low, high) in intervals.items()
+            if start < end and low < high and low < end and start < high
+        }
+        assert set(tree.overlaps(start, end)) == expected
+        found = tree.any_overlap(start, end)
+        assert (found is None) == (not expected)
+        assert found is None or found in expected
+
+
+def test_interval_tree_random_operations_match_a_list():
+    rng = random.Random(11)
+    tree = IntervalTree(seed=13)
+    # Every interval in the tree, duplicates included.
+    intervals = []
+
+    for step in range(3000):
+        action = rng.random()
+        if action < 0.45 or not intervals:
+            # Copies of a (start, id) key have the same end, since remove
+            # cannot tell them apart.
+            start, booking_id = rng.randrange(500), rng.randrange(50)
+            interval = (start, start + (0, 1, 10, 40)[(start + booking_id) % 4], booking_id)
+            tree.insert(*interval)
+            intervals.append(interval)
+        elif action < 0.7:
+            interval = rng.choice(intervals)
+            assert tree.remove(interval[0], interval[2])
+            intervals.remove(interval)
+        elif action < 0.75:
+            missing = (rng.randrange(500), 50 + rng.randrange(10))
+            assert not tree.remove(*missing)
+        else:
+            start = rng.randrange(-10, 520)
+            end = start + rng.choice((0, 1, 5, 30, 100))
+            expected = sorted(
+                booking_id
+                for low, high, booking_id in intervals
+                if start < end and low < high and low < end and start < high
+            )
+            assert sorted(tree.overlaps(start, end)) == expected, step
+            found = tree.any_overlap(start, end)
+            assert (found is None) == (not expected)
+            assert found is None or found in expected
+        assert len(tree) == len(intervals)
+
+
+def test_booking_index_matches_scans_while_bookings_change():
+    rng = random.Random(17)
+    bookings = random_bookings(300, seed=2)
+    index = BookingIndex(bookings)
+    current = {booking.reservation_id: booking for booking in bookings}
+
+    for step in range(600):
+        if rng.random() < 0.3:
+            booking_id = rng.randrange(320)
+            assert index.cancel(booking_id) == (current.pop(booking_id, None) is not None)
+        elif rng.random() < 0.5:
+            # New ids, and ids already booked, which moves that booking.
+            replacement = random_bookings(1, seed=step)[0]
+            replacement.reservation_id = rng.randrange(320)
+            index.add(replacement)
+            current[replacement.reservation_id] = replacement
+
+        probe = random_bookings(1, seed=10_000 + step)[0]
+        probe.reservation_id = -1
+        others = [other for other in current.values() if overlap(probe, other)]
+        assert index.is_free(
+            probe.reserved_resource, probe.reservation_date,
+            probe.reservation_time, probe.duration_hours,
+        ) == (not others)
+        assert sorted(r.reservation_id for r in index.conflicts_with(probe)) == sorted(
+            r.reservation_id for r in others
+        )
@@ -0,0 +1,176 @@
+from array import array
+
+import pytest
+
+from conftest import ROOT
+
+from common import columnar, week_data
+from common.columnar import (
+    is_columnar, iter_groups, read_footer, read_table, write_table
+)
+
+SCHEMA = {"time": "q", "small": "q", "wide": "q", "count": "i"}
+
+
+def sample_groups():
+    return [
+        {
+            "time": [3600 * hour for hour in range(5)],
+            "small": [-3, 0, 7, 127, -128],
+            "wide": [1 << 40, -(1 << 40), 0, 1, -1],
+            "count": [1, 2, 3, 4, 5],
+        },
+        {
+            "time": [3600 * hour for hour in range(5, 8)],
+            "small": [300, -300, 0],
+            "wide": [2, 3, 4],
+            "count": [-70000, 0, 70000],
+        },
+    ]
+
+
+def test_round_trip(tmp_path):
+    filename = str(tmp_path / "data.ecol")
+    groups = sample_groups()
+
+    assert write_table(filename, SCHEMA, groups, delta=("time",)) == 8
+    assert is_columnar(filename)
+
+    table = read_table(filename)
+    for name, typecode in SCHEMA.items():
+        assert table[name].typecode == typecode
+        assert table[name].tolist() == groups[0][name] + groups[1][name]
+
+    assert [len(group["time"]) for group in iter_groups(filename)] == [5, 3]
+    assert read_footer(filename)["rows"] == 8
+
+
+def test_reads_only_requested_columns(tmp_path):
+    filename = str(tmp_path / "data.ecol")
+    write_table(filename, SCHEMA, sample_groups())
+
+    assert list(read_table(filename, ["count"])) == ["count"]
+    with pytest.raises(ValueError, match="no column missing"):
+        read_table(filename, ["missing"])
+
+
+def test_empty_file(tmp_path):
+    filename = str(tmp_path / "empty.ecol")
+
+    assert write_table(filename, SCHEMA, [], delta=("time",)) == 0
+    assert list(iter_groups(filename)) == []
+    assert read_table(filename) == {
+        name: array(typecode) for name, typecode in SCHEMA.items()
+    }
+
+
+def test_empty_groups_are_skipped(tmp_path):
+    filename = str(tmp_path / "data.ecol")
+    empty = {name: [] for name in SCHEMA}
+
+    assert write_table(filename, SCHEMA, [empty, sample_groups()[1], empty]) == 3
+    assert len(read_footer(filename)["groups"]) == 1
+
+
+def test_single_row(tmp_path):
+    filename = str(tmp_path / "one.ecol")
+    row = {"time": [1_700_000_000], "small": [-1], "wide": [1 << 62], "count": [0]}
+
+    assert write_table(filename, SCHEMA, [row], delta=("time",)) == 1
+    assert {
+        name: values.tolist() for name, values in read_table(filename).items()
+    } == row
+
+
+def test_corrupt_block_fails_checksum(tmp_path):
+    filename = tmp_path / "data.ecol"
+    write_table(str(filename), SCHEMA, sample_groups())
+    offset, length, _, _ = read_footer(str(filename))["groups"][0]["columns"]["wide"]
+
+    data = bytearray(filename.read_bytes())
+    data[offset + length // 2] ^= 0xFF
+    filename.write_bytes(bytes(data))
+
+    # Columns that are not read are not checked.
+    assert len(read_table(str(filename), ["count"])["count"]) == 8
+    with pytest.raises(ValueError, match="column wide of row group 0"):
+        read_table(str(filename))
+
+
+def test_corrupt_footer_fails_checksum(tmp_path):
+    filename = tmp_path / "data.ecol"
+    write_table(str(filename), SCHEMA, sample_groups())
+
+    data = bytearray(filename.read_bytes())
+    data[-columnar.TRAILER.size - 5] ^= 0xFF
+    filename.write_bytes(bytes(data))
+
+    with pytest.raises(ValueError, match="footer checksum"):
+        read_footer(str(filename))
+
+
+@pytest.mark.parametrize("keep", [0, 4, 10, -1])
+def test_truncated_file(tmp_path, keep):
+    filename = tmp_path / "data.ecol"
+    write_table(str(filename), SCHEMA, sample_groups())
+    data = filename.read_bytes()
+    filename.write_bytes(data[:keep])
+
+    with pytest.raises(ValueError):
+        read_table(str(filename))
+
+
+def test_not_columnar(tmp_path):
+    filename = tmp_path / "data.csv"
+    filename.write_text("Time;Value\n")
+
+    assert not is_columnar(str(filename))
+    assert not is_columnar(str(tmp_path / "missing.ecol"))
+    with pytest.raises(ValueError, match="not a columnar file"):
+        read_footer(str(filename))
+
+
+def test_parquet_needs_pyarrow(tmp_path, monkeypatch):
+    monkeypatch.setattr(columnar, "pq", None)
+    filename = str(tmp_path / "data.parquet")
+
+    assert is_columnar(filename)
+    with pytest.raises(RuntimeError, match="pyarrow"):
+        write_table(filename, SCHEMA, sample_groups())
+    with pytest.raises(RuntimeError, match="pyarrow"):
+        read_table(filename)
+
+
+def test_parquet_round_trip(tmp_path):
+    pytest.importorskip("pyarrow")
+    filename = str(tmp_path / "data.parquet")
+    groups = sample_groups()
+
+    assert write_table(filename, SCHEMA, groups, delta=("time",)) == 8
+    table = read_table(filename)
+    for name, typecode in SCHEMA.items():
+        assert table[name].typecode == typecode
+        assert table[name].tolist() == groups[0][name] + groups[1][name]
+
+
+def test_week_export_matches_csv(tmp_path):
+    source = str(ROOT / "TaskD" / "week42.csv")
+    output = str(tmp_path / "week42.ecol")
+
+    rows = week_data.read_data(source)
+    assert week_data.export_columnar(source, output, chunk_rows=50) == len(rows)
+    assert week_data.read_data(output) == rows
+    assert week_data.load_daily_totals(output) == week_data.load_daily_totals(source)
+
+
+def test_energy_export_matches_csv(tmp_path):
+    import energy_columns
+
+    source = str(ROOT / "TaskF" / "2025.csv")
+    output = str(tmp_path / "2025.ecol")
+
+    columns = energy_columns.read_columns(source)
+    assert energy_columns.export_columnar(source, output) == len(columns)
+    exported = energy_columns.read_columns(output)
+    for name in energy_columns.COLUMNS:
+        assert getattr(exported, name) == getattr(columns, name)
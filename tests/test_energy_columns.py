@@ -0,0 +1,163 @@
+import math
+from datetime import datetime, timedelta
+
+import pytest
+
+import baselines
+import task_f
+from common.columnar import write_table
+from conftest import ROOT
+from energy_columns import (
+    COLUMNS, export_columnar, parse_lines, read_column_chunks, read_columns,
+    utc_offset,
+)
+from energy_index import EnergyIndex
+from generators import generate_energy_csv
+
+HEADER = "Time; Consumption (net) kWh; Production (net) kWh; Daily average temperature\n"
+
+# Every timestamp layout the reader accepts, including half-hour zones.
+STAMPS = [
+    "2025-03-30T00:00:00.000+02:00",
+    "2025-03-30T01:00:00+02:00",
+    "2025-03-30T02:00+02:00",
+    "2025-03-30T04:00:00.000+03:00",
+    "2025-03-30T05:00:00Z",
+    "2025-03-30T06:00:00.000Z",
+    "2025-03-30T00:00:00+05:30",
+    "2025-03-30T23:00:00+05:30",
+    "2025-03-31T00:00:00.000+05:45",
+    "2025-03-30T00:00:00-03:30",
+    "2025-03-30T23:00:00-03:30",
+    "2025-03-30T22:00:00-09:00",
+    "2025-03-30T07:00:00+0200",
+    "2025-03-30T08:00:00+02",
+]
+
+
+def write_csv(tmp_path, stamps) -> str:
+    filename = tmp_path / "energy.csv"
+    lines = [
+        f"{stamp};{index},{index:03d};0,{index * 7 % 1000:03d};-{index},5\n"
+        for index, stamp in enumerate(stamps)
+    ]
+    filename.write_text(HEADER + "".join(lines), encoding="utf-8")
+    return str(filename)
+
+
+@pytest.mark.parametrize("stamp", STAMPS)
+def test_utc_offset_matches_fromisoformat(stamp):
+    expected = datetime.fromisoformat(stamp).utcoffset() // timedelta(minutes=1)
+    assert utc_offset(stamp.encode("ascii")) == expected
+
+
+@pytest.mark.parametrize("stamp", ["2025-03-30T00:00:00", "2025-03-30T00:00:00.000", "2025-03-30"])
+def test_utc_offset_needs_an_offset(stamp):
+    with pytest.raises(ValueError):
+        utc_offset(stamp.encode("ascii"))
+
+
+def test_columns_match_fromisoformat(tmp_path):
+    columns = read_columns(write_csv(tmp_path, STAMPS))
+
+    assert len(columns) == len(STAMPS)
+    for row, stamp in enumerate(STAMPS):
+        moment = datetime.fromisoformat(stamp)
+        assert columns.offsets[row] == moment.utcoffset() // timedelta(minutes=1)
+        assert columns.hours[row] == math.floor(moment.timestamp() / 3600)
+        assert columns.day_to_date(columns.local_day(row)) == moment.date()
+        assert columns.consumption[row] == row * 1000 + row
+        assert columns.temperature[row] == -(row * 10 + 5)
+
+    rows = task_f.columnar_rows(columns)
+    assert [row["datetime"] for row in rows] == [datetime.fromisoformat(s) for s in STAMPS]
+    assert [row["date"] for row in rows] == [datetime.fromisoformat(s).date() for s in STAMPS]
+
+
+def test_every_reader_parses_the_same(tmp_path):
+    filename = write_csv(tmp_path, STAMPS * 5)
+    columns = read_columns(filename)
+    lines = open(filename, "rb").read().splitlines(keepends=True)[1:]
+
+    parsed = parse_lines(lines[:3] + [b"\n", b"   \n"] + lines[3:])
+    chunks = list(read_column_chunks(filename, 4))
+    assert [len(chunk) for chunk in chunks] == [4] * 17 + [2]
+
+    columnar = str(tmp_path / "energy.ecol")
+    assert export_columnar(filename, columnar, 7) == len(columns)
+    stored = read_columns(columnar)
+
+    for name in COLUMNS:
+        expected = getattr(columns, name)
+        assert getattr(parsed, name) == expected
+        assert sum((getattr(chunk, name).tolist() for chunk in chunks), []) == expected.tolist()
+        assert getattr(stored, name) == expected
+
+
+def test_index_days_match_fromisoformat(tmp_path):
+    filename = write_csv(tmp_path, STAMPS)
+    index = EnergyIndex(read_columns(filename))
+    rows = task_f.read_data(filename)
+
+    for day in sorted({row["date"] for row in rows}):
+        assert index.range_totals(day, day) == task_f.range_totals(rows, day, day)
+
+
+def test_columnar_file_with_hour_offsets_is_rejected(tmp_path):
+    filename = str(tmp_path / "old.ecol")
+    schema = {name: "q" for name in COLUMNS}
+    schema["offsets"] = "b"
+    write_table(filename, schema, [{name: [0] for name in COLUMNS}])
+
+    with pytest.raises(ValueError, match="export it again"):
+        read_columns(filename)
+
+
+def test_timestamp_without_offset_is_an_error(tmp_path):
+    with pytest.raises(ValueError, match="without a UTC offset"):
+        read_columns(write_csv(tmp_path, ["2025-03-30T00:00:00"]))
+
+
+@pytest.mark.parametrize("text", ["", HEADER, HEADER.rstrip("\n")])
+def test_file_without_rows(tmp_path, text):
+    filename = tmp_path / "energy.csv"
+    filename.write_text(text, encoding="utf-8")
+
+    assert len(read_columns(str(filename))) == 0
+    assert sum(len(chunk) for chunk in read_column_chunks(str(filename))) == 0
+    assert task_f.load_index(str(filename)).year_totals() == (0.0, 0.0, 0.0)
+
+
+@pytest.mark.parametrize("generated", [False, True])
+def test_mmap_reader_matches_baseline(tmp_path, generated):
+    filename = str(ROOT / "TaskF" / "2025.csv")
+    if generated:
+        # About two years, ending in the middle of a day.
+        filename = str(tmp_path / "energy.csv")
+        generate_energy_csv(filename, 24 * 700 + 5)
+    columns = read_columns(filename)
+    expected = baselines.read_energy(filename)
+
+    assert list(columns.hours) == [
+        math.floor(row["datetime"].timestamp() / 3600) for row in expected
+    ]
+    assert list(columns.offsets) == [
+        row["datetime"].utcoffset() // timedelta(minutes=1) for row in expected
+    ]
+    assert list(columns.consumption) == [round(row["consumption"] * 1000) for row in expected]
+    assert list(columns.production) == [round(row["production"] * 1000) for row in expected]
+    assert list(columns.temperature) == [round(row["temperature"] * 10) for row in expected]
+
+
+@pytest.mark.parametrize("newline", ["\n", "\r\n"])
+def test_mmap_reader_line_endings(tmp_path, newline):
+    lines = (ROOT / "TaskF" / "2025.csv").read_text(encoding="utf-8").splitlines()[:50]
+    filename = tmp_path / "energy.csv"
+    # The last line has no line ending.
+    filename.write_bytes(newline.join(lines).encode("utf-8"))
+
+    columns = read_columns(str(filename))
+    expected = parse_lines(line.encode("utf-8") for line in lines[1:])
+    assert len(columns) == 49
+    for name in COLUMNS:
+        assert getattr(columns, name) == getattr(expected, name)
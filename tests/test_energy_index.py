@@ -0,0 +1,122 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+import baselines
+import task_f
+from conftest import ROOT
+from energy_columns import parse_lines, read_column_chunks, read_columns
+from energy_index import EnergyIndex
+from generators import generate_energy_csv
+
+ENERGY_CSV = str(ROOT / "TaskF" / "2025.csv")
+
+
+@pytest.fixture(scope="module")
+def two_years(tmp_path_factory) -> str:
+    """
+    About two years of generated hours, ending in the middle of a day.
+    """
+    filename = str(tmp_path_factory.mktemp("energy") / "energy.csv")
+    generate_energy_csv(filename, 24 * 700 + 5)
+    return filename
+
+
+def random_ranges(first: date, last: date, count: int, seed: int) -> list:
+    rng = random.Random(seed)
+    span = (last - first).days
+    ranges = [
+        (first, last),
+        (first, first),
+        (last, last),
+        (first - timedelta(days=30), first - timedelta(days=1)),
+        (last + timedelta(days=1), last + timedelta(days=30)),
+        (first - timedelta(days=3), first + timedelta(days=3)),
+        (last, first),
+    ]
+    for _ in range(count):
+        start = first + timedelta(days=rng.randrange(-5, span + 5))
+        ranges.append((start, start + timedelta(days=rng.randrange(-1, 90))))
+    return ranges
+
+
+def check_index(index: EnergyIndex, filename: str, seed: int) -> None:
+    data = baselines.read_energy(filename)
+    days = sorted({row["date"] for row in data})
+    ranges = random_ranges(days[0], days[-1], 300, seed)
+
+    for (start, end), expected in zip(ranges, baselines.many_range_totals(data, ranges)):
+        assert baselines.same_totals(index.range_totals(start, end), expected), (start, end)
+
+    years = sorted({day.year for day in days})
+    for month in range(1, 13):
+        assert baselines.same_totals(
+            index.month_totals(month), baselines.month_totals(data, month)
+        )
+        for year in years + [years[-1] + 1]:
+            assert baselines.same_totals(
+                index.month_totals(month, year), baselines.month_totals(data, month, year)
+            )
+
+    assert baselines.same_totals(index.year_totals(), baselines.year_totals(data))
+    for year in years + [years[0] - 1]:
+        assert baselines.same_totals(
+            index.year_totals(year),
+            baselines.year_totals([row for row in data if row["date"].year == year]),
+        )
+    assert index.years() == years
+
+
+@pytest.mark.parametrize("filename", [ENERGY_CSV, "two_years"])
+def test_index_matches_baseline_scan(filename, request):
+    if filename == "two_years":
+        filename = request.getfixturevalue("two_years")
+    check_index(EnergyIndex(read_columns(filename)), filename, seed=1)
+
+
+def test_chunked_index_matches_baseline_scan(two_years):
+    # 50-row chunks end in the middle of days.
+    check_index(task_f.load_index(two_years, chunk_rows=50), two_years, seed=2)
+    check_index(
+        EnergyIndex.from_chunks(read_column_chunks(two_years, 1)), two_years, seed=3
+    )
+
+
+def test_appended_hours_after_queries(two_years):
+    with open(two_years, "rb") as f:
+        lines = f.read().splitlines(keepends=True)
+    index = EnergyIndex(parse_lines(lines[1:1000]))
+    # Queries build the prefix sums and the month and year buckets, which
+    # the appends below then have to keep current.
+    index.range_totals(date(2025, 1, 1), date(2026, 12, 31))
+    index.month_totals(1)
+    index.year_totals(2025)
+
+    for start in range(1000, len(lines), 500):
+        index.extend(parse_lines(lines[start:start + 500]))
+
+    assert len(index) == len(lines) - 1
+    check_index(index, two_years, seed=4)
+
+
+def test_scan_and_index_agree_on_row_lists(two_years):
+    rows = task_f.read_data(two_years)
+    index = task_f.load_index(two_years)
+    data = baselines.read_energy(two_years)
+
+    for start, end in random_ranges(data[0]["date"], data[-1]["date"], 50, seed=5):
+        assert task_f.range_totals(rows, start, end) == index.range_totals(start, end)
+    for month in range(1, 13):
+        assert task_f.month_totals(rows, month) == index.month_totals(month)
+    assert task_f.year_totals(rows) == index.year_totals()
+
+
+def test_empty_index():
+    index = EnergyIndex()
+    assert len(index) == 0
+    assert index.years() == []
+    assert index.range_totals(date(2025, 1, 1), date(2025, 12, 31)) == (0.0, 0.0, 0.0)
+    assert index.month_totals(1) == (0.0, 0.0, 0.0)
+    assert index.month_totals(1, 2025) == (0.0, 0.0, 0.0)
+    assert index.year_totals() == (0.0, 0.0, 0.0)
@@ -0,0 +1,156 @@
+import os
+from datetime import date
+
+import pytest
+
+import baselines
+import task_f
+from energy_columns import read_columns
+from energy_store import EnergyStore
+from generators import generate_energy_csv
+
+
+@pytest.fixture
+def energy_csv(tmp_path) -> str:
+    filename = str(tmp_path / "energy.csv")
+    generate_energy_csv(filename, 24 * 75)
+    return filename
+
+
+@pytest.fixture
+def store(tmp_path, energy_csv) -> EnergyStore:
+    store = EnergyStore(str(tmp_path / "store"))
+    store.import_csv("home-1", energy_csv)
+    return store
+
+
+@pytest.mark.parametrize("site", ["", "..", "a/b", "../escape", "a b", "koti.fi"])
+def test_invalid_site_names_are_rejected(store, energy_csv, site):
+    with pytest.raises(ValueError, match="Invalid site name"):
+        store.import_csv(site, energy_csv)
+    with pytest.raises(ValueError, match="Invalid site name"):
+        store.months(site)
+    with pytest.raises(ValueError, match="Invalid site name"):
+        store.load(site, [(2025, 1)])
+    with pytest.raises(ValueError, match="Invalid site name"):
+        store.resolve_site(site)
+
+
+def test_store_round_trip(store, energy_csv):
+    assert store.sites() == ["home-1"]
+    assert store.months("home-1") == [(2025, 1), (2025, 2), (2025, 3)]
+
+    stored = store.load_year("home-1", 2025)
+    columns = read_columns(energy_csv)
+    for name in ("hours", "offsets", "consumption", "production", "temperature"):
+        assert getattr(stored, name) == getattr(columns, name)
+
+
+def test_months_skip_stray_entries(store):
+    site_dir = os.path.join(store.root, "home-1")
+    # A digit-only file next to the years, a directory named like a
+    # partition and an unrelated file.
+    open(os.path.join(site_dir, "2024"), "w").close()
+    os.makedirs(os.path.join(site_dir, "2025", "04.bin"))
+    open(os.path.join(site_dir, "2025", "notes.txt"), "w").close()
+
+    assert store.months("home-1") == [(2025, 1), (2025, 2), (2025, 3)]
+
+
+def test_site_queries_need_a_store(store, energy_csv):
+    index = task_f.load_index(energy_csv)
+
+    with pytest.raises(ValueError, match="site= needs"):
+        task_f.answer_query(index, "yearly site=home-1")
+
+    store_report = task_f.answer_query(store, "yearly site=home-1")
+    assert store_report[1] == "Report for the year: 2025 (home-1)"
+    assert store_report[2:] == task_f.answer_query(index, "yearly")[2:]
+    assert task_f.range_totals(store, date(2025, 2, 1), date(2025, 2, 28)) == (
+        task_f.range_totals(index, date(2025, 2, 1), date(2025, 2, 28))
+    )
+
+
+@pytest.fixture
+def two_years(tmp_path) -> str:
+    filename = str(tmp_path / "two_years.csv")
+    generate_energy_csv(filename, 24 * 400 + 7)
+    return filename
+
+
+def check_store_totals(store: EnergyStore, site: str, filename: str) -> None:
+    data = baselines.read_energy(filename)
+    months = sorted({(row["date"].year, row["date"].month) for row in data})
+    assert store.months(site) == months
+
+    for year, month in months:
+        assert baselines.same_totals(
+            task_f.month_totals(store, month, year, site),
+            baselines.month_totals(data, month, year),
+        )
+    for year in store.years(site):
+        assert baselines.same_totals(
+            task_f.year_totals(store, year, site),
+            baselines.year_totals([row for row in data if row["date"].year == year]),
+        )
+    ranges = [
+        (date(2024, 12, 1), date(2025, 1, 1)),
+        (date(2025, 3, 30), date(2025, 4, 2)),
+        (date(2025, 12, 20), date(2026, 1, 10)),
+        (date(2026, 2, 1), date(2026, 3, 1)),
+    ]
+    for (start, end), expected in zip(ranges, baselines.many_range_totals(data, ranges)):
+        assert baselines.same_totals(task_f.range_totals(store, start, end, site), expected)
+
+
+def test_store_totals_match_baseline(tmp_path, two_years):
+    store = EnergyStore(str(tmp_path / "store"))
+    store.import_csv("home", two_years)
+    check_store_totals(store, "home", two_years)
+
+
+def test_overlapping_imports_keep_one_row_per_hour(tmp_path, two_years):
+    with open(two_years, encoding="utf-8") as f:
+        header, *lines = f.readlines()
+    # Both halves contain the hours around the split, which is mid-month.
+    split = 24 * 200 + 11
+    first, second = tmp_path / "first.csv", tmp_path / "second.csv"
+    first.write_text(header + "".join(lines[:split + 30]), encoding="utf-8")
+    second.write_text(header + "".join(lines[split - 30:]), encoding="utf-8")
+
+    store = EnergyStore(str(tmp_path / "store"))
+    store.import_csv("home", str(second))
+    store.import_csv("home", str(first))
+
+    stored = store.load_year("home")
+    columns = read_columns(two_years)
+    for name in ("hours", "offsets", "consumption", "production", "temperature"):
+        assert getattr(stored, name) == getattr(columns, name)
+    check_store_totals(store, "home", two_years)
+
+
+def test_reimported_hour_replaces_the_stored_one(tmp_path, energy_csv):
+    store = EnergyStore(str(tmp_path / "store"))
+    store.import_csv("home", energy_csv)
+    with open(energy_csv, encoding="utf-8") as f:
+        header, *lines = f.readlines()
+
+    stamp = lines[100].split(";")[0]
+    correction = tmp_path / "correction.csv"
+    correction.write_text(f"{header}{stamp};9,999;1,000;-40,0\n", encoding="utf-8")
+    store.import_csv("home", str(correction))
+
+    lines[100] = f"{stamp};9,999;1,000;-40,0\n"
+    expected = tmp_path / "expected.csv"
+    expected.write_text(header + "".join(lines), encoding="utf-8")
+    check_store_totals(store, "home", str(expected))
+
+
+def test_sites_are_independent(tmp_path, energy_csv, two_years):
+    store = EnergyStore(str(tmp_path / "store"))
+    store.import_csv("short", energy_csv)
+    store.import_csv("long", two_years)
+
+    assert store.sites() == ["long", "short"]
+    check_store_totals(store, "short", energy_csv)
+    check_store_totals(store, "long", two_years)
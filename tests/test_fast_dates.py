@@ -0,0 +1,42 @@
+from datetime import date, datetime
+
+import pytest
+
+from common.fast_dates import parse_date
+
+
+@pytest.mark.parametrize("text", [
+    "2025-10-06",
+    "2025-10-06T00:00:00",
+    "2025-10-06T13:00",
+    "2025-10-06 13:00:00",
+    "2025-10-06T13:00:00.000+02:00",
+    "2025-10-06T13:00:00Z",
+])
+def test_accepted_dates_match_fromisoformat(text):
+    expected = datetime.fromisoformat(text).date()
+    # The second call is answered from the cache.
+    assert parse_date(text) == expected == date(2025, 10, 6)
+    assert parse_date(text) == expected
+
+
+@pytest.mark.parametrize("text", [
+    "2025-10-06x",
+    "2025-10-06 ",
+    "2025-10-06Z",
+    "2025-10-06T",
+    "2025-10-06T25:00",
+    "2025-10-06T13:00:00 trailing",
+    "20251006",
+    "2025-W41-1",
+    "2025-02-30",
+    "2025-10-6",
+    "",
+])
+def test_rejected_dates(text):
+    # Trailing text is rejected even when the date itself is already cached.
+    parse_date("2025-10-06")
+    with pytest.raises(ValueError):
+        parse_date(text)
+    with pytest.raises(ValueError):
+        parse_date(text)
@@ -0,0 +1,92 @@
+import asyncio
+
+import ingest_server
+from ingest_server import IngestServer
+
+LINE = "7|Snufkin Harbour|snufkin@example.fi|0401234567|2025-06-01|09:30|3|12.50|True|Sauna|2025-05-01 12:00:00\n"
+
+
+async def exchange(
+    server: IngestServer, payload: bytes, replies: int, eof: bool = False
+) -> list[str]:
+    port = await server.start("127.0.0.1", 0)
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(payload)
+    if eof:
+        writer.write_eof()
+    await writer.drain()
+    answers = [
+        (await asyncio.wait_for(reader.readline(), 5)).decode("utf-8").strip()
+        for _ in range(replies)
+    ]
+    writer.close()
+    await server.stop()
+    return answers
+
+
+def test_batches_are_acknowledged():
+    server = IngestServer()
+    payload = (LINE * 3 + "\n" + "broken line\n" + "\n" + "STATS\n").encode("utf-8")
+
+    answers = asyncio.run(exchange(server, payload, 3))
+
+    assert answers[:2] == ["OK 3", "OK 0"]
+    assert '"reservations": 3' in answers[2]
+    assert '"errors": 1' in answers[2]
+
+
+def test_overlong_line_is_answered_and_skipped():
+    server = IngestServer()
+    long_line = b"x" * (ingest_server.LINE_LIMIT * 3) + b"\n"
+    payload = long_line + (LINE + "\n").encode("utf-8")
+
+    answers = asyncio.run(exchange(server, payload, 2))
+
+    assert answers == ["ERROR line too long", "OK 1"]
+    assert server.errors == 1
+    assert server.aggregates.total == 1
+
+
+def test_invalid_utf8_line_is_answered_and_skipped():
+    server = IngestServer()
+    payload = (
+        LINE.encode("utf-8")
+        + b"7|Snufkin \xff|x@example.fi||2025-06-01|09:30|1|1.0|True|Sauna|2025-05-01 12:00:00\n"
+        + (LINE + "\n" + "STATS\n").encode("utf-8")
+    )
+
+    answers = asyncio.run(exchange(server, payload, 3))
+
+    # The line before the bad one is still in the batch.
+    assert answers[:2] == ["ERROR invalid utf-8", "OK 2"]
+    assert '"errors": 1' in answers[2]
+    assert server.aggregates.total == 2
+
+
+def test_invalid_utf8_at_end_of_input_still_flushes_the_batch():
+    server = IngestServer()
+    payload = LINE.encode("utf-8") + b"\xff\xfe"
+
+    answers = asyncio.run(exchange(server, payload, 2, eof=True))
+
+    assert answers == ["ERROR invalid utf-8", "OK 1"]
+    assert server.errors == 1
+
+
+def test_failed_batch_is_answered_and_server_keeps_going(monkeypatch):
+    server = IngestServer()
+    ingest_batch = server.ingest_batch
+    calls = []
+
+    def failing_once(lines):
+        calls.append(lines)
+        if len(calls) == 1:
+            raise RuntimeError("disk full")
+        return ingest_batch(lines)
+
+    monkeypatch.setattr(server, "ingest_batch", failing_once)
+    payload = (LINE + "\n" + LINE + "\n").encode("utf-8")
+
+    answers = asyncio.run(exchange(server, payload, 2))
+
+    assert answers == ["ERROR disk full", "OK 1"]
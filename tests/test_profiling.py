@@ -0,0 +1,134 @@
+import json
+import os
+import subprocess
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from common import profiling
+from conftest import ROOT
+
+# A run that times one stage of each kind and counts some rows.
+SCRIPT = """
+from common import profiling
+
+profiling.start("demo")
+with profiling.stage("read"):
+    profiling.add_rows(5)
+
+@profiling.timed("parse")
+def parse():
+    pass
+
+parse()
+"""
+
+
+def run(argv=(), env_value=None, cwd=ROOT) -> subprocess.CompletedProcess:
+    env = dict(os.environ)
+    env.pop("TASK_PROFILE", None)
+    if env_value is not None:
+        env["TASK_PROFILE"] = env_value
+    env["PYTHONPATH"] = str(ROOT)
+    return subprocess.run(
+        [sys.executable, "-c", SCRIPT, *argv],
+        cwd=cwd, env=env, capture_output=True, text=True, check=True,
+    )
+
+
+def check_line(line: str, args: list) -> None:
+    record = json.loads(line)
+    assert sorted(record) == [
+        "args", "rows", "script", "seconds", "stages", "strptime_calls", "time",
+        "tracemalloc_peak_bytes",
+    ]
+    assert record["script"] == "demo"
+    assert record["args"] == args
+    assert record["rows"] == 5
+    assert sorted(record["stages"]) == ["parse", "read"]
+
+
+@pytest.fixture
+def enabled(monkeypatch):
+    """
+    Profiling switched on in this process, with a clock that moves one
+    second per reading and no stages timed yet.
+    """
+    clock = iter(range(1000))
+    monkeypatch.setattr(profiling, "ENABLED", True)
+    monkeypatch.setattr(profiling, "time", SimpleNamespace(perf_counter=lambda: next(clock)))
+    monkeypatch.setattr(profiling, "_stages", {})
+    monkeypatch.setattr(profiling, "_nested", [])
+
+
+def test_disabled_hooks_change_nothing(monkeypatch):
+    monkeypatch.setattr(profiling, "ENABLED", False)
+
+    def parse():
+        pass
+
+    assert profiling.timed("parse")(parse) is parse
+    assert profiling.stage("read") is profiling.stage("write")
+    with pytest.raises(ValueError, match="unknown profiling stage"):
+        profiling.timed("load")
+
+
+def test_nested_stage_counts_only_towards_itself(enabled):
+    @profiling.timed("parse")
+    def parse():
+        with profiling.stage("aggregate"):
+            pass
+
+    with profiling.stage("render"):
+        parse()
+        parse()
+
+    # Every stage reads the clock twice: aggregate takes 1 s per call, parse
+    # 3 s per call including the aggregate, render 9 s including both parses.
+    assert profiling._stages == {"aggregate": 2, "parse": 4, "render": 3}
+
+
+@pytest.mark.parametrize("value", ["1", "true", "YES", " on "])
+def test_true_environment_value_writes_to_stderr(value):
+    result = run(env_value=value)
+    lines = result.stderr.splitlines()
+    assert len(lines) == 1
+    check_line(lines[0], [])
+
+
+@pytest.mark.parametrize("value", [None, "", "0", "false", "No", "off"])
+def test_false_environment_value_writes_nothing(value):
+    assert run(["-x"], env_value=value).stderr == ""
+
+
+@pytest.mark.parametrize("value", [None, "0"])
+def test_profile_argument_writes_to_stderr(value):
+    lines = run(["--profile", "-x"], env_value=value).stderr.splitlines()
+    assert len(lines) == 1
+    check_line(lines[0], ["-x"])
+
+
+def test_other_environment_value_is_a_file_to_append_to(tmp_path):
+    target = tmp_path / "profile.jsonl"
+    for _ in range(2):
+        assert run(env_value=str(target)).stderr == ""
+
+    lines = target.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 2
+    for line in lines:
+        check_line(line, [])
+
+
+def test_task_script_reports_known_stages():
+    env = dict(os.environ)
+    env.pop("TASK_PROFILE", None)
+    result = subprocess.run(
+        [sys.executable, "task_d.py", "--profile"],
+        cwd=ROOT / "TaskD", env=env, capture_output=True, text=True, check=True,
+    )
+    (line,) = result.stderr.splitlines()
+    record = json.loads(line)
+    assert record["script"] == "task_d"
+    assert record["rows"] == 168
+    assert set(record["stages"]) <= set(profiling.STAGES)
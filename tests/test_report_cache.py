@@ -0,0 +1,148 @@
+import json
+from datetime import date, timedelta
+
+import pytest
+
+import baselines
+import report_cache
+import task_f
+from energy_store import EnergyStore
+from generators import generate_energy_csv
+from report_cache import CachedData, ReportCache
+
+
+@pytest.fixture
+def energy_csv(tmp_path) -> str:
+    filename = str(tmp_path / "energy.csv")
+    generate_energy_csv(filename, 24 * 75)
+    return filename
+
+
+def test_store_queries_read_only_the_generation(tmp_path, energy_csv, monkeypatch):
+    store = EnergyStore(str(tmp_path / "store"))
+    store.import_csv("home", energy_csv)
+    data = CachedData(store, ReportCache(), store.root)
+
+    def no_walk(*args):
+        raise AssertionError("every partition was checked")
+
+    monkeypatch.setattr(report_cache, "dataset_version", no_walk)
+    first = task_f.month_totals(data, 2, 2025, "home")
+    assert task_f.month_totals(data, 2, 2025, "home") == first
+    assert (data.cache.hits, data.cache.misses) == (1, 1)
+
+
+def test_import_invalidates_store_totals(tmp_path, energy_csv):
+    store = EnergyStore(str(tmp_path / "store"))
+    store.import_csv("home", energy_csv)
+    data = CachedData(store, ReportCache(), store.root)
+    before = task_f.range_totals(data, date(2025, 3, 1), date(2025, 3, 31), "home")
+    generation = store.generation("home")
+
+    longer = str(tmp_path / "longer.csv")
+    generate_energy_csv(longer, 24 * 95, seed=7)
+    store.import_csv("home", longer)
+
+    assert store.generation("home") != generation
+    after = task_f.range_totals(data, date(2025, 3, 1), date(2025, 3, 31), "home")
+    assert after != before
+    assert after == task_f.range_totals(
+        task_f.load_index(longer), date(2025, 3, 1), date(2025, 3, 31)
+    )
+    assert data.cache.hits == 0
+
+
+def test_store_without_generation_falls_back_to_partitions(tmp_path, energy_csv):
+    store = EnergyStore(str(tmp_path / "store"))
+    store.import_csv("home", energy_csv)
+    (tmp_path / "store" / "home" / "generation").unlink()
+    data = CachedData(store, ReportCache(), store.root)
+
+    assert store.generation("home") is None
+    assert data.version("home") == report_cache.dataset_version(store.root, "home")
+
+
+@pytest.mark.parametrize("content", [
+    "",
+    "{not json",
+    "[]",
+    '{"version": 0, "entries": []}',
+    '{"version": 1, "entries": {}}',
+])
+def test_unreadable_cache_file_is_an_empty_cache(tmp_path, content):
+    (tmp_path / "cache.json").write_text(content, encoding="utf-8")
+
+    cache = ReportCache(str(tmp_path / "cache.json"))
+    assert cache.stats() == {"hits": 0, "misses": 0, "entries": 0}
+
+
+def test_cached_totals_match_baseline_across_runs(tmp_path, energy_csv):
+    data = baselines.read_energy(energy_csv)
+    first = date(2025, 1, 1)
+    ranges = [
+        (first + timedelta(days=start), first + timedelta(days=start + length))
+        for start, length in ((0, 0), (3, 20), (40, 60), (70, 10))
+    ]
+    cache_file = str(tmp_path / "cache.json")
+
+    for run in range(2):
+        cache = ReportCache(cache_file)
+        cached = CachedData(task_f.load_index(energy_csv), cache, energy_csv)
+        for _ in range(2):
+            for (start, end), expected in zip(ranges, baselines.many_range_totals(data, ranges)):
+                assert baselines.same_totals(task_f.range_totals(cached, start, end), expected)
+            for month in (1, 2, 3, 4):
+                assert baselines.same_totals(
+                    task_f.month_totals(cached, month), baselines.month_totals(data, month)
+                )
+            assert baselines.same_totals(task_f.year_totals(cached), baselines.year_totals(data))
+        cache.save()
+        # The second run answers everything from the saved file.
+        assert cache.misses == (9 if run == 0 else 0)
+
+
+def test_changed_file_is_not_answered_from_the_cache(tmp_path, energy_csv):
+    cache_file = str(tmp_path / "cache.json")
+    cache = ReportCache(cache_file)
+    task_f.year_totals(CachedData(task_f.load_index(energy_csv), cache, energy_csv))
+    cache.save()
+
+    generate_energy_csv(energy_csv, 24 * 80, seed=9)
+    cache = ReportCache(cache_file)
+    totals = task_f.year_totals(CachedData(task_f.load_index(energy_csv), cache, energy_csv))
+    assert baselines.same_totals(totals, baselines.year_totals(baselines.read_energy(energy_csv)))
+    assert cache.hits == 0
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ReportCache(str(tmp_path / "cache.json"), max_entries=3)
+    for key in "abcd":
+        cache.put(key, (1.0, 2.0, 3.0))
+    cache.get("b")
+    cache.put("e", (4.0, 5.0, 6.0))
+    cache.save()
+
+    assert list(ReportCache(str(tmp_path / "cache.json")).entries) == ["d", "b", "e"]
+    # A smaller bound keeps the most recently used entries.
+    assert list(ReportCache(str(tmp_path / "cache.json"), max_entries=2).entries) == ["b", "e"]
+
+
+@pytest.mark.parametrize("entry", [
+    "c",
+    ["c"],
+    ["c", [1.0, 2.0, 3.0], "extra"],
+    [3, [1.0, 2.0, 3.0]],
+    ["c", "totals"],
+    ["c", [1.0, 2.0]],
+    ["c", [1.0, 2.0, "3"]],
+    ["c", [1.0, 2.0, None]],
+])
+def test_malformed_entry_is_dropped(tmp_path, entry):
+    content = {
+        "version": report_cache.CACHE_VERSION,
+        "entries": [["a", [1, 2.5, 3.0]], entry, ["b", [4.0, 5.0, 6.0]]],
+    }
+    (tmp_path / "cache.json").write_text(json.dumps(content), encoding="utf-8")
+
+    cache = ReportCache(str(tmp_path / "cache.json"), max_entries=2)
+    assert list(cache.entries.items()) == [("a", (1, 2.5, 3.0)), ("b", (4.0, 5.0, 6.0))]
@@ -0,0 +1,70 @@
+from datetime import datetime
+
+import pytest
+
+import task_g_class
+from task_g_class import Reservation
+
+FIELDS = (
+    "reservation_id", "name", "email", "phone", "reservation_date",
+    "reservation_time", "duration_hours", "price", "confirmed",
+    "reserved_resource", "created_at",
+)
+
+LINE = "7|Snufkin Harbour|snufkin@example.fi|0401234567|2025-06-01|09:30|3|12.50|True|Sauna|{}\n"
+
+
+def baseline(fields: list[str]) -> tuple:
+    # convert_reservation_data before the fast paths: strptime for every field.
+    return (
+        int(fields[0]),
+        fields[1],
+        fields[2],
+        fields[3],
+        datetime.strptime(fields[4], "%Y-%m-%d").date(),
+        datetime.strptime(fields[5], "%H:%M").time(),
+        int(fields[6]),
+        float(fields[7]),
+        fields[8].strip() == "True",
+        fields[9],
+        datetime.strptime(fields[10].strip(), "%Y-%m-%d %H:%M:%S"),
+    )
+
+
+def test_from_fields_matches_baseline(generated_reservations):
+    with open(generated_reservations, encoding="utf-8") as f:
+        lines = f.readlines()
+
+    for line in lines:
+        reservation = task_g_class.convert_reservation_data(line.split("|"))
+        assert tuple(getattr(reservation, name) for name in FIELDS) == baseline(
+            line.split("|")
+        )
+
+
+def test_lazy_fields_decode_once_and_can_be_set():
+    reservation = Reservation.from_fields(LINE.format("2025-05-01 08:00:00").split("|"))
+    assert reservation._raw is not None
+
+    reservation.phone = "000"
+    assert reservation._raw is None
+    assert reservation.email == "snufkin@example.fi"
+    assert reservation.phone == "000"
+    assert reservation.created_at == datetime(2025, 5, 1, 8)
+
+
+@pytest.mark.parametrize("created_at", [
+    "",
+    "yesterday",
+    "2025-13-01 08:00:00",
+    "2025-02-30 08:00:00",
+    "2025-05-01 25:00:00",
+])
+def test_from_fields_rejects_bad_created_at(created_at):
+    with pytest.raises(ValueError):
+        Reservation.from_fields(LINE.format(created_at).split("|"))
+
+
+def test_from_fields_rejects_short_lines():
+    with pytest.raises(IndexError):
+        Reservation.from_fields("7|Snufkin|a@b.fi".split("|"))
@@ -0,0 +1,105 @@
+import io
+from datetime import date, datetime
+
+import pytest
+
+import task_g_class
+import task_g_dict
+from report_writer import ReportWriter
+from reservation_index import DICT_FIELDS, ReservationIndex
+
+REPORTS = (
+    "confirmed_reservations",
+    "long_reservations",
+    "confirmation_statuses",
+    "confirmation_summary",
+    "total_revenue",
+)
+
+QUERIES = [
+    {},
+    {"confirmed": True},
+    {"confirmed": False, "resource": "Sauna"},
+    {"resource": "No Such Room"},
+    {"confirmed": True, "min_duration": 3, "date_from": date(2025, 3, 1),
+     "date_to": date(2025, 6, 30)},
+    {"max_duration": 1},
+    {"created_from": datetime(2025, 5, 1), "created_to": datetime(2025, 5, 31, 23)},
+    {"confirmed": True, "created_to": datetime(2025, 2, 1)},
+]
+
+
+def matches(reservation, conditions) -> bool:
+    checks = {
+        "confirmed": lambda r, v: r.confirmed == v,
+        "resource": lambda r, v: r.reserved_resource == v,
+        "date_from": lambda r, v: r.reservation_date >= v,
+        "date_to": lambda r, v: r.reservation_date <= v,
+        "min_duration": lambda r, v: r.duration_hours >= v,
+        "max_duration": lambda r, v: r.duration_hours <= v,
+        "created_from": lambda r, v: r.created_at >= v,
+        "created_to": lambda r, v: r.created_at <= v,
+    }
+    return all(checks[name](reservation, value) for name, value in conditions.items())
+
+
+def render(module, reservations) -> str:
+    stream = io.StringIO()
+    with ReportWriter(stream) as writer:
+        for name in REPORTS:
+            getattr(module, name)(reservations, writer)
+    return stream.getvalue()
+
+
+@pytest.mark.parametrize("module", [task_g_class, task_g_dict])
+def test_reports_from_index_match_list(module, generated_reservations):
+    reservations = module.fetch_reservations(generated_reservations)
+    fields = {} if module is task_g_class else {"fields": DICT_FIELDS}
+    index = ReservationIndex(reservations, **fields)
+
+    assert list(index) == reservations
+    assert render(module, index) == render(module, reservations)
+
+
+@pytest.mark.parametrize("conditions", QUERIES)
+def test_queries_match_scan(conditions, generated_reservations):
+    reservations = task_g_class.fetch_reservations(generated_reservations)
+    index = ReservationIndex(reservations)
+    expected = [r for r in reservations if matches(r, conditions)]
+
+    assert index.select(**conditions) == expected
+    assert index.count(**conditions) == len(expected)
+    assert index.revenue(**conditions) == sum(
+        r.duration_hours * r.price for r in expected
+    )
+
+
+def test_add_and_remove_keep_indexes_current(generated_reservations):
+    reservations = task_g_class.fetch_reservations(generated_reservations)
+    index = ReservationIndex(reservations[:1000])
+    created = {"created_from": datetime(2025, 1, 1), "created_to": datetime(2025, 12, 31)}
+    index.count(**created)  # builds the created_at index
+
+    for reservation in reservations[1000:]:
+        index.add(reservation)
+    for reservation in reservations[::3]:
+        index.remove(reservation)
+    kept = [r for i, r in enumerate(reservations) if i % 3]
+
+    assert list(index) == kept
+    for conditions in QUERIES + [created]:
+        assert index.select(**conditions) == [r for r in kept if matches(r, conditions)]
+
+
+def test_build_leaves_created_at_undecoded(generated_reservations):
+    reservations = task_g_class.fetch_reservations(generated_reservations)
+    index = ReservationIndex(reservations)
+    index.select(confirmed=True, min_duration=3)
+    index.add(task_g_class.Reservation.from_fields(
+        "1|A|a@b.fi|040|2025-01-02|10:00|3|10.00|True|Sauna|2024-12-01 10:00:00".split("|")
+    ))
+
+    assert all(r._raw is not None for r in index)
+
+    index.select(created_from=datetime(2025, 1, 1))
+    assert all(r._raw is None for r in index)
@@ -0,0 +1,153 @@
+import os
+import shutil
+from datetime import datetime
+
+import pytest
+
+import baselines
+import reservation_snapshot
+import task_g_class
+from conftest import ROOT
+from reservation_snapshot import HEADER, build_snapshot, fresh_snapshot, is_fresh, read_snapshot
+
+FIELDS = (
+    "reservation_id", "name", "email", "phone", "reservation_date",
+    "reservation_time", "duration_hours", "price", "confirmed",
+    "reserved_resource", "created_at",
+)
+
+# Repeated and empty strings, non-ASCII text, a negative duration, a blank
+# line between rows and a last line without a newline.
+EDGE_LINES = (
+    "1|Muumipeikko|moomin@example.fi||2025-01-01|00:00|0|0.0|True|Sauna|0001-01-01 00:00:00\n"
+    "\n"
+    "-2|Pikku Myy → Mörkö|my@example.fi|+358 40 123|9999-12-31|23:59|24|1e3|False|Sauna|9999-12-31 23:59:59\n"
+    "   \n"
+    "3|Muumipeikko|||2025-06-01|09:30|2|12.345|True||2025-05-01 08:00:00\n"
+    "4|Niiskuneiti|||2025-06-02|10:00|-1|0.5|False|Sauna|2025-05-01 08:00:00"
+)
+
+
+def expected_rows(filename: str) -> list:
+    return [tuple(row) for row in baselines.read_reservations(filename)]
+
+
+def copy_reservations(source: str, tmp_path) -> str:
+    filename = str(tmp_path / "reservations.txt")
+    shutil.copy(source, filename)
+    return filename
+
+
+def test_round_trip_matches_baseline(generated_reservations, tmp_path, monkeypatch):
+    # Small blocks so the last one is partial.
+    monkeypatch.setattr(reservation_snapshot, "BLOCK_RECORDS", 7)
+    filename = copy_reservations(generated_reservations, tmp_path)
+
+    assert build_snapshot(filename) == 2000
+    assert list(read_snapshot(filename + ".snap")) == expected_rows(filename)
+
+
+def test_round_trip_of_edge_values(tmp_path):
+    filename = tmp_path / "reservations.txt"
+    filename.write_text(EDGE_LINES, encoding="utf-8")
+
+    assert build_snapshot(str(filename)) == 4
+    assert list(read_snapshot(str(filename) + ".snap")) == expected_rows(str(filename))
+
+
+def test_empty_file(tmp_path):
+    filename = tmp_path / "reservations.txt"
+    filename.write_text("\n\n", encoding="utf-8")
+
+    assert build_snapshot(str(filename)) == 0
+    assert list(read_snapshot(str(filename) + ".snap")) == []
+    assert task_g_class.fetch_reservations(str(filename)) == []
+
+
+def test_fetch_reservations_uses_a_fresh_snapshot(generated_reservations, tmp_path, monkeypatch):
+    filename = copy_reservations(generated_reservations, tmp_path)
+    build_snapshot(filename)
+    assert fresh_snapshot(filename) == filename + ".snap"
+
+    def no_text_parse(fields):
+        raise AssertionError("parsed the text file instead of the snapshot")
+
+    monkeypatch.setattr(task_g_class, "convert_reservation_data", no_text_parse)
+    reservations = task_g_class.fetch_reservations(filename)
+    assert [
+        tuple(getattr(r, name) for name in FIELDS) for r in reservations
+    ] == expected_rows(filename)
+
+
+def test_appended_text_makes_the_snapshot_stale(generated_reservations, tmp_path):
+    filename = copy_reservations(generated_reservations, tmp_path)
+    build_snapshot(filename)
+
+    with open(filename, "a", encoding="utf-8") as f:
+        f.write(EDGE_LINES.splitlines()[0] + "\n")
+    snapshot = os.stat(filename + ".snap")
+    os.utime(filename, ns=(snapshot.st_atime_ns, snapshot.st_mtime_ns))
+
+    assert fresh_snapshot(filename) is None
+    reservations = task_g_class.fetch_reservations(filename)
+    assert [
+        tuple(getattr(r, name) for name in FIELDS) for r in reservations
+    ] == expected_rows(filename)
+
+
+def test_checksum_decides_when_mtime_changed(tmp_path):
+    filename = tmp_path / "reservations.txt"
+    shutil.copy(ROOT / "TaskG" / "reservations.txt", filename)
+    build_snapshot(str(filename))
+    snapshot = os.stat(str(filename) + ".snap")
+    older = snapshot.st_mtime_ns - 10 ** 9
+
+    # Same content with another mtime: the checksum still matches.
+    os.utime(filename, ns=(older, older))
+    assert is_fresh(str(filename))
+
+    # Same size, other content, mtime still older than the snapshot.
+    text = filename.read_text(encoding="utf-8")
+    filename.write_text(text.replace("True", "Fals", 1), encoding="utf-8")
+    os.utime(filename, ns=(older, older))
+    assert not is_fresh(str(filename))
+
+
+@pytest.mark.parametrize("header", [
+    b"XXXX" + bytes(HEADER.size - 4),
+    HEADER.pack(b"RSNP", reservation_snapshot.VERSION + 1, 0, 0, 0, bytes(32), HEADER.size),
+    b"RSNP",
+])
+def test_foreign_or_truncated_snapshot_is_ignored(tmp_path, header):
+    filename = tmp_path / "reservations.txt"
+    shutil.copy(ROOT / "TaskG" / "reservations.txt", filename)
+    (tmp_path / "reservations.txt.snap").write_bytes(header)
+
+    assert fresh_snapshot(str(filename)) is None
+    with pytest.raises(ValueError, match="not a reservation snapshot"):
+        list(read_snapshot(str(filename) + ".snap"))
+    assert len(task_g_class.fetch_reservations(str(filename))) == 5
+
+
+def test_created_at_keeps_microseconds(tmp_path):
+    filename = tmp_path / "reservations.txt"
+    filename.write_text(
+        "1|Muumipeikko|||2025-06-01|09:30|2|12.0|True|Sauna|2025-05-01T08:00:00.123456\n",
+        encoding="utf-8",
+    )
+
+    build_snapshot(str(filename))
+    created_at = next(read_snapshot(str(filename) + ".snap"))[-1]
+    assert created_at == datetime(2025, 5, 1, 8, 0, 0, 123456)
+
+
+def test_created_at_with_utc_offset_is_rejected(tmp_path):
+    filename = tmp_path / "reservations.txt"
+    filename.write_text(
+        "1|Muumipeikko|||2025-06-01|09:30|2|12.0|True|Sauna|2025-05-01T08:00:00+03:00\n",
+        encoding="utf-8",
+    )
+
+    with pytest.raises(ValueError, match="UTC offset"):
+        build_snapshot(str(filename))
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["reservations.txt"]
@@ -0,0 +1,83 @@
+import io
+
+import reservation_table
+import task_g_class
+from report_writer import ReportWriter
+from reservation_table import BitSet, ReservationTable, StringColumn
+
+FIELDS = (
+    "reservation_id", "name", "email", "phone", "reservation_date",
+    "reservation_time", "duration_hours", "price", "confirmed",
+    "reserved_resource", "created_at",
+)
+
+
+def test_string_column_round_trip_and_extend():
+    values = ["", "a@b.fi", "äiti@esimerkki.fi", "", "040 123"]
+    first, second = StringColumn(), StringColumn()
+    for value in values:
+        first.append(value)
+    for value in reversed(values):
+        second.append(value)
+
+    assert [first[i] for i in range(len(first))] == values
+    first.extend(second)
+    assert [first[i] for i in range(len(first))] == values + values[::-1]
+
+    empty = StringColumn()
+    empty.extend(second)
+    assert [empty[i] for i in range(len(empty))] == values[::-1]
+
+
+def test_bit_set_count_and_extend():
+    pattern = [i % 3 == 0 or i % 7 == 0 for i in range(203)]
+    bits = BitSet()
+    for value in pattern:
+        bits.append(value)
+    assert bits.count() == sum(pattern)
+
+    for offset in (0, 5):
+        # Byte aligned and unaligned extends.
+        combined = BitSet()
+        for value in pattern[:offset]:
+            combined.append(value)
+        combined.extend(bits)
+        expected = pattern[:offset] + pattern
+        assert [combined[i] for i in range(len(combined))] == expected
+        assert combined.count() == sum(expected)
+
+
+def test_table_rows_match_reservations(generated_reservations):
+    reservations = task_g_class.fetch_reservations(generated_reservations)
+    table = reservation_table.fetch_reservation_table(generated_reservations)
+
+    expected = [tuple(getattr(r, name) for name in FIELDS) for r in reservations]
+    assert list(table.rows()) == expected
+
+    half = len(table) // 2
+    first, second = ReservationTable(), ReservationTable()
+    for row in expected[:half]:
+        first.append_row(row)
+    for row in expected[half:]:
+        second.append_row(row)
+    first.extend(second)
+    assert list(first.rows()) == expected
+
+
+def report(module, data) -> str:
+    out = io.StringIO()
+    with ReportWriter(out) as writer:
+        for name in ("confirmed_reservations", "long_reservations",
+                     "confirmation_statuses", "confirmation_summary",
+                     "total_revenue"):
+            getattr(module, name)(data, writer)
+    return out.getvalue()
+
+
+def test_table_reports_match_class_reports(generated_reservations):
+    reservations = task_g_class.fetch_reservations(generated_reservations)
+    table = reservation_table.fetch_reservation_table(generated_reservations)
+
+    text = report(reservation_table, table)
+    assert "Confirmed reservations" in text
+    assert text == report(task_g_class, reservations)
@@ -0,0 +1,186 @@
+import random
+import shutil
+
+import pytest
+
+import baselines
+from common import week_data
+from common.rollup import LEVELS, Rollup, bucket_key, day_date
+from conftest import ROOT
+from generators import generate_week_csv
+
+CHANNELS = ("a", "b")
+
+
+def random_hours(count: int, seed: int) -> list:
+    """
+    Hourly rows (day, values, temperature) over about two years, with
+    some days missing and up to 24 rows per day.
+    """
+    rng = random.Random(seed)
+    rows = []
+    day = 20_000
+    while len(rows) < count:
+        day += rng.choice((1, 1, 1, 2, 30))
+        for _ in range(rng.randint(1, 24)):
+            rows.append((
+                day,
+                (rng.randint(-50, 500), rng.randint(0, 500)),
+                rng.randint(-300, 300),
+            ))
+    return rows[:count]
+
+
+def naive_buckets(rows: list, level: str) -> list:
+    buckets: dict = {}
+    for day, values, temperature in rows:
+        key = bucket_key(level, day_date(day))
+        bucket = buckets.setdefault(key, {"hours": 0, "days": {}, "values": [], "temperature": 0})
+        bucket["hours"] += 1
+        bucket["temperature"] += temperature
+        bucket["days"][day] = temperature
+        bucket["values"].append(values)
+    return [
+        (
+            key,
+            bucket["hours"],
+            len(bucket["days"]),
+            tuple(sum(column) for column in zip(*bucket["values"])),
+            tuple(min(column) for column in zip(*bucket["values"])),
+            tuple(max(column) for column in zip(*bucket["values"])),
+            bucket["temperature"],
+            sum(bucket["days"].values()),
+        )
+        for key, bucket in sorted(buckets.items())
+    ]
+
+
+def naive_range(rows: list, first_day: int, last_day: int) -> tuple:
+    selected = [row for row in rows if first_day <= row[0] <= last_day]
+    return (
+        len(selected),
+        len({day for day, _, _ in selected}),
+        tuple(sum(values[channel] for _, values, _ in selected) for channel in range(2)),
+        sum(temperature for _, _, temperature in selected),
+    )
+
+
+def rollup_of(rows: list) -> Rollup:
+    return Rollup.from_hours(
+        CHANNELS,
+        [day for day, _, _ in rows],
+        [values for _, values, _ in rows],
+        [temperature for _, _, temperature in rows],
+    )
+
+
+@pytest.mark.parametrize("level", LEVELS)
+def test_buckets_match_naive_grouping(level):
+    rows = random_hours(5000, seed=1)
+    buckets = rollup_of(rows).buckets(level)
+    assert [tuple(bucket) for bucket in buckets] == naive_buckets(rows, level)
+
+
+def test_add_columns_matches_add_hours():
+    rows = random_hours(3000, seed=2)
+    rollup = Rollup(CHANNELS)
+    rollup.add_columns(
+        [day for day, _, _ in rows],
+        [[values[channel] for _, values, _ in rows] for channel in range(2)],
+        [temperature for _, _, temperature in rows],
+    )
+    for level in LEVELS:
+        assert rollup.buckets(level) == rollup_of(rows).buckets(level)
+
+
+def test_range_matches_naive_sums():
+    rows = random_hours(4000, seed=3)
+    rollup = rollup_of(rows)
+    first, last = rows[0][0], rows[-1][0]
+    rng = random.Random(3)
+
+    queries = [(first, last), (first - 10, first - 1), (last + 1, last + 10), (last, first)]
+    queries += [
+        (start, start + rng.randrange(-2, 90))
+        for start in (rng.randint(first - 5, last + 5) for _ in range(300))
+    ]
+    for first_day, last_day in queries:
+        summary = rollup.range(first_day, last_day)
+        assert (
+            summary.hours, summary.days, summary.sums, summary.temperature
+        ) == naive_range(rows, first_day, last_day)
+
+
+def test_appending_after_queries_matches_a_fresh_build():
+    rows = random_hours(4000, seed=4)
+    # Split inside a day, so the second part first merges into its bucket.
+    split = 2001
+    rollup = rollup_of(rows[:split])
+    for level in LEVELS:
+        rollup.buckets(level)
+    rollup.range(rows[0][0], rows[-1][0])
+
+    for day, values, temperature in rows[split:]:
+        rollup.add_hours([day], [values], [temperature])
+
+    fresh = rollup_of(rows)
+    for level in LEVELS:
+        assert rollup.buckets(level) == fresh.buckets(level)
+    assert rollup.range(rows[0][0], rows[-1][0]) == fresh.range(rows[0][0], rows[-1][0])
+
+
+def test_earlier_day_inserted_after_queries():
+    rows = random_hours(2000, seed=5)
+    # Whole days only, so every day's last temperature stays its last row.
+    later, earlier = rows[1000:], [row for row in rows[:1000] if row[0] < rows[1000][0]]
+    rollup = rollup_of(later)
+    for level in LEVELS:
+        rollup.buckets(level)
+    rollup.range(rows[0][0], rows[-1][0])
+
+    rollup.add_hours(
+        [day for day, _, _ in earlier],
+        [values for _, values, _ in earlier],
+        [temperature for _, _, temperature in earlier],
+    )
+
+    ordered = earlier + later
+    for level in LEVELS:
+        assert [tuple(bucket) for bucket in rollup.buckets(level)] == naive_buckets(ordered, level)
+    assert rollup.range(rows[0][0], rows[-1][0]) == rollup_of(ordered).range(
+        rows[0][0], rows[-1][0]
+    )
+
+
+def test_empty_rollup():
+    rollup = Rollup(CHANNELS)
+    assert len(rollup) == 0
+    assert rollup.buckets("month") == []
+    assert rollup.find("year", 2025) is None
+    assert rollup.range(0, 100_000).hours == 0
+    assert rollup.total().sums == (0, 0)
+
+
+def week_files(tmp_path) -> list:
+    generated = str(tmp_path / "generated.csv")
+    generate_week_csv(generated, 24 * 40 + 5)
+    shutil.copy(ROOT / "TaskD" / "week42.csv", tmp_path / "week42.csv")
+    return [str(tmp_path / "week42.csv"), generated]
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_daily_totals_match_baseline(tmp_path, monkeypatch, use_numpy):
+    if use_numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(week_data, "np", None)
+
+    for filename in week_files(tmp_path):
+        expected = baselines.week_daily_totals(baselines.read_week(filename))
+        assert week_data.calculate_daily_totals(week_data.read_data(filename)) == expected
+        # Chunks that end in the middle of a day.
+        assert week_data.load_daily_totals(filename, chunk_rows=7) == expected
+
+        columnar = filename + ".ecol"
+        week_data.export_columnar(filename, columnar, chunk_rows=50)
+        assert week_data.load_daily_totals(columnar) == expected
@@ -0,0 +1,34 @@
+import sharded_loader
+import task_g_class
+from common.shards import shard_ranges
+
+FIELDS = (
+    "reservation_id", "name", "email", "phone", "reservation_date",
+    "reservation_time", "duration_hours", "price", "confirmed",
+    "reserved_resource", "created_at",
+)
+
+
+def as_rows(reservations) -> list:
+    return [tuple(getattr(r, name) for name in FIELDS) for r in reservations]
+
+
+def test_shards_match_sequential_parse(generated_reservations, tmp_path, monkeypatch):
+    # Blank lines between the rows and a last line without a newline.
+    text = open(generated_reservations, encoding="utf-8").read()
+    filename = tmp_path / "reservations.txt"
+    filename.write_text(text.replace("\n", "\n\n", 50).rstrip("\n"), encoding="utf-8")
+    filename = str(filename)
+    expected = as_rows(task_g_class.fetch_reservations(filename))
+
+    ranges = shard_ranges(filename, 7, min_shard_bytes=1)
+    parts = [sharded_loader.parse_shard(filename, start, end) for start, end in ranges]
+    assert len(parts) == 7
+    assert [row for part in parts for row in part.rows()] == expected
+
+    monkeypatch.setattr(
+        sharded_loader,
+        "shard_ranges",
+        lambda filename, shards: shard_ranges(filename, shards, min_shard_bytes=1),
+    )
+    assert as_rows(sharded_loader.fetch_reservations(filename, 3)) == expected
@@ -0,0 +1,99 @@
+import os
+
+from common.tail import FileTail, Poll
+
+HEADER = b"Time;Value\n"
+
+
+def test_missing_file_has_no_lines(tmp_path):
+    tail = FileTail(str(tmp_path / "week.csv"))
+    assert tail.poll() == Poll(False, [])
+
+    (tmp_path / "week.csv").write_bytes(HEADER + b"a;1\n")
+    assert tail.poll() == Poll(False, [b"a;1"])
+
+
+def test_appends_between_polls(tmp_path):
+    filename = tmp_path / "week.csv"
+    filename.write_bytes(HEADER + b"a;1\nb;2\n")
+    tail = FileTail(str(filename))
+
+    assert tail.poll() == Poll(False, [b"a;1", b"b;2"])
+    assert tail.poll() == Poll(False, [])
+
+    with open(filename, "ab") as f:
+        f.write(b"c;3\r\n\n  \nd;4\n")
+    assert tail.poll() == Poll(False, [b"c;3", b"d;4"])
+    assert tail.poll() == Poll(False, [])
+
+
+def test_header_split_across_writes(tmp_path):
+    filename = tmp_path / "week.csv"
+    filename.write_bytes(HEADER[:5])
+    tail = FileTail(str(filename))
+    assert tail.poll() == Poll(False, [])
+
+    with open(filename, "ab") as f:
+        f.write(HEADER[5:] + b"a;1\n")
+    assert tail.poll() == Poll(False, [b"a;1"])
+
+
+def test_partial_last_line_finished_by_a_newline(tmp_path):
+    filename = tmp_path / "week.csv"
+    filename.write_bytes(HEADER + b"a;1\nb;2")
+    tail = FileTail(str(filename))
+
+    # The file did not grow while it was read, so the last line counts.
+    assert tail.poll() == Poll(False, [b"a;1", b"b;2"])
+
+    with open(filename, "ab") as f:
+        f.write(b"\nc;3\n")
+    assert tail.poll() == Poll(False, [b"c;3"])
+
+
+def test_partial_last_line_continued_by_a_later_append(tmp_path):
+    filename = tmp_path / "week.csv"
+    filename.write_bytes(HEADER + b"a;1\nb;2")
+    tail = FileTail(str(filename))
+    assert tail.poll() == Poll(False, [b"a;1", b"b;2"])
+
+    with open(filename, "ab") as f:
+        f.write(b"5\nc;3\n")
+    # b;2 was really b;25, so everything is read again.
+    assert tail.poll() == Poll(True, [b"a;1", b"b;25", b"c;3"])
+    assert tail.poll() == Poll(False, [])
+
+
+def test_truncation_starts_a_new_read(tmp_path):
+    filename = tmp_path / "week.csv"
+    filename.write_bytes(HEADER + b"a;1\nb;2\n")
+    tail = FileTail(str(filename))
+    tail.poll()
+
+    filename.write_bytes(HEADER + b"c;3\n")
+    assert tail.poll() == Poll(True, [b"c;3"])
+
+    with open(filename, "ab") as f:
+        f.write(b"d;4\n")
+    assert tail.poll() == Poll(False, [b"d;4"])
+
+
+def test_rotation_starts_a_new_read(tmp_path):
+    filename = tmp_path / "week.csv"
+    filename.write_bytes(HEADER + b"a;1\n")
+    tail = FileTail(str(filename))
+    tail.poll()
+
+    # A new, longer file is moved in place of the old one.
+    rotated = tmp_path / "week.csv.new"
+    rotated.write_bytes(HEADER + b"b;2\nc;3\nd;4\n")
+    os.replace(rotated, filename)
+    assert tail.poll() == Poll(True, [b"b;2", b"c;3", b"d;4"])
+    assert tail.poll() == Poll(False, [])
+
+
+def test_without_header(tmp_path):
+    filename = tmp_path / "week.csv"
+    filename.write_bytes(b"a;1\n")
+    tail = FileTail(str(filename), header=False)
+    assert tail.poll() == Poll(False, [b"a;1"])
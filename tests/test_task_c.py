@@ -0,0 +1,78 @@
+import pytest
+
+import task_c
+from common.shards import shard_ranges
+from conftest import ROOT
+
+
+@pytest.fixture
+def reservation_file(tmp_path):
+    # The sample rows repeated, with blank and whitespace-only lines mixed in.
+    rows = (ROOT / "TaskC" / "reservations.txt").read_text(encoding="utf-8").splitlines()
+    lines = []
+    for copy in range(40):
+        for row in rows:
+            lines.append(row)
+        lines.append("" if copy % 2 else "   ")
+    filename = tmp_path / "reservations.txt"
+    filename.write_text("\n".join(lines), encoding="utf-8")
+    return str(filename)
+
+
+def report(capsys, function, *args) -> str:
+    capsys.readouterr()
+    function(*args)
+    return capsys.readouterr().out
+
+
+def test_read_reservations_skips_blank_lines(reservation_file):
+    reservations = list(task_c.read_reservations(reservation_file))
+    size = len(open(reservation_file, "rb").read())
+
+    assert len(reservations) == 200
+    assert list(task_c.read_range(reservation_file, 0, size)) == reservations
+
+
+def test_read_range_splits_on_lines(reservation_file):
+    whole = list(task_c.read_reservations(reservation_file))
+    parts = [
+        row
+        for start, end in shard_ranges(reservation_file, 7, min_shard_bytes=1)
+        for row in task_c.read_range(reservation_file, start, end)
+    ]
+    assert parts == whole
+
+
+def test_parallel_report_matches_sequential(reservation_file, capsys, monkeypatch):
+    monkeypatch.setattr(
+        task_c,
+        "shard_ranges",
+        lambda filename, shards: shard_ranges(filename, shards, min_shard_bytes=1),
+    )
+    sequential = report(
+        capsys, task_c.stream_reports, task_c.read_reservations(reservation_file)
+    )
+
+    assert report(
+        capsys, task_c.stream_reports_parallel, reservation_file, 3
+    ) == sequential
+
+
+def test_report_matches_baseline(capsys):
+    # The sequential report of the sample file, section by section as the
+    # baseline functions print it.
+    filename = str(ROOT / "TaskC" / "reservations.txt")
+    rows = list(task_c.read_reservations(filename))
+    expected = report(capsys, lambda: [
+        function(rows)
+        for function in (
+            task_c.confirmed_reservations,
+            task_c.long_reservations,
+            task_c.confirmation_statuses,
+            task_c.confirmation_summary,
+            task_c.total_revenue,
+        )
+    ])
+
+    assert report(capsys, task_c.main, [filename]) == expected
+    assert report(capsys, task_c.main, [filename, "--workers", "2"]) == expected
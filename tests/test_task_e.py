@@ -0,0 +1,99 @@
+import os
+import shutil
+
+import pytest
+
+import task_e
+from conftest import ROOT
+
+
+def test_expand_week_files_leaves_out_patterns_without_matches(tmp_path):
+    for name in ("week41.csv", "week42.csv", "week[1].csv"):
+        (tmp_path / name).write_text("", encoding="utf-8")
+
+    filenames = task_e.expand_week_files([
+        str(tmp_path / "week4*.csv"),
+        str(tmp_path / "week42.csv"),
+        str(tmp_path / "week[1].csv"),
+        str(tmp_path / "missing*.csv"),
+        str(tmp_path / "missing.csv"),
+    ])
+
+    assert filenames == sorted(
+        str(tmp_path / name) for name in ("week41.csv", "week42.csv", "week[1].csv")
+    )
+
+
+def test_main_exits_when_no_file_matches(tmp_path):
+    with pytest.raises(SystemExit) as exit_info:
+        task_e.main([str(tmp_path / "week*.csv"), "--no-cache"])
+
+    assert exit_info.value.code != 0
+    assert "no files match" in str(exit_info.value.code)
+    assert not (tmp_path / "summary.txt").exists()
+
+
+def test_main_writes_the_report(tmp_path):
+    for name in ("week41.csv", "week42.csv", "week43.csv"):
+        shutil.copy(ROOT / "TaskE" / name, tmp_path / name)
+    output = tmp_path / "summary.txt"
+
+    task_e.main([str(tmp_path / "week*.csv"), "--no-cache", "-w", "1", "-o", str(output)])
+
+    assert output.read_text(encoding="utf-8") == (
+        ROOT / "TaskE" / "summary.txt"
+    ).read_text(encoding="utf-8")
+
+
+def week_lines(name: str) -> list:
+    return (ROOT / "TaskE" / name).read_bytes().splitlines(keepends=True)
+
+
+def append(filename, data: bytes) -> None:
+    with open(filename, "ab") as f:
+        f.write(data)
+
+
+def test_follow_matches_a_full_reload(tmp_path, monkeypatch, capsys):
+    week41, week42, week43 = (week_lines(f"week4{n}.csv") for n in (1, 2, 3))
+    (tmp_path / "week41.csv").write_bytes(b"".join(week41))
+    (tmp_path / "week42.csv").write_bytes(b"".join(week42[:100]))
+
+    def rotate_week43():
+        replacement = tmp_path / "next.tmp"
+        replacement.write_bytes(b"".join(week43))
+        os.replace(replacement, tmp_path / "week43.csv")
+
+    # One change before every poll; the first poll reads the files as they are.
+    steps = [
+        lambda: None,
+        lambda: append(tmp_path / "week42.csv", b"".join(week42[100:130])),
+        # A last line cut short, then finished by the next append.
+        lambda: append(tmp_path / "week42.csv", week42[130][:15]),
+        lambda: append(tmp_path / "week42.csv", week42[130][15:] + b"".join(week42[131:150])),
+        lambda: None,
+        # A new file that matches the pattern.
+        lambda: (tmp_path / "week43.csv").write_bytes(b"".join(week43[:60])),
+        # Truncated to a shorter week.
+        lambda: (tmp_path / "week41.csv").write_bytes(b"".join(week41[:50])),
+        rotate_week43,
+        lambda: append(tmp_path / "week42.csv", b"".join(week42[150:])),
+    ]
+    polls = len(steps)
+    expand_week_files = task_e.expand_week_files
+
+    def expand_after_step(patterns):
+        steps.pop(0)()
+        return expand_week_files(patterns)
+
+    monkeypatch.setattr(task_e, "expand_week_files", expand_after_step)
+    followed = tmp_path / "followed.txt"
+    task_e.follow_weeks([str(tmp_path / "week*.csv")], str(followed), 0, polls=polls)
+    assert steps == []
+    # Every poll but the one without a change rewrote the report.
+    assert len(capsys.readouterr().err.splitlines()) == polls - 1
+
+    monkeypatch.setattr(task_e, "expand_week_files", expand_week_files)
+    reloaded = tmp_path / "reloaded.txt"
+    task_e.main([str(tmp_path / "week*.csv"), "--no-cache", "-w", "1", "-o", str(reloaded)])
+    assert followed.read_text(encoding="utf-8") == reloaded.read_text(encoding="utf-8")
@@ -0,0 +1,169 @@
+import io
+import os
+from datetime import date
+
+import pytest
+
+import task_f
+from common.tail import FileTail
+from conftest import ROOT
+from energy_columns import parse_lines
+
+ENERGY_CSV = ROOT / "TaskF" / "2025.csv"
+
+
+@pytest.fixture(scope="module")
+def index():
+    return task_f.load_index(str(ENERGY_CSV))
+
+
+def append(filename, data: bytes) -> None:
+    with open(filename, "ab") as f:
+        f.write(data)
+
+
+def test_follow_matches_a_full_reload(tmp_path, monkeypatch, capsys):
+    lines = ENERGY_CSV.read_bytes().splitlines(keepends=True)
+    filename = tmp_path / "energy.csv"
+    filename.write_bytes(b"".join(lines[:2000]))
+
+    def rotate():
+        replacement = tmp_path / "energy.tmp"
+        replacement.write_bytes(b"".join(lines[:5000]))
+        os.replace(replacement, filename)
+
+    # One change before every poll; the first poll reads the file as it is.
+    steps = [
+        lambda: None,
+        lambda: append(filename, b"".join(lines[2000:2100])),
+        # A last line cut short, then finished by the next append.
+        lambda: append(filename, lines[2100][:20]),
+        lambda: append(filename, lines[2100][20:] + b"".join(lines[2101:3000])),
+        lambda: None,
+        # Truncated to fewer rows.
+        lambda: filename.write_bytes(b"".join(lines[:1500])),
+        lambda: append(filename, b"".join(lines[1500:1600])),
+        rotate,
+        lambda: append(filename, b"".join(lines[5000:6000])),
+    ]
+    polls = len(steps)
+    output = io.StringIO()
+
+    class SteppedTail:
+        # Makes the next change and keeps only the output of the last poll.
+        def __init__(self, filename):
+            self.tail = FileTail(filename)
+
+        def poll(self):
+            output.seek(0)
+            output.truncate()
+            steps.pop(0)()
+            return self.tail.poll()
+
+    monkeypatch.setattr(task_f, "FileTail", SteppedTail)
+    index = task_f.follow(str(filename), output, 0, polls=polls)
+    last_output = output.getvalue()
+    assert steps == []
+    assert capsys.readouterr().err.count("was replaced or truncated") == 3
+
+    reloaded = task_f.load_index(str(filename))
+    assert len(index) == len(reloaded) == 5999
+    everything = parse_lines(lines[1:6000])
+    assert task_f.affected_reports(index, everything) == task_f.affected_reports(
+        reloaded, everything
+    )
+    # The last poll wrote the reports of the days, months and year it added.
+    assert last_output == "".join(
+        "\n".join(report) + "\n"
+        for report in task_f.affected_reports(reloaded, parse_lines(lines[5000:6000]))
+    )
+
+
+def test_answer_query_parses_every_kind(index):
+    assert task_f.answer_query(index, "daily 01.03.2025 15.04.2025") == (
+        task_f.create_daily_report(index, date(2025, 3, 1), date(2025, 4, 15))
+    )
+    assert task_f.answer_query(index, "  Monthly   2 ") == task_f.create_monthly_report(index, 2)
+    assert task_f.answer_query(index, "YEARLY") == task_f.create_yearly_report(index)
+
+    # year= overrides the default year, which the query otherwise uses.
+    assert task_f.answer_query(index, "monthly 2 year=2024", 2025) == (
+        task_f.create_monthly_report(index, 2, 2024)
+    )
+    assert task_f.answer_query(index, "yearly", 2025) == task_f.create_yearly_report(index, 2025)
+
+
+@pytest.mark.parametrize("query, message", [
+    ("weekly", "unknown query: weekly"),
+    ("daily 01.03.2025", "unknown query"),
+    ("monthly", "unknown query"),
+    ("monthly 2 3", "unknown query"),
+    ("yearly 2025", "unknown query"),
+    ("monthly 13", "month must be 1–12, got 13"),
+    ("monthly 0", "month must be 1–12, got 0"),
+    ("monthly two", "invalid literal"),
+    ("daily 31.02.2025 01.03.2025", "day is out of range"),
+    ("daily 2025-03-01 2025-03-02", "does not match format"),
+    ("yearly month=3", "unknown option: month"),
+    ("yearly year=last", "invalid literal"),
+    ("yearly site=home", "site= needs an energy_store.py directory"),
+])
+def test_answer_query_rejects_bad_queries(index, query, message):
+    with pytest.raises(ValueError, match=message):
+        task_f.answer_query(index, query)
+
+
+def test_run_batch_reports_bad_queries_and_continues(index, capsys):
+    queries = [
+        "# March and April\n",
+        "daily 01.03.2025 15.04.2025\n",
+        "\n",
+        "monthly 13\n",
+        "yearly  # the whole year\n",
+        "weekly 1\n",
+        "   \n",
+        "monthly 2",
+    ]
+    output = io.StringIO()
+
+    assert task_f.run_batch(index, queries, output) == (3, 2)
+    assert output.getvalue() == "".join(
+        "\n".join(report) + "\n"
+        for report in (
+            task_f.create_daily_report(index, date(2025, 3, 1), date(2025, 4, 15)),
+            task_f.create_yearly_report(index),
+            task_f.create_monthly_report(index, 2),
+        )
+    )
+    assert capsys.readouterr().err.splitlines() == [
+        "Line 4: month must be 1–12, got 13",
+        "Line 6: unknown query: weekly 1",
+    ]
+
+
+@pytest.mark.parametrize("queries, status", [
+    ("yearly\nmonthly 2\n", None),
+    ("yearly\nmonthly 13\nmonthly 2\n", 1),
+])
+def test_batch_exit_status(tmp_path, capsys, queries, status):
+    batch = tmp_path / "queries.txt"
+    batch.write_text(queries, encoding="utf-8")
+    output = tmp_path / "report.txt"
+    argv = ["-d", str(ENERGY_CSV), "-b", str(batch), "-o", str(output), "--no-cache"]
+
+    if status is None:
+        task_f.main(argv)
+    else:
+        with pytest.raises(SystemExit) as exit_info:
+            task_f.main(argv)
+        assert exit_info.value.code == status
+
+    failed = 0 if status is None else 1
+    assert capsys.readouterr().err.splitlines()[-1] == (
+        f"2 reports written to {output}, {failed} failed"
+    )
+    index = task_f.load_index(str(ENERGY_CSV))
+    assert output.read_text(encoding="utf-8") == "".join(
+        "\n".join(report) + "\n"
+        for report in (task_f.create_yearly_report(index), task_f.create_monthly_report(index, 2))
+    )
@@ -0,0 +1,166 @@
+import json
+import os
+import shutil
+
+import pytest
+
+import baselines
+import task_e
+from conftest import ROOT
+from generators import generate_week_csv
+from week_cache import WeekCache
+
+
+def copy_week(tmp_path, name="week41.csv") -> str:
+    filename = tmp_path / name
+    shutil.copy(ROOT / "TaskE" / name, filename)
+    return str(filename)
+
+
+def test_unchanged_file_is_a_hit(tmp_path):
+    filename = copy_week(tmp_path)
+    cache = WeekCache(str(tmp_path / "cache.json"))
+
+    first = task_e.load_weeks([filename], 1, cache=cache)
+    cache = WeekCache(str(tmp_path / "cache.json"))
+    second = task_e.load_weeks([filename], 1, cache=cache)
+
+    assert second == first
+    assert (cache.hits, cache.misses) == (1, 0)
+
+
+def test_touched_file_with_the_same_content_is_a_hit(tmp_path):
+    filename = copy_week(tmp_path)
+    cache = WeekCache(str(tmp_path / "cache.json"))
+    task_e.load_weeks([filename], 1, cache=cache)
+
+    stat = os.stat(filename)
+    os.utime(filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert cache.get(filename) is not None
+    assert cache.entries[os.path.abspath(filename)]["mtime_ns"] == stat.st_mtime_ns + 10**9
+
+
+def test_change_while_reading_is_not_hidden(tmp_path, monkeypatch):
+    filename = copy_week(tmp_path)
+    compute_weeks = task_e.compute_weeks
+
+    def compute_then_append(*args):
+        # The file grows after it has been read, before the totals are stored.
+        totals = compute_weeks(*args)
+        with open(filename, "a", encoding="utf-8") as file:
+            file.write("\n2025-10-13T00:00:00;1;2;3;4;5;6")
+        return totals
+
+    monkeypatch.setattr(task_e, "compute_weeks", compute_then_append)
+    stale = task_e.load_weeks([filename], 1, cache=WeekCache(str(tmp_path / "cache.json")))
+    monkeypatch.undo()
+
+    cache = WeekCache(str(tmp_path / "cache.json"))
+    current = task_e.load_weeks([filename], 1, cache=cache)
+
+    assert (cache.hits, cache.misses) == (0, 1)
+    assert current == task_e.compute_weeks([filename], 1)
+    assert current != stale
+
+
+def baseline_totals(filenames) -> list:
+    return [
+        baselines.week_daily_totals(baselines.read_week(filename)) for filename in filenames
+    ]
+
+
+def test_cold_and_warm_loads_match_baseline(tmp_path):
+    filenames = [copy_week(tmp_path, f"week{week}.csv") for week in (41, 42, 43)]
+    generated = str(tmp_path / "week50.csv")
+    generate_week_csv(generated, 24 * 9 + 3)
+    filenames.append(generated)
+    expected = baseline_totals(filenames)
+
+    cache = WeekCache(str(tmp_path / "cache.json"))
+    assert task_e.load_weeks(filenames, 1, cache=cache) == expected
+    assert (cache.hits, cache.misses) == (0, 4)
+
+    cache = WeekCache(str(tmp_path / "cache.json"))
+    assert task_e.load_weeks(filenames, 1, cache=cache) == expected
+    assert (cache.hits, cache.misses) == (4, 0)
+
+
+def test_same_size_edit_is_a_miss(tmp_path):
+    filename = copy_week(tmp_path)
+    cache_file = str(tmp_path / "cache.json")
+    task_e.load_weeks([filename], 1, cache=WeekCache(cache_file))
+
+    # One digit changed: same size, new mtime, other content.
+    with open(filename, encoding="utf-8") as file:
+        lines = file.read().split("\n")
+    fields = lines[1].split(";")
+    fields[1] = str((int(fields[1]) + 1) % 10) + fields[1][1:]
+    lines[1] = ";".join(fields)
+    with open(filename, "w", encoding="utf-8") as file:
+        file.write("\n".join(lines))
+    stat = os.stat(filename)
+    os.utime(filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    cache = WeekCache(cache_file)
+    assert task_e.load_weeks([filename], 1, cache=cache) == baseline_totals([filename])
+    assert (cache.hits, cache.misses) == (0, 1)
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path):
+    filenames = [copy_week(tmp_path, f"week{week}.csv") for week in (41, 42, 43)]
+    cache_file = str(tmp_path / "cache.json")
+
+    cache = WeekCache(cache_file, max_entries=2)
+    task_e.load_weeks(filenames[:2], 1, cache=cache)
+    # week41 is used again, so week42 is now the least recently used.
+    task_e.load_weeks([filenames[0], filenames[2]], 1, cache=cache)
+
+    cache = WeekCache(cache_file, max_entries=2)
+    assert sorted(cache.entries) == [os.path.abspath(filenames[i]) for i in (0, 2)]
+    assert task_e.load_weeks(filenames, 1, cache=cache) == baseline_totals(filenames)
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+@pytest.mark.parametrize("content", [
+    "",
+    "{not json",
+    "[]",
+    '{"version": 0, "entries": {}}',
+    '{"version": 1, "entries": []}',
+])
+def test_unreadable_cache_file_is_an_empty_cache(tmp_path, content):
+    filename = copy_week(tmp_path)
+    (tmp_path / "cache.json").write_text(content, encoding="utf-8")
+
+    cache = WeekCache(str(tmp_path / "cache.json"))
+    assert task_e.load_weeks([filename], 1, cache=cache) == baseline_totals([filename])
+    assert (cache.hits, cache.misses) == (0, 1)
+
+
+@pytest.mark.parametrize("change", [
+    lambda entries, key: entries.update({key: "not an entry"}),
+    lambda entries, key: entries[key].pop("used"),
+    lambda entries, key: entries[key].pop("sha256"),
+    lambda entries, key: entries[key].update(size="12"),
+    lambda entries, key: entries[key].update(mtime_ns=None),
+    lambda entries, key: entries[key].update(daily=[]),
+    lambda entries, key: entries[key]["daily"].update({"2025-13-01": [0] * 6}),
+    lambda entries, key: entries[key]["daily"].update({"2025-10-06": [0] * 5}),
+    lambda entries, key: entries[key]["daily"].update({"2025-10-06": [0, 0, 0, 0, 0, "1"]}),
+])
+def test_malformed_entry_is_dropped(tmp_path, change):
+    filenames = [copy_week(tmp_path, f"week{week}.csv") for week in (41, 42)]
+    cache_file = tmp_path / "cache.json"
+    cache = WeekCache(str(cache_file))
+    task_e.load_weeks(filenames, 1, cache=cache)
+    cache.save()
+
+    content = json.loads(cache_file.read_text(encoding="utf-8"))
+    change(content["entries"], os.path.abspath(filenames[0]))
+    cache_file.write_text(json.dumps(content), encoding="utf-8")
+
+    cache = WeekCache(str(cache_file))
+    assert list(cache.entries) == [os.path.abspath(filenames[1])]
+    assert task_e.load_weeks(filenames, 1, cache=cache) == baseline_totals(filenames)
+    assert (cache.hits, cache.misses) == (1, 1)
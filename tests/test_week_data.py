@@ -0,0 +1,53 @@
+import shutil
+import warnings
+
+import pytest
+
+import baselines
+import task_d
+from common import week_data
+from conftest import ROOT
+
+
+def with_offsets(tmp_path, offset: str) -> str:
+    """
+    week42.csv with every timestamp given an UTC offset, so the evening
+    hours of a positive offset fall on the previous day in UTC.
+    """
+    lines = (ROOT / "TaskD" / "week42.csv").read_text(encoding="utf-8").splitlines()
+    rows = [line.replace(";", offset + ";", 1) for line in lines[1:]]
+    filename = tmp_path / "week42.csv"
+    filename.write_text("\n".join([lines[0]] + rows) + "\n", encoding="utf-8")
+    return str(filename)
+
+
+@pytest.mark.parametrize("offset", ["+03:00", "-05:00", "Z"])
+def test_numpy_and_pure_paths_group_by_local_date(tmp_path, monkeypatch, offset):
+    pytest.importorskip("numpy")
+    filename = with_offsets(tmp_path, offset)
+    expected = baselines.week_daily_totals(baselines.read_week(filename))
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert week_data.load_daily_totals(filename) == expected
+        assert week_data.load_daily_totals(filename, chunk_rows=7) == expected
+        assert week_data.calculate_daily_totals_array(*week_data.read_array(filename)) == expected
+
+    monkeypatch.setattr(week_data, "np", None)
+    assert week_data.load_daily_totals(filename) == expected
+
+
+@pytest.mark.parametrize("source, name, week", [
+    ("week42.csv", "week42.csv", 42),
+    # The name wins over the dates in the file.
+    ("week42.csv", "Week7.csv", 7),
+    # Without a number in the name, the ISO week of the first day.
+    ("week41.csv", "measurements.csv", 41),
+])
+def test_task_d_title_names_the_week(tmp_path, capsys, source, name, week):
+    shutil.copy(ROOT / "TaskE" / source, tmp_path / name)
+
+    task_d.main([str(tmp_path / name)])
+
+    title = capsys.readouterr().out.splitlines()[0]
+    assert title == f"Week {week} electricity consumption and production (kWh, by phase)"